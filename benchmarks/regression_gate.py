@@ -0,0 +1,189 @@
+"""
+Master Thesis Project - QWS Dataset Analysis Based On Fuzzy Logic Principles
+Author: Paulius Lėveris
+"""
+
+# Performance regression gate: compares a fixed benchmark subset against benchmarks/baseline.json
+# Usage: python benchmarks/regression_gate.py [--threshold 0.25] [--update-baseline]
+# Timings are compared in units of a fixed calibration workload measured in the same run, so the
+# committed baseline carries over to faster or slower machines. After an intended performance change
+# (or when the gate runs on very different hardware) regenerate it with --update-baseline and commit
+# benchmarks/baseline.json together with the change.
+
+import argparse
+from contextlib import redirect_stdout
+import io
+import json
+import os
+import sys
+import numpy as np
+from scipy.stats import rankdata
+import run_benchmarks
+from synthetic_qws import SyntheticQWS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# benchmark -> rows, small enough for the whole gate to finish in about a minute
+GATE_BENCHMARKS = {
+    'entropy_weights': 50_000,
+    'waspas': 50_000,
+    'vikor': 2_000,
+    'fuzzy_topsis': 50_000,
+    'fuzzy_trust': 300,
+    'classifier_train': 5_000,
+    'report_csv': 20_000,
+}
+
+# benchmark -> (scores from the benchmark's return value, True if higher scores rank first)
+RANKED_OUTPUTS = {
+    'waspas': (lambda result: result['WASPAS Score'], True),
+    'vikor': (lambda result: result['VIKOR Score'], False),
+    'fuzzy_topsis': (lambda result: result, True),
+    'fuzzy_trust': (lambda result: result, True),
+}
+DRIFT_ROWS = 200
+CALIBRATION = 'calibration'
+
+
+def median_confidence_interval(seconds, confidence=0.95, resamples=2000, seed=0):
+    """Bootstrap confidence interval of the median of repeated trials."""
+    rng = np.random.default_rng(seed)
+    samples = np.asarray(seconds, dtype=float)
+    medians = np.median(rng.choice(samples, size=(resamples, len(samples))), axis=1)
+    tail = (1 - confidence) / 2 * 100
+    return float(np.percentile(medians, tail)), float(np.percentile(medians, 100 - tail))
+
+
+def calibration_workload(rows=1_000_000, seed=0):
+    """Fixed mix of numpy and pure-Python work: the unit gate timings are compared in."""
+    values = np.random.default_rng(seed).random(rows)
+
+    def run():
+        total = 0.0
+        for value in values[:rows // 4].tolist():
+            total += value * value
+        return np.sort(values).sum() + total
+    return run
+
+
+def _summary(rows, seconds):
+    low, high = median_confidence_interval(seconds)
+    return {'rows': rows, 'median_seconds': float(np.median(seconds)), 'ci_low': low, 'ci_high': high,
+            'seconds': seconds}
+
+
+def measure(repeat=7, seed=0, benchmarks=None):
+    """
+    Timing summary (median, confidence interval, trials) of the calibration workload and of
+    every gate benchmark (`benchmarks`: name -> rows, GATE_BENCHMARKS by default).
+    """
+    generator = SyntheticQWS(seed=seed)
+    calibration = calibration_workload()
+    calibration()
+    timings = {CALIBRATION: _summary(None, run_benchmarks.time_benchmark(calibration, repeat)[0])}
+    for name, rows in (benchmarks or GATE_BENCHMARKS).items():
+        setup = run_benchmarks.BENCHMARKS[name][0]
+        with redirect_stdout(io.StringIO()):
+            run = setup(generator.generate(rows))
+            run()  # warm-up (imports, caches)
+        timings[name] = _summary(rows, run_benchmarks.time_benchmark(run, repeat)[0])
+    return timings
+
+
+def ranking_outputs(seed=0):
+    """Scores and dense ranks of every ranking benchmark on a small fixed synthetic dataset."""
+    df = SyntheticQWS(seed=seed).generate(DRIFT_ROWS)
+    outputs = {}
+    for name, (scores_of, descending) in RANKED_OUTPUTS.items():
+        with redirect_stdout(io.StringIO()):
+            scores = np.asarray(scores_of(run_benchmarks.BENCHMARKS[name][0](df)()), dtype=float)
+        ranks = rankdata(-scores if descending else scores, method='dense')
+        outputs[name] = {'scores': scores.round(10).tolist(), 'ranks': ranks.astype(int).tolist()}
+    return outputs
+
+
+def compare_timings(baseline, current, threshold=0.25):
+    """
+    A benchmark regresses when its median is more than `threshold` (relative) above the
+    baseline median and the confidence intervals do not overlap (current CI entirely above).
+    When both sides timed the calibration workload, current timings are first rescaled by the
+    ratio of the calibration medians, i.e. expressed in baseline-machine seconds.
+    """
+    failures = []
+    scale = 1.0
+    if CALIBRATION in baseline and CALIBRATION in current:
+        scale = baseline[CALIBRATION]['median_seconds'] / current[CALIBRATION]['median_seconds']
+    for name, reference in baseline.items():
+        if name == CALIBRATION or name not in current:
+            continue
+        median, ci_low = current[name]['median_seconds'] * scale, current[name]['ci_low'] * scale
+        slowdown = median / reference['median_seconds'] - 1
+        if slowdown > threshold and ci_low > reference['ci_high']:
+            failures.append(f"{name}: {median:.4f} s vs baseline {reference['median_seconds']:.4f} s "
+                            f"(+{slowdown:.0%}, threshold {threshold:.0%}, calibrated x{scale:.2f})")
+    return failures
+
+
+def compare_rankings(baseline, current, score_tolerance=1e-8):
+    """Flags any changed rank, or score change beyond `score_tolerance`, in the ranking outputs."""
+    failures = []
+    for name, reference in baseline.items():
+        if name not in current:
+            continue
+        old_ranks, new_ranks = np.asarray(reference['ranks']), np.asarray(current[name]['ranks'])
+        old_scores, new_scores = np.asarray(reference['scores']), np.asarray(current[name]['scores'])
+        if old_ranks.shape != new_ranks.shape:
+            failures.append(f"{name}: ranked {len(new_ranks)} services, baseline ranked {len(old_ranks)}")
+            continue
+        moved = int((old_ranks != new_ranks).sum())
+        score_change = float(np.nanmax(np.abs(old_scores - new_scores))) if len(old_scores) else 0.0
+        if moved or score_change > score_tolerance:
+            failures.append(f"{name}: {moved} services changed rank, max score change {score_change:.3g}")
+    return failures
+
+
+def update_baseline(path=BASELINE_PATH, repeat=7, seed=0, benchmarks=None):
+    baseline = {'environment': run_benchmarks.environment(), 'seed': seed, 'repeat': repeat,
+                'timings': measure(repeat, seed, benchmarks), 'rankings': ranking_outputs(seed)}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=1)
+    return baseline
+
+
+def check(path=BASELINE_PATH, threshold=0.25, repeat=7, timings=True, rankings=True):
+    """
+    Run the gate against the benchmarks (and row counts) recorded in the baseline; returns the
+    list of failures (empty when everything passes).
+    """
+    with open(path, encoding='utf-8') as file:
+        baseline = json.load(file)
+    failures = []
+    if rankings:
+        failures += compare_rankings(baseline['rankings'], ranking_outputs(baseline['seed']))
+    if timings:
+        benchmarks = {name: timing['rows'] for name, timing in baseline['timings'].items() if name != CALIBRATION}
+        failures += compare_timings(baseline['timings'], measure(repeat, baseline['seed'], benchmarks), threshold)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fail on benchmark slowdowns or ranking drift')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=float(os.environ.get('QWS_PERF_THRESHOLD', 0.25)),
+                        help='allowed relative slowdown of the median (default 0.25)')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args(argv)
+    if args.update_baseline:
+        update_baseline(args.baseline, args.repeat)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    failures = check(args.baseline, args.threshold, args.repeat)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    print("Performance gate failed." if failures else "Performance gate passed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Master Thesis Project - QWS Dataset Analysis Based On Fuzzy Logic Principles
+Author: Paulius Lėveris
+"""
+
+# Benchmark suite: times every scoring path on synthetic QWS-shaped datasets
+# Usage: python benchmarks/run_benchmarks.py --sizes 10000 100000 1000000 --repeat 3
+
+import sys, os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src', 'real-data'))
+
+import argparse
+from contextlib import redirect_stdout
+import io
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from synthetic_qws import SyntheticQWS
+from src.StageCache import stage_cache
+
+stage_cache.configure(enabled=False)  # benchmarks time the computations, never cached outputs
+
+CRITERIA = ['Response Time', 'Latency', 'Availability', 'Reliability', 'Best Practices', 'Successability']
+CRITERIA_TYPES = ['min', 'min', 'max', 'max', 'max', 'max']
+
+
+def _entropy_weights(df):
+    from ws_evaluation_tool import calculate_weights
+    matrix = df[CRITERIA]
+    return lambda: calculate_weights(matrix, CRITERIA_TYPES)
+
+
+def _weights(matrix):
+    from ws_evaluation_tool import calculate_weights
+    with redirect_stdout(io.StringIO()):
+        return calculate_weights(matrix, CRITERIA_TYPES)
+
+
+def _waspas(df):
+    from ws_evaluation_tool import fuzzy_waspas
+    matrix = df[CRITERIA]
+    weights = _weights(matrix)
+    return lambda: fuzzy_waspas(matrix, weights, CRITERIA_TYPES)
+
+
+def _vikor(df):
+    from ws_evaluation_tool import fuzzy_vikor
+    matrix = df[CRITERIA]
+    weights = _weights(matrix)
+    return lambda: fuzzy_vikor(matrix, weights, CRITERIA_TYPES)
+
+
+def _fuzzy_topsis(df):
+    from src.FuzzyTopsis import FuzzyTopsis
+
+    def run():
+        topsis = FuzzyTopsis(df)
+        # FuzzyTopsis only keeps the first 15 rows; benchmark the method on the whole dataset
+        topsis.data = df.copy()
+        topsis.availability_scores = df['Availability'].values
+        topsis.evaluate()
+        return topsis.data['FuzzyTOPSIS_Score'].sort_index()
+    return run
+
+
+def _fuzzy_trust(df):
+    from ws_trust_prediction import evaluate_trustworthiness
+    return lambda: df.apply(evaluate_trustworthiness, axis=1)
+
+
+def _classifier(df):
+    from src.Classification import Classification
+    classifier = Classification()
+    classifier.data = df.assign(**{'': np.nan})  # trailing empty column, as in qws.csv
+    with redirect_stdout(io.StringIO()):
+        classifier.process()
+    return classifier
+
+
+def _classifier_train(df):
+    classifier = _classifier(df)
+    return classifier.trainModel
+
+
+def _classifier_predict(df):
+    classifier = _classifier(df)
+    with redirect_stdout(io.StringIO()):
+        classifier.trainModel()
+    return lambda: classifier.model.predict(classifier.X_test)
+
+
+def _classifier_batch_predict(df):
+    from report_export import open_sink
+    classifier = _classifier(df)
+    with redirect_stdout(io.StringIO()):
+        classifier.trainModel()
+    directory = tempfile.mkdtemp()
+
+    def run():
+        with open_sink(os.path.join(directory, 'predictions.cols')) as sink, redirect_stdout(io.StringIO()):
+            return classifier.predictBatch(df, sink)
+    return run
+
+
+def _report(df, output_name):
+    from ws_evaluation_tool import fuzzy_waspas, stream_report
+    matrix = df[CRITERIA]
+    with redirect_stdout(io.StringIO()):
+        waspas = fuzzy_waspas(matrix, _weights(matrix), CRITERIA_TYPES)
+    directory = tempfile.mkdtemp()
+    return lambda: stream_report(df, waspas, waspas, output_path=os.path.join(directory, output_name))
+
+
+# name -> (setup(df) returning the timed callable, largest dataset it is run on)
+# The row caps keep the per-row paths (VIKOR loop, fuzzy trust, random forest) within minutes.
+BENCHMARKS = {
+    'entropy_weights': (_entropy_weights, None),
+    'waspas': (_waspas, None),
+    'vikor': (_vikor, 10_000),
+    'fuzzy_topsis': (_fuzzy_topsis, None),
+    'fuzzy_trust': (_fuzzy_trust, 10_000),
+    'classifier_train': (_classifier_train, 100_000),
+    'classifier_predict': (_classifier_predict, 1_000_000),
+    'classifier_batch_predict': (_classifier_batch_predict, 1_000_000),
+    'report_csv': (lambda df: _report(df, 'report.csv'), None),
+    'report_columnar': (lambda df: _report(df, 'report.cols'), None),
+}
+
+
+def time_benchmark(run, repeat=3, memory=False):
+    """Wall-clock seconds of `repeat` runs (plus the peak traced memory of one extra run if asked)."""
+    seconds = []
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            seconds.append(time.perf_counter() - start)
+        peak = None
+        if memory:
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def run_benchmarks(sizes, names=None, repeat=3, memory=False, seed=0, max_rows=None):
+    """
+    Run the selected benchmarks on synthetic datasets of every size. Returns the list of
+    result records; benchmarks above their row cap are recorded as skipped.
+    """
+    generator = SyntheticQWS(seed=seed)
+    results = []
+    for size in sizes:
+        df = generator.generate(size)
+        for name in names or BENCHMARKS:
+            setup, cap = BENCHMARKS[name]
+            cap = max_rows.get(name, cap) if max_rows else cap
+            record = {'benchmark': name, 'rows': size}
+            if cap is not None and size > cap:
+                results.append({**record, 'skipped': f'more than {cap} rows'})
+                continue
+            with redirect_stdout(io.StringIO()):
+                run = setup(df)
+            seconds, peak = time_benchmark(run, repeat, memory)
+            median = statistics.median(seconds)
+            results.append({**record, 'seconds': seconds, 'median_seconds': median, 'min_seconds': min(seconds),
+                            'rows_per_second': size / median if median > 0 else None,
+                            'peak_memory_bytes': peak})
+            print(f"{name:>20} {size:>10} rows: {median:.4f} s (median of {repeat})")
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the QWS scoring paths on synthetic data')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--memory', action='store_true', help='also record peak traced memory (one extra run)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'results',
+                                                         time.strftime('benchmark-%Y%m%d-%H%M%S.json')))
+    args = parser.parse_args(argv)
+    results = run_benchmarks(args.sizes, args.benchmarks, args.repeat, args.memory, args.seed)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({'environment': environment(), 'seed': args.seed, 'repeat': args.repeat, 'results': results},
+                  file, indent=2)
+    print(f"Benchmark results saved to {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
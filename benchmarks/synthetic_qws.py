@@ -0,0 +1,75 @@
+"""
+Master Thesis Project - QWS Dataset Analysis Based On Fuzzy Logic Principles
+Author: Paulius Lėveris
+"""
+
+# Synthetic QWS-shaped datasets for benchmarking at scale
+
+import os
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+QWS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataset', 'qws.csv')
+NUMERIC_COLUMNS = [
+    'Response Time', 'Availability', 'Throughput', 'Successability',
+    'Reliability', 'Compliance', 'Best Practices', 'Latency', 'Documentation'
+]
+
+
+class SyntheticQWS:
+    """
+    Gaussian copula fitted to qws.csv: every criterion keeps its empirical marginal
+    distribution (quantile function, so ranges and integer-valued columns are preserved)
+    and the criteria keep their rank (Spearman) correlations. Rows are generated in
+    chunks, so 10M-row datasets can be streamed or written without holding copies.
+    """
+
+    def __init__(self, source_path=QWS_PATH, seed=0):
+        source = pd.read_csv(source_path)[NUMERIC_COLUMNS].apply(pd.to_numeric, errors='coerce').dropna()
+        values = source.to_numpy(dtype=float)
+        self.columns = NUMERIC_COLUMNS
+        self._quantiles = np.sort(values, axis=0)
+        self._probabilities = (np.arange(len(values)) + 0.5) / len(values)
+        self._integral = (values == np.round(values)).all(axis=0)
+        spearman = source.corr(method='spearman').to_numpy()
+        # Pearson correlation of the latent normals that gives this Spearman correlation
+        latent = 2 * np.sin(np.pi * spearman / 6)
+        eigenvalues, eigenvectors = np.linalg.eigh(latent)
+        latent = eigenvectors @ np.diag(np.maximum(eigenvalues, 1e-8)) @ eigenvectors.T
+        self._cholesky = np.linalg.cholesky(latent)
+        self.seed = seed
+
+    def iter_chunks(self, n_rows, chunk_size=1_000_000, names=True):
+        """Yield DataFrames of at most chunk_size rows with the qws.csv columns."""
+        rng = np.random.default_rng(self.seed)
+        for start in range(0, n_rows, chunk_size):
+            rows = min(chunk_size, n_rows - start)
+            uniform = ndtr(rng.standard_normal((rows, len(self.columns))) @ self._cholesky.T)
+            chunk = pd.DataFrame({
+                column: self._marginal(uniform[:, i], i) for i, column in enumerate(self.columns)
+            })
+            if names:
+                ids = np.arange(start, start + rows).astype(str)
+                chunk['Service Name'] = np.char.add('Service', ids)
+                chunk['WSDL Address'] = np.char.add(np.char.add('http://synthetic.qws/', ids), '?wsdl')
+            yield chunk
+
+    def _marginal(self, uniform, column):
+        values = np.interp(uniform, self._probabilities, self._quantiles[:, column])
+        return np.round(values) if self._integral[column] else np.round(values, 2)
+
+    def generate(self, n_rows, chunk_size=1_000_000, names=True):
+        return pd.concat(self.iter_chunks(n_rows, chunk_size, names), ignore_index=True)
+
+    def write_csv(self, path, n_rows, chunk_size=1_000_000):
+        """Write a qws.csv-shaped file (including the trailing empty column) chunk by chunk."""
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            for i, chunk in enumerate(self.iter_chunks(n_rows, chunk_size)):
+                chunk[''] = None
+                chunk.to_csv(file, index=False, header=i == 0)
+        return path
+
+
+def generate_qws(n_rows, seed=0, names=True):
+    return SyntheticQWS(seed=seed).generate(n_rows, names=names)
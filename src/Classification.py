@@ -3,32 +3,43 @@ Master Thesis Project - QWS Dataset Analysis Based On Fuzzy Logic Principles
 Author: Paulius Lėveris
 """
 
+import time
+import tracemalloc
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
-from DataReader import DataReader
+from src import GlobalVars
+from src.DataReader import DataReader
+from src.Instrumentation import instrumented
 
 class Classification:
+    # target label for classification, for testing purposes now: Availability
+    availability_threshold = 85  # TODO: configure the value via config or GUI per-user decision
+
     def __init__(self):
         self.data = None
         self.model = None
+        self.scaler = None
         self.X_train, self.X_test, self.y_train, self.y_test = None, None, None, None
 
+    @instrumented('classification_load', rows=lambda result, self: len(self.data))
     def loadData(self):
         dataReader = DataReader()
-        self.data = dataReader.read()
+        # Only the QoS criteria are used as features, so names, addresses and the trailing empty column are not parsed
+        self.data = dataReader.read(GlobalVars.qws_criteria, GlobalVars.qws_dtypes)
         
         # Display the first few rows to check if data is present
         print(self.data.head())
 
+    @instrumented('classification_process', rows=lambda result, self: len(self.data))
     def process(self):
         # Some columns are not needed as they do not provide any value (since these are text-only)
-        self.data = self.data.iloc[:, :-1]  # Remove trailing empty column if present
-        self.data.drop(['Service Name', 'WSDL Address'], axis=1, inplace=True)
+        self.data = self.data[GlobalVars.qws_criteria]
         
         # Conversion to numeric values
         self.data = self.data.apply(pd.to_numeric, errors='coerce')
@@ -36,27 +47,146 @@ class Classification:
         # Handle missing values (if any)
         self.data.fillna(self.data.mean(), inplace=True)
 
-        # target label for classification, for testing purposes now: Availability
-        threshold = 85  # TODO: configure the value via config or GUI per-user decision
-        self.data['Class'] = self.data['Availability'].apply(lambda x: 'High' if x >= threshold else 'Low')
+        self.data['Class'] = self._label(self.data)
 
         # Separate features and target
         X = self.data.drop('Class', axis=1)
         y = self.data['Class']
 
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
+        self.scaler = StandardScaler()
+        X_scaled = self.scaler.fit_transform(X)
 
         self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
             X_scaled, y, test_size=0.2, random_state=42
         )
         print("Data preprocessing completed.")
 
+    @instrumented('classification_train', rows=lambda result, self: len(self.X_train))
     def trainModel(self):
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.model.fit(self.X_train, self.y_train)
         print("Model training completed.")
 
+    @instrumented('classification_update', rows=lambda result, self, new_data, *args, **kwargs: len(new_data))
+    def updateModel(self, new_data, trees_per_update=10, max_trees=None, replay=1.0, test_size=0.2):
+        """
+        Incremental (warm-start) update from a window of new QoS observations instead of a full refit.
+
+        The scaler fitted in process() stays frozen: the window is scaled with the statistics the
+        existing trees were grown on, so old and new trees share one feature space and the old
+        trees keep their decisions. Tree splits do not depend on a fixed affine scaling, so the
+        forest loses nothing by it; the scaler is only refit when process() and trainModel()
+        rebuild the forest. `trees_per_update` new trees are grown on the window's training part
+        plus a replay sample of earlier training rows (`replay` times the window size). With
+        `max_trees`, the oldest trees are dropped to keep the forest at that size. The window's
+        rows join X_train/X_test, so compareWithRetrain() sees all the data.
+        """
+        started = time.perf_counter()
+        X_raw = new_data[GlobalVars.qws_criteria].apply(pd.to_numeric, errors='coerce')
+        X_raw = X_raw.fillna(pd.Series(self.scaler.mean_, index=GlobalVars.qws_criteria))
+        y = self._label(X_raw)
+        X = self.scaler.transform(X_raw)
+        if test_size and len(X) * test_size >= 1:
+            X_new, X_new_test, y_new, y_new_test = train_test_split(X, y, test_size=test_size, random_state=42)
+        else:
+            X_new, X_new_test, y_new, y_new_test = X, X[:0], y, y[:0]
+
+        rng = np.random.default_rng(len(self.model.estimators_))
+        replayed = rng.choice(len(self.X_train), min(len(self.X_train), int(replay * len(X_new))), replace=False)
+        fit_X = np.vstack([X_new, self.X_train[replayed]])
+        fit_y = pd.concat([y_new, self.y_train.iloc[replayed]])
+        if set(fit_y) != set(self.model.classes_):
+            raise ValueError(f"Update window has classes {sorted(set(fit_y))}, the model {list(self.model.classes_)}")
+        self.model.set_params(warm_start=True, n_estimators=len(self.model.estimators_) + trees_per_update)
+        self.model.fit(fit_X, fit_y)
+        if max_trees is not None and len(self.model.estimators_) > max_trees:
+            del self.model.estimators_[:-max_trees]
+            self.model.set_params(n_estimators=max_trees)
+
+        self.X_train = np.vstack([self.X_train, X_new])
+        self.y_train = pd.concat([self.y_train, y_new])
+        self.X_test = np.vstack([self.X_test, X_new_test])
+        self.y_test = pd.concat([self.y_test, y_new_test])
+        update = {'rows': len(new_data), 'trees': len(self.model.estimators_),
+                  'seconds': time.perf_counter() - started}
+        print(f"Model updated with {len(new_data)} new observations ({update['trees']} trees).")
+        return update
+
+    def compareWithRetrain(self):
+        """Test accuracy of the (incrementally updated) model versus a full retrain on all training rows."""
+        started = time.perf_counter()
+        retrained = RandomForestClassifier(n_estimators=len(self.model.estimators_), random_state=42)
+        retrained.fit(self.X_train, self.y_train)
+        retrain_seconds = time.perf_counter() - started
+        incremental = accuracy_score(self.y_test, self.model.predict(self.X_test))
+        full = accuracy_score(self.y_test, retrained.predict(self.X_test))
+        print(f"Accuracy: incremental {incremental:.4f}, full retrain {full:.4f} (drift {incremental - full:+.4f})")
+        return {'incremental_accuracy': incremental, 'full_retrain_accuracy': full,
+                'accuracy_drift': incremental - full, 'retrain_seconds': retrain_seconds}
+
+    @instrumented('classification_predict_batch', rows=lambda result, self, *args, **kwargs: result['rows'])
+    def predictBatch(self, source, sink, chunk_size=100_000, n_jobs=-1, key_columns=('WSDL Address',),
+                     trace_memory=False):
+        """
+        Classify a whole catalogue chunk by chunk and write the predictions to `sink`
+        (anything with write(DataFrame), e.g. report_export.open_sink(path)).
+
+        `source` is a DataFrame or a qws.csv-shaped CSV path, read `chunk_size` rows at a time.
+        Each chunk's criteria are scaled column by column in float64 with the fitted scaler's
+        statistics (missing values take the mean), exactly as scaler.transform does, and stored
+        as float32 (the forest's own input dtype, so sklearn makes no further copy) before
+        predict_proba runs with the trees spread over `n_jobs` threads. Rows written per chunk:
+        the `key_columns` present in the source, 'Predicted Class' and 'Probability <class>'.
+        Returns rows, seconds, rows_per_second and peak_memory_bytes. The peak is only traced
+        with trace_memory=True (tracing slows allocations, so rows_per_second drops; None
+        otherwise) and is left to instrumentation when tracemalloc is already running.
+        """
+        if isinstance(source, pd.DataFrame):
+            chunks = (source.iloc[start:start + chunk_size] for start in range(0, len(source), chunk_size))
+        else:
+            header = pd.read_csv(source, nrows=0).columns
+            usecols = GlobalVars.qws_criteria + [column for column in key_columns if column in header]
+            chunks = pd.read_csv(source, usecols=usecols, chunksize=chunk_size,
+                                 dtype={column: 'float64' for column in GlobalVars.qws_criteria})
+        tracing = trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        n_jobs, self.model.n_jobs = self.model.n_jobs, n_jobs
+        mean, scale = self.scaler.mean_, self.scaler.scale_
+        rows = 0
+        started = time.perf_counter()
+        try:
+            for chunk in chunks:
+                X = np.empty((len(chunk), len(GlobalVars.qws_criteria)), dtype=np.float32)
+                for i, column in enumerate(GlobalVars.qws_criteria):
+                    values = pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=np.float64)
+                    values = np.where(np.isnan(values), mean[i], values)
+                    values -= mean[i]  # the scaler's transform, one float64 column at a time
+                    values /= scale[i]
+                    X[:, i] = values
+                probabilities = self.model.predict_proba(X)
+                predictions = pd.DataFrame({column: chunk[column].to_numpy()
+                                            for column in key_columns if column in chunk.columns})
+                predictions['Predicted Class'] = self.model.classes_[probabilities.argmax(axis=1)]
+                for i, label in enumerate(self.model.classes_):
+                    predictions[f'Probability {label}'] = probabilities[:, i]
+                sink.write(predictions)
+                rows += len(chunk)
+        finally:
+            self.model.n_jobs = n_jobs
+            seconds = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if tracing else None
+            if tracing:
+                tracemalloc.stop()
+        report = {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds if seconds else 0.0,
+                  'peak_memory_bytes': peak}
+        print(f"Classified {rows} services ({report['rows_per_second']:.0f} rows/s).")
+        return report
+
+    def _label(self, data):
+        return data['Availability'].apply(lambda x: 'High' if x >= self.availability_threshold else 'Low')
+
+    @instrumented('classification_evaluate', rows=lambda result, self: len(self.X_test))
     def evaluateModel(self):
         y_pred = self.model.predict(self.X_test)
         
@@ -4,12 +4,30 @@ Author: Paulius Lėveris
 """
 
 import pandas as pd
-import GlobalVars
+
+from src import GlobalVars
 
 class DataReader:
-    def __init__(self):
-        self.dataset_path = GlobalVars.dataset_path
+    def __init__(self, dataset_path=None):
+        self.dataset_path = dataset_path or GlobalVars.dataset_path
 
-    def read(self) -> str:
-        """Returns the whole CSV file data"""
-        return pd.read_csv(self.dataset_path)
+    def read(self, columns=None, dtypes=None) -> pd.DataFrame:
+        """
+        Returns the CSV file data. With `columns`, only those columns are parsed (in that order);
+        `dtypes` maps columns to the types the parser should produce. The header is checked first,
+        so a file without the requested columns fails before any data is parsed.
+        """
+        if columns is None and dtypes is None:
+            return pd.read_csv(self.dataset_path)
+        header = list(pd.read_csv(self.dataset_path, nrows=0).columns)
+        if columns is None:
+            columns = [column for column in header if not column.startswith('Unnamed')]
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise ValueError(f"{self.dataset_path} is missing columns {missing} (found {header})")
+        dtypes = {column: dtype for column, dtype in (dtypes or {}).items() if column in columns}
+        try:
+            data = pd.read_csv(self.dataset_path, usecols=columns, dtype=dtypes)
+        except (ValueError, TypeError) as error:
+            raise ValueError(f"{self.dataset_path} does not match the expected column types: {error}") from error
+        return data[list(columns)]
@@ -11,3 +11,23 @@ import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
 dataset_path = os.path.join(current_dir, '../dataset', 'qws.csv')
+
+# Per-stage timing/memory instrumentation (see Instrumentation.py), off by default
+instrumentation_enabled = os.environ.get('QWS_INSTRUMENTATION', '0').lower() in ('1', 'true', 'yes')
+instrumentation_output = os.environ.get('QWS_INSTRUMENTATION_OUTPUT', os.path.join(current_dir, '../output', 'stage_metrics.json'))
+
+# Opt-in profiling of pipeline entry points (see Profiling.py): '', 'deterministic' or 'sampling'
+profiling_mode = os.environ.get('QWS_PROFILE', '').lower()
+profiling_output = os.environ.get('QWS_PROFILE_DIR', os.path.join(current_dir, '../output', 'profiles'))
+
+# Content-addressed cache of scoring stage outputs (see StageCache.py), off by default
+stage_cache_enabled = os.environ.get('QWS_STAGE_CACHE', '0').lower() in ('1', 'true', 'yes')
+stage_cache_dir = os.environ.get('QWS_STAGE_CACHE_DIR', os.path.join(current_dir, '../output', 'stage_cache'))
+stage_cache_max_bytes = int(os.environ.get('QWS_STAGE_CACHE_MAX_BYTES', 1 << 30))
+
+# QWS schema: the nine QoS criteria and the text columns, with the dtypes loaders push down to the CSV parser
+qws_criteria = [
+    'Response Time', 'Availability', 'Throughput', 'Successability', 'Reliability',
+    'Compliance', 'Best Practices', 'Latency', 'Documentation'
+]
+qws_dtypes = {**{column: 'float64' for column in qws_criteria}, 'Service Name': 'str', 'WSDL Address': 'str'}
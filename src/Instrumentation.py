@@ -0,0 +1,148 @@
+"""
+Master Thesis Project - QWS Dataset Analysis Based On Fuzzy Logic Principles
+Author: Paulius Lėveris
+"""
+
+# Instrumentation Module
+# Per-stage wall time, CPU time, peak memory and row counts, emitted as JSON
+
+import atexit
+from contextlib import contextmanager
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from src import GlobalVars
+
+
+def _default_rows(result, args):
+    """Rows processed: the length of the first table-like argument, else of the result."""
+    for value in (*args, result):
+        if hasattr(value, "shape") and len(getattr(value, "shape", ())) > 0:
+            return int(value.shape[0])
+    return None
+
+
+class Instrumentation:
+    """
+    Records one entry per pipeline stage: wall and CPU seconds, peak traced memory
+    (tracemalloc, nested stages handled) and rows processed.
+
+    Disabled by default (GlobalVars.instrumentation_enabled / QWS_INSTRUMENTATION=1);
+    when disabled an instrumented function costs a single attribute check per call.
+    When enabled with an output path, the records are written as JSON at exit.
+    """
+
+    def __init__(self, enabled=False, output_path=None, trace_memory=True):
+        self.enabled = False
+        self.output_path = None
+        self.trace_memory = trace_memory
+        self.records = []
+        self._local = threading.local()
+        self._started_tracing = False
+        self._dump_registered = False
+        self.configure(enabled, output_path, trace_memory)
+
+    def configure(self, enabled=None, output_path=None, trace_memory=None):
+        if trace_memory is not None:
+            self.trace_memory = trace_memory
+        if output_path is not None:
+            self.output_path = output_path
+        if enabled is not None:
+            self.enabled = enabled
+        if self.enabled and self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif not self.enabled and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self.enabled and self.output_path and not self._dump_registered:
+            atexit.register(lambda: self.enabled and self.records and self.dump())
+            self._dump_registered = True
+        return self
+
+    def reset(self):
+        self.records = []
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name, rows=None, **tags):
+        """
+        Time a block of code. Yields the record, so `rows` can also be filled in
+        inside the block once it is known.
+        """
+        if not self.enabled:
+            yield {}
+            return
+        stack = self._stack()
+        record = {"stage": name, "parent": stack[-1]["stage"] if stack else None, "rows": rows, **tags}
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+            tracemalloc.reset_peak()
+            record["_start"], record["_peak"] = current, current
+        stack.append(record)
+        record["started_at"] = time.time()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall
+            record["cpu_seconds"] = time.process_time() - cpu
+            stack.pop()
+            if tracing:
+                peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1])
+                record["peak_memory_bytes"] = peak - record.pop("_start")
+                if stack:
+                    stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+            else:
+                record["peak_memory_bytes"] = None
+            if record["rows"] and record["wall_seconds"] > 0:
+                record["rows_per_second"] = record["rows"] / record["wall_seconds"]
+            self.records.append(record)
+
+    def instrument(self, name=None, rows=None):
+        """
+        Decorator recording every call of a function as a stage. `rows(result, *args, **kwargs)`
+        returns the rows processed; by default the length of the first DataFrame/array argument
+        (or of the result) is used.
+        """
+        def decorator(func):
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.stage(stage_name) as record:
+                    result = func(*args, **kwargs)
+                    record["rows"] = rows(result, *args, **kwargs) if rows else _default_rows(result, args)
+                return result
+            return wrapper
+        return decorator
+
+    def to_json(self):
+        return json.dumps({"stages": self.records}, indent=2, default=str)
+
+    def dump(self, path=None):
+        """Write the recorded stages as JSON (to the configured output path by default)."""
+        path = path or self.output_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.to_json())
+        return path
+
+
+instrumentation = Instrumentation(GlobalVars.instrumentation_enabled, GlobalVars.instrumentation_output)
+instrumented = instrumentation.instrument
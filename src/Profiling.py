@@ -0,0 +1,229 @@
+"""
+Master Thesis Project - QWS Dataset Analysis Based On Fuzzy Logic Principles
+Author: Paulius Lėveris
+"""
+
+# Profiling Module
+# Opt-in profiles of pipeline entry points: pstats and collapsed stacks (flamegraph.pl / speedscope input)
+
+from collections import Counter
+from contextlib import contextmanager
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+from src import GlobalVars
+
+MODES = ('deterministic', 'sampling')
+
+# (file path suffix, function name) of the functions summarized in every run's metadata
+HOT_FUNCTIONS = {
+    'evaluate_trustworthiness': ('ws_trust_prediction.py', 'evaluate_trustworthiness'),
+    'fuzzy_vikor': ('ws_evaluation_tool.py', 'fuzzy_vikor'),
+    'calculate_weights': ('ws_evaluation_tool.py', 'calculate_weights'),
+    'RandomForestClassifier.fit': (os.path.join('ensemble', '_forest.py'), 'fit'),
+}
+
+
+def _label(filename, line, name):
+    if filename == '~':  # built-in
+        return name.replace(';', ',')
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(';', ',')
+
+
+def _is_hot(filename, name, hot):
+    suffix, function = hot
+    return name == function and filename.endswith(suffix)
+
+
+class StackSampler:
+    """Samples the stack of one thread every `interval` seconds from a background thread."""
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename != __file__ and not code.co_filename.endswith('contextlib.py'):
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def collapsed_from_sampler(samples):
+    """'root;...;leaf count' lines from sampled stacks."""
+    return [f"{';'.join(_label(*frame) for frame in stack)} {count}" for stack, count in samples.items()]
+
+
+def collapsed_from_stats(stats, min_microseconds=1, max_depth=128):
+    """
+    Collapsed stacks from a cProfile call graph. cProfile keeps caller -> callee edges,
+    not full stacks, so every function's time is split over its call paths in proportion
+    to the cumulative time of each edge (the usual pstats-to-flamegraph approximation).
+    Values are microseconds of self time.
+    """
+    callees = {}
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((function, edge[3]))
+    lines = Counter()
+
+    def descend(function, path, seconds):
+        tottime, cumtime = stats[function][2], stats[function][3]
+        path = path + [_label(*function)]
+        if cumtime <= 0:
+            return
+        self_microseconds = seconds * min(tottime / cumtime, 1.0) * 1e6
+        if self_microseconds >= min_microseconds:
+            lines[';'.join(path)] += int(round(self_microseconds))
+        if len(path) >= max_depth:
+            return
+        for callee, edge_cumtime in callees.get(function, []):
+            share = seconds * edge_cumtime / cumtime
+            if share * 1e6 >= min_microseconds and _label(*callee) not in path:
+                descend(callee, path, share)
+
+    for function, (_, _, _, cumtime, callers) in stats.items():
+        if not callers:
+            descend(function, [], cumtime)
+    return [f"{stack} {value}" for stack, value in lines.items()]
+
+
+class Profiler:
+    """
+    Opt-in profiling of pipeline entry points, configured by GlobalVars.profiling_mode
+    (QWS_PROFILE=deterministic|sampling). Every profiled run writes to the output directory:
+
+    - <name>-<rows>rows-<time>.pstats     (deterministic mode, cProfile)
+    - <name>-<rows>rows-<time>.collapsed  (both modes; flamegraph-ready)
+    - <name>-<rows>rows-<time>.json       (tags, wall time and a summary of HOT_FUNCTIONS)
+
+    Sampling mode has a much lower overhead on per-row loops but cannot produce pstats.
+    Entry points report their dataset size with tag(rows=...); when profiling is off,
+    profiled functions are called directly.
+    """
+
+    def __init__(self, mode='', output_dir=None, interval=0.005):
+        self.mode = ''
+        self.output_dir = output_dir
+        self.interval = interval
+        self.runs = []
+        self._session = None
+        self.configure(mode, output_dir)
+
+    def configure(self, mode=None, output_dir=None, interval=None):
+        if mode is not None:
+            if mode and mode not in MODES:
+                raise ValueError(f"Unsupported profiling mode '{mode}', expected one of {MODES} or ''")
+            self.mode = mode
+        if output_dir is not None:
+            self.output_dir = output_dir
+        if interval is not None:
+            self.interval = interval
+        return self
+
+    def tag(self, **tags):
+        """Attach tags (e.g. rows=len(df)) to the running profile; a no-op when not profiling."""
+        if self._session is not None:
+            self._session.update(tags)
+
+    @contextmanager
+    def session(self, name, **tags):
+        if not self.mode or self._session is not None:  # off, or already inside a profiled run
+            yield None
+            return
+        self._session = {'name': name, 'mode': self.mode, 'rows': None, **tags}
+        profile = sampler = None
+        if self.mode == 'deterministic':
+            profile = cProfile.Profile()
+        else:
+            sampler = StackSampler(threading.get_ident(), self.interval)
+        started = time.time()
+        wall = time.perf_counter()
+        try:
+            if profile is not None:
+                profile.enable()
+            else:
+                sampler.start()
+            yield self._session
+        finally:
+            if profile is not None:
+                profile.disable()
+            else:
+                sampler.stop()
+            session, self._session = self._session, None
+            session['started_at'] = started
+            session['wall_seconds'] = time.perf_counter() - wall
+            self.runs.append(self._write(session, profile, sampler))
+
+    def profile(self, name=None):
+        """Decorator profiling every call of a pipeline entry point."""
+        def decorator(func):
+            session_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.mode:
+                    return func(*args, **kwargs)
+                with self.session(session_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _write(self, session, profile, sampler):
+        os.makedirs(self.output_dir, exist_ok=True)
+        rows = f"{session['rows']}rows" if session['rows'] is not None else "unknownrows"
+        stem = os.path.join(self.output_dir, f"{session['name']}-{rows}-{time.strftime('%Y%m%d-%H%M%S')}")
+        files = {'collapsed': stem + '.collapsed'}
+        if profile is not None:
+            files['pstats'] = stem + '.pstats'
+            profile.dump_stats(files['pstats'])
+            stats = pstats.Stats(profile).stats
+            collapsed = collapsed_from_stats(stats)
+            session['hot_functions'] = {
+                label: {'calls': entry[1], 'self_seconds': entry[2], 'cumulative_seconds': entry[3]}
+                for label, hot in HOT_FUNCTIONS.items()
+                for (filename, _, function), entry in stats.items() if _is_hot(filename, function, hot)
+            }
+        else:
+            collapsed = collapsed_from_sampler(sampler.samples)
+            total = sum(sampler.samples.values())
+            session['samples'] = total
+            session['hot_functions'] = {}
+            for label, hot in HOT_FUNCTIONS.items():
+                samples = sum(count for stack, count in sampler.samples.items()
+                              if any(_is_hot(filename, function, hot) for filename, _, function in stack))
+                if samples:
+                    session['hot_functions'][label] = {'samples': samples,
+                                                       'fraction': samples / total}
+        with open(files['collapsed'], 'w', encoding='utf-8') as file:
+            file.write('\n'.join(collapsed) + '\n')
+        session['files'] = files
+        with open(stem + '.json', 'w', encoding='utf-8') as file:
+            json.dump(session, file, indent=2, default=str)
+        return session
+
+
+profiler = Profiler(GlobalVars.profiling_mode, GlobalVars.profiling_output)
+profiled = profiler.profile
@@ -0,0 +1,216 @@
+"""
+Master Thesis Project - QWS Dataset Analysis Based On Fuzzy Logic Principles
+Author: Paulius Lėveris
+"""
+
+# StageCache Module
+# Content-addressed on-disk cache of pipeline stage outputs, keyed by input data, stage code and parameters
+
+import functools
+import hashlib
+import inspect
+import marshal
+import os
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+
+from src import GlobalVars
+
+CACHE_FORMAT = 1
+
+
+def _digest(value, digest):
+    """Feed a canonical byte representation of a stage argument into `digest`."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        digest.update(type(value).__name__.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr([(str(column), str(dtype)) for column, dtype in value.dtypes.items()]).encode())
+        else:
+            digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(np.ascontiguousarray(pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index)))
+                      .tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(repr(("ndarray", value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"dict")
+        for key in sorted(value, key=repr):
+            _digest(key, digest)
+            _digest(value[key], digest)
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _digest(item, digest)
+    elif value is None or isinstance(value, (str, bytes, bool, int, float, complex, np.generic)):
+        digest.update(repr((type(value).__name__, value)).encode())
+    else:
+        digest.update(pickle.dumps(value, protocol=4))
+
+
+def _compiled_version(obj):
+    """Stand-in for unavailable source: never a repr, whose memory address changes every process."""
+    code = getattr(obj, '__code__', None)
+    if code is not None:
+        return marshal.dumps(code)  # bytecode, constants and names
+    module = inspect.getmodule(obj)
+    name = f"{getattr(module, '__name__', '')}.{getattr(obj, '__qualname__', type(obj).__qualname__)}".encode()
+    try:
+        with open(module.__file__, 'rb') as file:
+            return name + hashlib.sha256(file.read()).digest()
+    except (AttributeError, TypeError, OSError):  # built-ins: the name and Python version identify them
+        return name
+
+
+def code_version(*objects):
+    """Hash of the source code of functions, classes or modules (a stage's code version)."""
+    digest = hashlib.sha256()
+    for obj in objects:
+        try:
+            digest.update(inspect.getsource(obj).encode())
+        except (OSError, TypeError):  # no source available (built-ins, interactive code)
+            digest.update(_compiled_version(obj))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Pickled stage outputs under <directory>/<key[:2]>/<key>.pkl, where the key is a SHA-256
+    over the stage name, the code version (source of the stage function plus `depends_on`)
+    and every bound argument, defaults included: DataFrames and arrays by their content,
+    parameters (criteria types, lambda, v, ...) by value. A stage whose inputs, code and
+    parameters are unchanged loads its previous output; a downstream stage is only
+    recomputed when an upstream output it receives actually changed.
+
+    Entries are touched on every hit. The cache size is tracked as entries are written (one
+    directory scan per process), and once it grows beyond `max_bytes` the least recently used
+    entries are evicted. Disabled by default (GlobalVars.stage_cache_enabled /
+    QWS_STAGE_CACHE=1); when disabled a cached stage is called directly.
+
+    Entries are pickles, and loading a pickle can run arbitrary code: only point the cache
+    at a directory that no untrusted user can write to.
+    """
+
+    def __init__(self, enabled=False, directory=None, max_bytes=1 << 30):
+        self.enabled = False
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._size = None  # bytes on disk, scanned on first use
+        self.configure(enabled, directory, max_bytes)
+
+    def configure(self, enabled=None, directory=None, max_bytes=None):
+        if directory is not None:
+            self.directory = directory
+            self._size = None
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if enabled is not None:
+            self.enabled = enabled
+        return self
+
+    def key(self, name, code, arguments):
+        digest = hashlib.sha256(f"{CACHE_FORMAT}:{name}:{code}".encode())
+        for argument, value in arguments.items():
+            digest.update(argument.encode())
+            _digest(value, digest)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.pkl")
+
+    def get(self, key):
+        """(True, value) for a cached key, else (False, None)."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return False, None
+        os.utime(path)  # recently used
+        self.hits += 1
+        return True, value
+
+    def put(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        size = self.size()
+        try:
+            size -= os.path.getsize(path)  # replaced entry
+        except OSError:
+            pass
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(handle, 'wb') as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)  # readers never see a partial entry
+        self._size = size + os.path.getsize(path)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def size(self):
+        """Bytes of cached outputs (tracked in this process after one scan)."""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self.entries())
+        return self._size
+
+    def entries(self):
+        """(last used, bytes, path) of every cached output."""
+        if not os.path.isdir(self.directory):
+            return []
+        found = []
+        for shard in os.scandir(self.directory):
+            if shard.is_dir():
+                found += [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                          for entry in os.scandir(shard.path) if entry.name.endswith('.pkl')]
+        return found
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            self.evictions += 1
+        self._size = total
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+        self._size = 0
+
+    def stage(self, name=None, depends_on=()):
+        """
+        Decorator caching a pipeline stage. `depends_on` lists further functions, classes or
+        modules whose source belongs to the stage's code version (helpers, fuzzy rules, ...).
+        """
+        def decorator(func):
+            stage_name = name or func.__name__
+            signature = inspect.signature(func)
+            code = []
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                if not code:  # computed on first use: modules in depends_on may still be importing
+                    code.append(code_version(func, *depends_on))
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = self.key(stage_name, code[0], bound.arguments)
+                hit, value = self.get(key)
+                if hit:
+                    print(f"{stage_name}: loaded from the stage cache.")
+                    return value
+                value = func(*args, **kwargs)
+                self.put(key, value)
+                return value
+            return wrapper
+        return decorator
+
+
+stage_cache = StageCache(GlobalVars.stage_cache_enabled, GlobalVars.stage_cache_dir, GlobalVars.stage_cache_max_bytes)
+cached_stage = stage_cache.stage
@@ -3,14 +3,21 @@ Master Thesis Project - QWS Dataset Analysis Based On Fuzzy Logic Principles
 Author: Paulius Lėveris
 """
 
-from Classification import Classification
-from FuzzyTopsis import FuzzyTopsis
-from DataReader import DataReader
+import sys, os
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # the src package, when run as python main.py
+
+from src.Classification import Classification
+from src.FuzzyTopsis import FuzzyTopsis
+from src.DataReader import DataReader
+from src.Profiling import profiled, profiler
+
+@profiled('main')
 def main():
     classifier = Classification()
     
     classifier.loadData()
+    profiler.tag(rows=len(classifier.data))
     classifier.process()
     classifier.trainModel()
     classifier.evaluateModel()
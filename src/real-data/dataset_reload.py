@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Change-detection reload: diff a new dataset version by row hashes and rescore only what changed"""
+
+import numpy as np
+import pandas as pd
+from incremental_ranking import IncrementalRankingEngine
+from report_export import export_frames, open_sink, read_columnar
+
+KEY_COLUMN = "Service Key"
+HASH_COLUMN = "Row Hash"
+
+
+def service_keys(df, key_column="WSDL Address"):
+    """
+    Unique service keys: the key column, with "#2", "#3", ... appended to repeated values
+    (qws.csv lists some WSDL Addresses more than once), in order of appearance.
+    """
+    keys = df[key_column].astype(str).reset_index(drop=True)
+    occurrence = keys.groupby(keys, sort=False).cumcount().to_numpy()
+    return pd.Index(np.where(occurrence == 0, keys, keys + "#" + (occurrence + 1).astype(str)), name=KEY_COLUMN)
+
+
+def row_hashes(df, columns=None):
+    """64-bit hash of every row over `columns` (all columns by default), vectorized by pandas."""
+    return pd.util.hash_pandas_object(df if columns is None else df[columns], index=False).to_numpy()
+
+
+def diff_hashes(old, new):
+    """
+    Added, removed and changed keys between two row-hash Series indexed by service key
+    (each in the order of the Series it comes from).
+    """
+    in_old = new.index.isin(old.index)
+    common = new.index[in_old]
+    changed = common[old.reindex(common).to_numpy() != new[in_old].to_numpy()]
+    return {"added": new.index[~in_old], "removed": old.index[~old.index.isin(new.index)], "changed": changed}
+
+
+class DatasetReloader:
+    """
+    Keeps the WASPAS/VIKOR ranking of a qws.csv-shaped dataset current across file versions.
+
+    Every version is keyed by service (service_keys) and hashed row by row over all its
+    columns. reload() diffs the new hashes against the previous version, removes, adds and
+    updates only those services in an IncrementalRankingEngine (which recomputes everything
+    only when the entropy weights or a normalization extremum shift), and can write the full
+    result plus a delta output of the added / changed / removed services. The snapshot (keys,
+    hashes and criteria) can be saved and reloaded so a later run starts from it.
+    """
+
+    def __init__(self, criteria, criteria_types, key_column="WSDL Address", method="waspas", **engine_options):
+        self.criteria = list(criteria)
+        self.criteria_types = list(criteria_types)
+        self.key_column = key_column
+        self.method = method
+        self.engine_options = engine_options
+        self.engine = None
+        self.hashes = None
+
+    def _read(self, source):
+        df = pd.read_csv(source) if isinstance(source, str) else source.copy()
+        missing = [column for column in self.criteria + [self.key_column] if column not in df.columns]
+        if missing:
+            raise ValueError(f"Dataset is missing columns: {missing}")
+        df.index = service_keys(df, self.key_column)
+        return df
+
+    def reload(self, source, output_path=None, delta_path=None):
+        """
+        Load a new dataset version (DataFrame or CSV path) and bring the ranking up to date.
+        Returns a summary: counts of added / removed / changed services, rows rescored and
+        whether a full recompute happened.
+        """
+        df = self._read(source)
+        hashes = pd.Series(row_hashes(df), index=df.index)
+        if self.engine is None:
+            self.engine = IncrementalRankingEngine(df[self.criteria], self.criteria_types, method=self.method,
+                                                   **self.engine_options)
+            changes = {"added": df.index, "removed": df.index[:0], "changed": df.index[:0]}
+            summary = {"rescored": len(df), "full_recompute": True}
+        else:
+            changes = diff_hashes(self.hashes, hashes)
+            steps = []
+            if len(changes["removed"]):
+                steps.append(self.engine.remove(changes["removed"]))
+            if len(changes["changed"]):
+                steps.append(self.engine.update(df.loc[changes["changed"], self.criteria]))
+            if len(changes["added"]):
+                steps.append(self.engine.add(df.loc[changes["added"], self.criteria]))
+            summary = {"rescored": sum(step["rescored"] for step in steps),
+                       "full_recompute": any(step["full_recompute"] for step in steps)}
+        self.hashes = hashes
+        self.changes = changes
+        summary = {**{change: len(keys) for change, keys in changes.items()}, **summary}
+        print(f"Reloaded {len(df)} services: {summary['added']} added, {summary['removed']} removed, "
+              f"{summary['changed']} changed, {summary['rescored']} rescored.")
+
+        results = self.engine.results().loc[df.index]
+        if output_path is not None:
+            export_frames([df, results], output_path)
+        if delta_path is not None:
+            self._write_delta(df, results, changes, delta_path)
+        return summary
+
+    def _write_delta(self, df, results, changes, delta_path):
+        touched = changes["added"].append(changes["changed"])
+        delta = pd.concat([df.loc[touched], results.loc[touched]], axis=1)
+        delta.insert(0, "Change", ["added"] * len(changes["added"]) + ["changed"] * len(changes["changed"]))
+        removed = pd.DataFrame({"Change": "removed"}, index=changes["removed"])
+        delta = pd.concat([delta, removed])
+        delta.insert(0, KEY_COLUMN, delta.index)
+        export_frames([delta], delta_path)
+
+    def results(self):
+        return self.engine.results().loc[self.hashes.index]
+
+    def save_snapshot(self, path):
+        """Write keys, row hashes and criteria of the current version (columnar export)."""
+        values = self.engine.decision_matrix().loc[self.hashes.index]
+        snapshot = values.assign(**{HASH_COLUMN: self.hashes.to_numpy()})
+        snapshot.insert(0, KEY_COLUMN, snapshot.index)
+        with open_sink(path, format="columnar") as sink:
+            sink.write(snapshot.reset_index(drop=True))
+
+    @classmethod
+    def from_snapshot(cls, path, criteria_types, key_column="WSDL Address", method="waspas", **engine_options):
+        """Resume from save_snapshot(): the ranking is rebuilt from the stored criteria values."""
+        snapshot = read_columnar(path, mmap=False).set_index(KEY_COLUMN)
+        criteria = [column for column in snapshot.columns if column != HASH_COLUMN]
+        reloader = cls(criteria, criteria_types, key_column, method, **engine_options)
+        reloader.engine = IncrementalRankingEngine(snapshot[criteria], criteria_types, method=method,
+                                                   **engine_options)
+        reloader.hashes = pd.Series(snapshot[HASH_COLUMN].to_numpy(), index=snapshot.index)
+        return reloader
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""Incremental WASPAS/VIKOR re-ranking for streams of QoS updates"""
+
+import numpy as np
+import pandas as pd
+
+
+class _SortedScores:
+    """
+    Distinct scores kept sorted with their multiplicities, for O(log n) dense rank lookups.
+    Batch add/remove keeps the arrays sorted with vectorized inserts/deletes.
+    """
+
+    def __init__(self, values):
+        self.values, self.counts = np.unique(values, return_counts=True)
+
+    def remove(self, values):
+        values, counts = np.unique(values, return_counts=True)
+        positions = np.searchsorted(self.values, values)
+        self.counts[positions] -= counts
+        keep = self.counts > 0
+        self.values, self.counts = self.values[keep], self.counts[keep]
+
+    def add(self, values):
+        values, counts = np.unique(values, return_counts=True)
+        positions = np.searchsorted(self.values, values)
+        existing = positions < len(self.values)
+        existing[existing] = self.values[positions[existing]] == values[existing]
+        self.counts[positions[existing]] += counts[existing]
+        self.values = np.insert(self.values, positions[~existing], values[~existing])
+        self.counts = np.insert(self.counts, positions[~existing], counts[~existing])
+
+    def dense_rank(self, value):
+        return int(np.searchsorted(self.values, value)) + 1
+
+
+class _RunningExtrema:
+    """
+    Column-wise max/min with tie counts. An extremum only moves when an update
+    raises a max / lowers a min, or removes the last row sitting on it.
+    """
+
+    def __init__(self, values):
+        self.reset(values)
+
+    def reset(self, values):
+        values = np.atleast_2d(values.T).T
+        self.max, self.min = values.max(axis=0), values.min(axis=0)
+        self.max_count = (values == self.max).sum(axis=0)
+        self.min_count = (values == self.min).sum(axis=0)
+
+    def update(self, old, new):
+        """
+        Rows change from `old` to `new`; either may be empty (rows added or removed).
+        Returns per-column (max moved, min moved) flags; the caller resets from the
+        full data when an extremum it depends on moved.
+        """
+        old, new = np.atleast_2d(old.T).T, np.atleast_2d(new.T).T
+        self.max_count += (new == self.max).sum(axis=0) - (old == self.max).sum(axis=0)
+        self.min_count += (new == self.min).sum(axis=0) - (old == self.min).sum(axis=0)
+        return ((new.max(axis=0, initial=-np.inf) > self.max) | (self.max_count <= 0),
+                (new.min(axis=0, initial=np.inf) < self.min) | (self.min_count <= 0))
+
+
+class IncrementalRankingEngine:
+    """
+    Keeps WASPAS or VIKOR scores and dense ranks current under per-service QoS updates.
+
+    Column extrema and the entropy accumulators (sum y and sum y*log y per criterion,
+    from which the entropy weights follow exactly) are maintained as updates arrive,
+    so only the changed rows are re-scored. A full recompute happens only when a
+    global quantity moves: a column extremum used for normalization, the entropy
+    weights drifting more than `weight_tolerance` from the ones used for scoring, or
+    (VIKOR) the S/R extrema behind the Q normalization. Services can also be added and
+    removed under the same rules. Rank lookups are O(log n).
+    The decision matrix index (e.g. WSDL Address) identifies services and must be unique.
+    """
+
+    def __init__(self, decision_matrix, criteria_types, method="waspas", lambda_param=0.5, v=0.5,
+                 weight_tolerance=1e-3):
+        method = method.lower()
+        if method not in ("waspas", "vikor"):
+            raise ValueError(f"Unsupported method '{method}', expected 'waspas' or 'vikor'")
+        if len(decision_matrix) < 2:
+            raise ValueError("Need at least two services to rank")
+        self.method = method
+        self.lambda_param = lambda_param
+        self.v = v
+        self.weight_tolerance = weight_tolerance
+        self.criteria = list(decision_matrix.columns)
+        self.criteria_types = list(criteria_types)
+        self._is_max = np.array([criteria_type == "max" for criteria_type in self.criteria_types])
+        self._is_min = np.array([criteria_type == "min" for criteria_type in self.criteria_types])
+        self.index = decision_matrix.index
+        self._values = decision_matrix.to_numpy(dtype=float).copy()
+        self.full_recomputes = 0
+        self._full_recompute()
+
+    def _entropy_terms(self, values):
+        """Per-row y and y*log(y) where p = y / sum(y) is the entropy method's share matrix."""
+        y = np.where(self._is_min, 1.0 / values, values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y_log_y = np.where(y > 0, y * np.log(y), 0.0)
+        return y, y_log_y
+
+    def _live_weights(self):
+        entropy = -(self._y_log_y_sum / self._y_sum - np.log(self._y_sum)) / np.log(len(self._values))
+        d = 1 - entropy
+        return d / d.sum()
+
+    def _score_rows(self, values):
+        if self.method == "waspas":
+            normalized = np.where(self._is_max, values / self._extrema.max,
+                                  np.where(self._is_min, self._extrema.min / values, values))
+            wsm = (normalized * self.weights).sum(axis=1)
+            wpm = np.prod(np.power(normalized, self.weights), axis=1)
+            return self.lambda_param * wsm + (1 - self.lambda_param) * wpm
+        ideal = np.where(self._is_max, self._extrema.max, self._extrema.min)
+        anti_ideal = np.where(self._is_max, self._extrema.min, self._extrema.max)
+        denominator = np.abs(anti_ideal - ideal)
+        distances = np.abs(values - ideal) / np.where(denominator == 0, 1, denominator)
+        weighted = np.where(denominator == 0, 0, distances) * self.weights
+        return weighted.sum(axis=1), weighted.max(axis=1)
+
+    def _vikor_q(self, si, ri):
+        s_range = self._s_extrema.max[0] - self._s_extrema.min[0]
+        r_range = self._r_extrema.max[0] - self._r_extrema.min[0]
+        if s_range == 0 or r_range == 0:
+            return np.zeros(len(si))
+        return (self.v * (si - self._s_extrema.min[0]) / s_range
+                + (1 - self.v) * (ri - self._r_extrema.min[0]) / r_range)
+
+    def _full_recompute(self):
+        self.full_recomputes += 1
+        self._extrema = _RunningExtrema(self._values)
+        y, y_log_y = self._entropy_terms(self._values)
+        self._y_sum, self._y_log_y_sum = y.sum(axis=0), y_log_y.sum(axis=0)
+        self.weights = self._live_weights()
+        if self.method == "waspas":
+            self._scores = self._score_rows(self._values)
+        else:
+            self._si, self._ri = self._score_rows(self._values)
+            self._s_extrema, self._r_extrema = _RunningExtrema(self._si), _RunningExtrema(self._ri)
+            self._scores = self._vikor_q(self._si, self._ri)
+        self._sorted = _SortedScores(self._sort_keys(self._scores))
+
+    def _sort_keys(self, scores):
+        return -scores if self.method == "waspas" else scores  # WASPAS ranks descending, VIKOR ascending
+
+    def _globals_shifted(self, old, new):
+        """
+        Account for rows going from `old` to `new` (empty for added / removed rows) in the
+        entropy accumulators and extrema; True when the weights or a normalization extremum moved.
+        """
+        old_y, old_y_log_y = self._entropy_terms(old)
+        new_y, new_y_log_y = self._entropy_terms(new)
+        self._y_sum += new_y.sum(axis=0) - old_y.sum(axis=0)
+        self._y_log_y_sum += new_y_log_y.sum(axis=0) - old_y_log_y.sum(axis=0)
+        weight_drift = np.abs(self._live_weights() - self.weights).max()
+        max_moved, min_moved = self._extrema.update(old, new)
+        if self.method == "waspas":  # WASPAS only normalizes by benefit maxima and cost minima
+            max_moved, min_moved = max_moved & self._is_max, min_moved & self._is_min
+        return max_moved.any() or min_moved.any() or weight_drift > self.weight_tolerance
+
+    def _rescore(self, rows, stale_scores, stale_si=None, stale_ri=None):
+        """Score `rows` (positions) and drop the stale scores of rows that changed or left."""
+        if self.method == "waspas":
+            new_scores = self._score_rows(self._values[rows])
+        else:
+            new_si, new_ri = self._score_rows(self._values[rows])
+            s_moved = np.concatenate(self._s_extrema.update(stale_si, new_si)).any()
+            r_moved = np.concatenate(self._r_extrema.update(stale_ri, new_ri)).any()
+            self._si[rows], self._ri[rows] = new_si, new_ri
+            if s_moved or r_moved:  # Q normalization moved: every Q changes, weights and S/R do not
+                self._s_extrema.reset(self._si)
+                self._r_extrema.reset(self._ri)
+                self._scores = self._vikor_q(self._si, self._ri)
+                self._sorted = _SortedScores(self._sort_keys(self._scores))
+                return {"rescored": len(self._values), "full_recompute": False}
+            new_scores = self._vikor_q(new_si, new_ri)
+        self._sorted.remove(self._sort_keys(stale_scores))
+        self._sorted.add(self._sort_keys(new_scores))
+        self._scores[rows] = new_scores
+        return {"rescored": len(rows), "full_recompute": False}
+
+    def _full_recompute_summary(self):
+        self._full_recompute()
+        return {"rescored": len(self._values), "full_recompute": True}
+
+    def _stale_terms(self, rows):
+        if self.method == "waspas":
+            return self._scores[rows].copy(), None, None
+        return self._scores[rows].copy(), self._si[rows].copy(), self._ri[rows].copy()
+
+    def update(self, changes):
+        """
+        Apply new QoS values. `changes` is a DataFrame indexed like the decision matrix
+        holding any subset of the criteria columns. Returns a summary of the work done.
+        """
+        rows = self.index.get_indexer(changes.index)
+        if (rows < 0).any():
+            raise KeyError(f"Unknown services: {list(changes.index[rows < 0])}")
+        columns = [self.criteria.index(col) for col in changes.columns]
+        old = self._values[rows].copy()
+        new = old.copy()
+        new[:, columns] = changes.to_numpy(dtype=float)
+        self._values[rows] = new
+        if self._globals_shifted(old, new):
+            return self._full_recompute_summary()
+        return self._rescore(rows, *self._stale_terms(rows))
+
+    def add(self, services):
+        """Add new services (a DataFrame with every criterion, indexed by new keys)."""
+        known = self.index.isin(services.index)
+        if known.any() or services.index.has_duplicates:
+            raise KeyError(f"Services already ranked or duplicated: {list(self.index[known])}")
+        new = services[self.criteria].to_numpy(dtype=float)
+        rows = np.arange(len(self._values), len(self._values) + len(new))
+        self.index = self.index.append(services.index)
+        self._values = np.vstack([self._values, new])
+        self._scores = np.concatenate([self._scores, np.zeros(len(new))])
+        if self.method == "vikor":
+            self._si = np.concatenate([self._si, np.zeros(len(new))])
+            self._ri = np.concatenate([self._ri, np.zeros(len(new))])
+        if self._globals_shifted(np.empty((0, len(self.criteria))), new):
+            return self._full_recompute_summary()
+        empty = np.empty(0)
+        return self._rescore(rows, empty, empty, empty)
+
+    def remove(self, keys):
+        """Remove services by key; the others are only re-scored if a global quantity moved."""
+        rows = self.index.get_indexer(keys)
+        if (rows < 0).any():
+            raise KeyError(f"Unknown services: {list(pd.Index(keys)[rows < 0])}")
+        if len(self._values) - len(rows) < 2:
+            raise ValueError("Need at least two services to rank")
+        old = self._values[rows]
+        stale = self._stale_terms(rows)
+        keep = np.ones(len(self._values), dtype=bool)
+        keep[rows] = False
+        self.index = self.index[keep]
+        self._values, self._scores = self._values[keep], self._scores[keep]
+        if self.method == "vikor":
+            self._si, self._ri = self._si[keep], self._ri[keep]
+        if self._globals_shifted(old, np.empty((0, len(self.criteria)))):
+            return self._full_recompute_summary()
+        return self._rescore(np.empty(0, dtype=np.int64), *stale)
+
+    def decision_matrix(self):
+        """Current criteria values of every service, indexed by key."""
+        return pd.DataFrame(self._values, index=self.index, columns=self.criteria)
+
+    def score(self, key):
+        return float(self._scores[self.index.get_loc(key)])
+
+    def rank(self, key):
+        """Dense rank of a service, as rankdata(..., method="dense") would give over the full catalogue."""
+        return self._sorted.dense_rank(self._sort_keys(self._scores[self.index.get_loc(key)]))
+
+    def results(self):
+        """Scores and dense ranks for every service, shaped like fuzzy_waspas / fuzzy_vikor output."""
+        label = "WASPAS" if self.method == "waspas" else "VIKOR"
+        ranks = np.searchsorted(self._sorted.values, self._sort_keys(self._scores)) + 1
+        return pd.DataFrame({f"{label} Score": self._scores, f"{label} Rank": ranks}, index=self.index)
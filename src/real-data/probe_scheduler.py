@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Adaptive probe scheduling: probe volatile and near-threshold services more often"""
+
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import math
+import time
+
+
+class SystemClock:
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(max(seconds, 0))
+
+
+class SimulatedClock:
+    """Clock for tests and dry runs: sleep() advances time instantly."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(seconds, 0)
+
+
+class _ServiceState:
+    """Exponentially weighted availability and response-time mean/variance of one service."""
+
+    def __init__(self, service):
+        self.service = service
+        self.availability = None
+        self.response_time_mean = None
+        self.response_time_var = 0.0
+        self.probes = 0
+
+    def update(self, result, alpha):
+        available = 100.0 if result.get("Availability") else 0.0
+        self.availability = available if self.availability is None else (
+            (1 - alpha) * self.availability + alpha * available)
+        response_time = result.get("Response Time (ms)")
+        if response_time is not None:
+            if self.response_time_mean is None:
+                self.response_time_mean = response_time
+            else:
+                delta = response_time - self.response_time_mean
+                self.response_time_mean += alpha * delta
+                self.response_time_var = (1 - alpha) * (self.response_time_var + alpha * delta * delta)
+        self.probes += 1
+
+    def volatility(self):
+        """Coefficient of variation of the response time plus availability flapping, in [0, 2]."""
+        if self.availability is None:
+            return 2.0  # never probed: as urgent as it gets
+        flapping = self.availability * (100 - self.availability) / 2500  # p(1-p) scaled to [0, 1]
+        if not self.response_time_mean:
+            return flapping  # never answered: only availability changes are interesting
+        return min(math.sqrt(self.response_time_var) / self.response_time_mean, 1.0) + flapping
+
+
+class ProbeScheduler:
+    """
+    Plans per-service probe intervals and dispatches probes through check_qos.
+
+    Each service's next probe time sits in a priority queue. After every probe the
+    interval is interpolated geometrically between max_interval and min_interval by an
+    urgency made of recent volatility, the distance of the availability from
+    `availability_threshold` (85, as in Classification) and membership of the current
+    top-k. A token bucket caps the global probe rate at `budget` probes per
+    `budget_window` seconds and at most `concurrency` probes run at once; services that
+    exceed the budget keep their place in the queue. `deferred` counts the due probes the
+    budget held back, each probe once however long it waits.
+    """
+
+    def __init__(self, services, prober=None, clock=None, min_interval=10.0, max_interval=600.0,
+                 availability_threshold=85, threshold_scale=10.0, budget=60, budget_window=60.0,
+                 concurrency=8, top_k=None, on_results=None, alpha=0.3):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Expected 0 < min_interval <= max_interval")
+        if budget < 1 or concurrency < 1:
+            raise ValueError("budget and concurrency must be positive")
+        if prober is None:
+            from ws_trust_prediction import check_qos
+            prober = check_qos
+        self.prober = prober
+        self.clock = clock or SystemClock()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.availability_threshold = availability_threshold
+        self.threshold_scale = threshold_scale
+        self.budget = budget
+        self.budget_window = budget_window
+        self.concurrency = concurrency
+        self.on_results = on_results
+        self.alpha = alpha
+        self.top_k = set(top_k or [])
+        self.services = {service["name"]: service for service in services}
+        self.states = {name: _ServiceState(service) for name, service in self.services.items()}
+        self.probes_sent = 0
+        self.deferred = 0
+        self._deferred = set()  # queue orders of due probes already counted as deferred
+        self._tokens = float(budget)
+        self._refilled_at = self.clock.time()
+        now = self.clock.time()
+        self._queue = [(now, order, name) for order, name in enumerate(self.services)]
+        heapq.heapify(self._queue)
+        self._order = len(self._queue)
+
+    def set_top_k(self, names):
+        """Update the services currently ranked in the top-k (they are probed more often)."""
+        self.top_k = set(names)
+
+    def urgency(self, name):
+        """Urgency in [0, 4]: volatility (0-2) + threshold proximity (0-1) + top-k membership (0/1)."""
+        state = self.states[name]
+        urgency = state.volatility()
+        if state.availability is not None:
+            urgency += math.exp(-abs(state.availability - self.availability_threshold) / self.threshold_scale)
+        return urgency + (1.0 if name in self.top_k else 0.0)
+
+    def plan_interval(self, name):
+        ratio = self.min_interval / self.max_interval
+        return self.max_interval * ratio ** (self.urgency(name) / 4.0)
+
+    def _refill(self, now):
+        self._tokens = min(self.budget, self._tokens + (now - self._refilled_at) * self.budget / self.budget_window)
+        self._refilled_at = now
+
+    def _probe(self, name):
+        return self.prober([self.services[name]])[0]
+
+    def _defer(self, now):
+        # the due entries form a subtree at the root of the heap: children are never earlier
+        stack = [0]
+        while stack:
+            position = stack.pop()
+            if position < len(self._queue) and self._queue[position][0] <= now:
+                order = self._queue[position][1]
+                if order not in self._deferred:
+                    self._deferred.add(order)
+                    self.deferred += 1
+                stack += [2 * position + 1, 2 * position + 2]
+
+    def run_once(self):
+        """
+        Dispatch every due probe the budget allows (at most `concurrency` at a time).
+        Returns the probe results, in dispatch order.
+        """
+        now = self.clock.time()
+        self._refill(now)
+        due = []
+        while self._queue and self._queue[0][0] <= now and len(due) < self.concurrency:
+            if self._tokens < 1:
+                self._defer(now)
+                break
+            self._tokens -= 1
+            _, order, name = heapq.heappop(self._queue)
+            self._deferred.discard(order)
+            due.append(name)
+        if not due:
+            return []
+        if len(due) == 1:
+            results = [self._probe(due[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                results = list(executor.map(self._probe, due))
+        finished = self.clock.time()
+        for name, result in zip(due, results):
+            self.states[name].update(result, self.alpha)
+            heapq.heappush(self._queue, (finished + self.plan_interval(name), self._order, name))
+            self._order += 1
+        self.probes_sent += len(due)
+        if self.on_results is not None:
+            self.on_results(results)
+        return results
+
+    def next_wakeup(self):
+        """Time of the next possible dispatch, taking the budget into account."""
+        if not self._queue:
+            return math.inf
+        wakeup = self._queue[0][0]
+        if self._tokens < 1:
+            wakeup = max(wakeup, self._refilled_at + (1 - self._tokens) * self.budget_window / self.budget)
+        return wakeup
+
+    def run(self, duration):
+        """Keep probing for `duration` seconds of (possibly simulated) time."""
+        end = self.clock.time() + duration
+        while True:
+            self.run_once()
+            now = self.clock.time()
+            if now >= end:
+                return self.probes_sent
+            self.clock.sleep(min(self.next_wakeup(), end) - now)
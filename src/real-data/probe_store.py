@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Persistent probe history for check_qos results (embedded SQLite store)"""
+
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+
+QWS_COLUMNS = [
+    'Response Time', 'Availability', 'Throughput', 'Successability',
+    'Reliability', 'Compliance', 'Best Practices', 'Latency',
+    'Documentation', 'Service Name', 'WSDL Address'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    service TEXT NOT NULL,
+    url TEXT,
+    ts REAL NOT NULL,
+    response_time_ms REAL,
+    available INTEGER NOT NULL,
+    throughput REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_probes_service_ts ON probes (service, ts);
+CREATE INDEX IF NOT EXISTS idx_probes_ts ON probes (ts);
+CREATE TABLE IF NOT EXISTS probe_rollups (
+    service TEXT NOT NULL,
+    url TEXT,
+    bucket_start REAL NOT NULL,
+    probes INTEGER NOT NULL,
+    available INTEGER NOT NULL,
+    answered INTEGER NOT NULL,
+    response_time_sum REAL NOT NULL,
+    throughput_sum REAL NOT NULL,
+    PRIMARY KEY (service, bucket_start)
+);
+"""
+
+
+def summary_to_decision_matrix(summary):
+    """
+    Decision matrix in the shape of qws.csv from a per-service probe summary (indexed by
+    service, with URL and Response Time p50 columns). Criteria that probing cannot measure
+    are left empty.
+    """
+    matrix = pd.DataFrame(index=summary.index, columns=QWS_COLUMNS, dtype=float)
+    matrix["Response Time"] = summary["Response Time p50"]
+    matrix["Availability"] = summary["Availability"]
+    matrix["Throughput"] = summary["Throughput"]
+    matrix["Successability"] = summary["Successability"]
+    matrix["Service Name"] = summary.index
+    matrix["WSDL Address"] = summary["URL"]
+    return matrix.reset_index(drop=True)
+
+
+class ProbeHistoryStore:
+    """
+    Append-only history of probe results with retention and compaction.
+
+    Raw probes are kept for `retention_seconds` (percentiles need them); compact()
+    folds older probes into per-service time buckets (counts and sums), so long-term
+    availability survives while the raw table stays small.
+    """
+
+    def __init__(self, db_path="qos_history.db", retention_seconds=7 * 24 * 3600, rollup_seconds=3600):
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self.rollup_seconds = rollup_seconds
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def insert_results(self, results, timestamp=None):
+        """
+        Store a batch of check_qos results in one transaction.
+        Results without a 'Timestamp' entry are stamped with `timestamp` (default: now).
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        rows = [(
+            result["Service Name"],
+            result.get("URL"),
+            result.get("Timestamp", timestamp),
+            result.get("Response Time (ms)"),
+            int(bool(result.get("Availability"))),
+            result.get("Throughput (KB/s)"),
+            result.get("Error"),
+        ) for result in results]
+        with self.connection:
+            self.connection.executemany("INSERT INTO probes VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def compact(self, now=None, vacuum=False):
+        """
+        Roll probes older than the retention period up into hourly (rollup_seconds) buckets
+        and delete them from the raw table. Returns the number of raw probes compacted.
+        """
+        cutoff = (time.time() if now is None else now) - self.retention_seconds
+        with self.connection:
+            self.connection.execute("""
+                INSERT INTO probe_rollups
+                SELECT service, MAX(url), CAST(ts / :bucket AS INTEGER) * :bucket AS bucket_start,
+                       COUNT(*), SUM(available), COUNT(response_time_ms),
+                       COALESCE(SUM(response_time_ms), 0), COALESCE(SUM(throughput), 0)
+                FROM probes WHERE ts < :cutoff
+                GROUP BY service, bucket_start
+                ON CONFLICT (service, bucket_start) DO UPDATE SET
+                    probes = probes + excluded.probes,
+                    available = available + excluded.available,
+                    answered = answered + excluded.answered,
+                    response_time_sum = response_time_sum + excluded.response_time_sum,
+                    throughput_sum = throughput_sum + excluded.throughput_sum
+            """, {"bucket": self.rollup_seconds, "cutoff": cutoff})
+            compacted = self.connection.execute("DELETE FROM probes WHERE ts < ?", (cutoff,)).rowcount
+        if vacuum:
+            self.connection.execute("VACUUM")
+        return compacted
+
+    def drop_rollups(self, older_than):
+        """Delete rollup buckets that start before the `older_than` timestamp."""
+        with self.connection:
+            return self.connection.execute(
+                "DELETE FROM probe_rollups WHERE bucket_start < ?", (older_than,)).rowcount
+
+    def _raw_probes(self, since, service=None):
+        query = "SELECT service, url, ts, response_time_ms, available, throughput FROM probes WHERE ts >= ?"
+        params = [since]
+        if service is not None:
+            query += " AND service = ?"
+            params.append(service)
+        return pd.read_sql_query(query, self.connection, params=params)
+
+    def service_summary(self, window_seconds=None, now=None):
+        """
+        Per-service aggregates over the last `window_seconds` of raw probes (all raw probes if None):
+        probe count, availability and successability (%), p50/p95 response time and mean throughput.
+        """
+        now = time.time() if now is None else now
+        since = -np.inf if window_seconds is None else now - window_seconds
+        probes = self._raw_probes(since)
+        columns = ["Probes", "Availability", "Successability", "Response Time p50",
+                   "Response Time p95", "Throughput", "URL"]
+        if probes.empty:
+            return pd.DataFrame(columns=columns).rename_axis("Service Name")
+        grouped = probes.groupby("service")
+        response_times = grouped["response_time_ms"]
+        summary = pd.DataFrame({
+            "Probes": grouped.size(),
+            "Availability": grouped["available"].mean() * 100,
+            "Successability": response_times.count() / grouped.size() * 100,
+            "Response Time p50": response_times.quantile(0.5),
+            "Response Time p95": response_times.quantile(0.95),
+            "Throughput": grouped["throughput"].mean(),
+            "URL": grouped["url"].last(),
+        })
+        return summary.rename_axis("Service Name")
+
+    def availability_series(self, service, bucket_seconds=3600):
+        """
+        Availability (%) per time bucket for one service, from rollups and raw probes together.
+        """
+        series = pd.read_sql_query("""
+            SELECT bucket, SUM(probes) AS probes, SUM(available) AS available FROM (
+                SELECT CAST(bucket_start / :bucket AS INTEGER) * :bucket AS bucket, probes, available
+                FROM probe_rollups WHERE service = :service
+                UNION ALL
+                SELECT CAST(ts / :bucket AS INTEGER) * :bucket, 1, available
+                FROM probes WHERE service = :service
+            ) GROUP BY bucket ORDER BY bucket
+        """, self.connection, params={"bucket": bucket_seconds, "service": service})
+        return pd.Series(series["available"].to_numpy() / series["probes"].to_numpy() * 100,
+                         index=series["bucket"].to_numpy(), name="Availability")
+
+    def to_decision_matrix(self, window_seconds=None, now=None):
+        """
+        Decision matrix in the shape of qws.csv built from the probe history (Response Time
+        is the median of the window).
+        """
+        return summary_to_decision_matrix(self.service_summary(window_seconds, now))
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""Rolling-window QoS aggregation over live probes with fixed memory per service"""
+
+import math
+import numpy as np
+import pandas as pd
+from probe_store import summary_to_decision_matrix
+
+
+class StreamingQoSAggregator:
+    """
+    Per-service sliding windows over the last `window` probes.
+
+    Each service owns one row in a set of preallocated ring-buffer arrays plus a
+    log-bucketed response-time histogram (a DDSketch-style quantile sketch with the
+    given relative accuracy). Adding a probe evicts the oldest one from the running
+    sums and the histogram, so updates are O(1) and memory per service is constant.
+    Percentiles come from the sketch; snapshots are vectorized over all services.
+    """
+
+    def __init__(self, window=100, relative_accuracy=0.01, min_response_time=0.1,
+                 max_response_time=60000.0, initial_services=64):
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.min_response_time = min_response_time
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets = int(math.ceil(math.log(max_response_time / min_response_time) / self._log_gamma)) + 1
+        self._slots = {}
+        self._names = []
+        self._urls = []
+        self._allocate(initial_services)
+
+    def _allocate(self, capacity):
+        def grow(array, fill):
+            grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            grown[:len(array)] = array
+            return grown
+
+        if not hasattr(self, "_count"):
+            self._response_time = np.empty((0, self.window), dtype=np.float32)
+            self._available = np.empty((0, self.window), dtype=np.int8)
+            self._throughput = np.empty((0, self.window), dtype=np.float32)
+            self._histogram = np.empty((0, self._buckets), dtype=np.int32)
+            self._count = np.empty(0, dtype=np.int64)
+            self._available_sum = np.empty(0, dtype=np.int64)
+            self._answered = np.empty(0, dtype=np.int64)
+            self._throughput_sum = np.empty(0, dtype=np.float64)
+            self._throughput_n = np.empty(0, dtype=np.int64)
+        self._response_time = grow(self._response_time, np.nan)
+        self._available = grow(self._available, 0)
+        self._throughput = grow(self._throughput, np.nan)
+        self._histogram = grow(self._histogram, 0)
+        self._count = grow(self._count, 0)
+        self._available_sum = grow(self._available_sum, 0)
+        self._answered = grow(self._answered, 0)
+        self._throughput_sum = grow(self._throughput_sum, 0.0)
+        self._throughput_n = grow(self._throughput_n, 0)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _slot(self, service, url):
+        slot = self._slots.get(service)
+        if slot is None:
+            slot = len(self._names)
+            if slot == len(self._count):
+                self._allocate(2 * len(self._count))
+            self._slots[service] = slot
+            self._names.append(service)
+            self._urls.append(url)
+        elif url is not None:
+            self._urls[slot] = url
+        return slot
+
+    def _bucket(self, response_time):
+        ratio = max(response_time, self.min_response_time) / self.min_response_time
+        return min(int(math.ceil(math.log(ratio) / self._log_gamma)), self._buckets - 1)
+
+    def add(self, service, response_time_ms, available, throughput=None, url=None):
+        """Record one probe; response_time_ms is None when the service did not answer."""
+        slot = self._slot(service, url)
+        position = self._count[slot] % self.window
+        if self._count[slot] >= self.window:  # evict the probe this one overwrites
+            old_response_time = self._response_time[slot, position]
+            if not math.isnan(old_response_time):
+                self._answered[slot] -= 1
+                self._histogram[slot, self._bucket(old_response_time)] -= 1
+            old_throughput = self._throughput[slot, position]
+            if not math.isnan(old_throughput):
+                self._throughput_sum[slot] -= old_throughput
+                self._throughput_n[slot] -= 1
+            self._available_sum[slot] -= self._available[slot, position]
+
+        if response_time_ms is None or math.isnan(response_time_ms):
+            self._response_time[slot, position] = np.nan
+        else:
+            self._response_time[slot, position] = response_time_ms
+            self._answered[slot] += 1
+            # bucket the stored float32 value so the eviction above hits the same bucket
+            self._histogram[slot, self._bucket(float(self._response_time[slot, position]))] += 1
+        if throughput is None or math.isnan(throughput):
+            self._throughput[slot, position] = np.nan
+        else:
+            self._throughput[slot, position] = throughput
+            self._throughput_sum[slot] += float(self._throughput[slot, position])
+            self._throughput_n[slot] += 1
+        self._available[slot, position] = 1 if available else 0
+        self._available_sum[slot] += self._available[slot, position]
+        self._count[slot] += 1
+
+    def add_results(self, results):
+        """Record a list of check_qos results."""
+        for result in results:
+            self.add(result["Service Name"], result.get("Response Time (ms)"), result.get("Availability"),
+                     result.get("Throughput (KB/s)"), result.get("URL"))
+
+    def _quantiles(self, q):
+        """Per-service response-time quantile estimates from the histograms (NaN without answers)."""
+        histogram = self._histogram[:len(self)]
+        cumulative = np.cumsum(histogram, axis=1)
+        answered = cumulative[:, -1]
+        rank = q * np.maximum(answered - 1, 0)
+        buckets = (cumulative > rank[:, np.newaxis]).argmax(axis=1)
+        # bucket i covers (min * gamma^(i-1), min * gamma^i]; 2 * gamma^i / (gamma + 1) is within
+        # the relative accuracy of every value in it
+        estimate = self.min_response_time * 2 * self._gamma ** buckets / (self._gamma + 1)
+        estimate[buckets == 0] = self.min_response_time
+        return np.where(answered > 0, estimate, np.nan)
+
+    def snapshot(self, percentiles=(50, 95)):
+        """
+        Window aggregates for every service: probes in the window, availability and
+        successability (%), response-time percentiles and mean throughput.
+        """
+        n = len(self)
+        probes = np.minimum(self._count[:n], self.window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            summary = pd.DataFrame({
+                "Probes": probes,
+                "Availability": self._available_sum[:n] / probes * 100,
+                "Successability": self._answered[:n] / probes * 100,
+            }, index=pd.Index(self._names, name="Service Name"))
+            for percentile in percentiles:
+                summary[f"Response Time p{percentile}"] = self._quantiles(percentile / 100)
+            summary["Throughput"] = np.where(self._throughput_n[:n] > 0,
+                                             self._throughput_sum[:n] / self._throughput_n[:n], np.nan)
+        summary["URL"] = self._urls
+        return summary
+
+    def to_decision_matrix(self):
+        """Snapshot in the shape of qws.csv (Response Time is the window median)."""
+        return summary_to_decision_matrix(self.snapshot(percentiles=(50,)))
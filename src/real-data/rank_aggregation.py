@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Consensus ranking across WASPAS, VIKOR, TOPSIS and fuzzy trust scores"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+# Copeland over the whole catalogue is O(n^2 m): about 1.4 s at 20k services
+MAX_COPELAND_SERVICES = 20_000
+
+
+def default_direction(method):
+    """VIKOR scores are better when lower (Q); WASPAS, TOPSIS and trust scores when higher."""
+    return "asc" if "vikor" in str(method).lower() else "desc"
+
+
+def load_method_scores(filepath, key_column="WSDL Address", missing_value=-1.0):
+    """
+    Per-method scores from a ranking results CSV such as qws_result_trust.csv, indexed by
+    `key_column`. Scores equal to `missing_value` (-1 marks unscored services there) become NaN.
+    """
+    results = pd.read_csv(filepath).set_index(key_column)
+    scores = results.select_dtypes(include=[np.number])
+    return scores.mask(scores == missing_value) if missing_value is not None else scores
+
+
+class ConsensusRanking:
+    """
+    Borda, Copeland and weighted-mean-rank aggregation of several methods' scores.
+
+    Scores are turned into keys where lower is better (descending methods are negated),
+    and each method's ranks (1 = best, average ranks for ties) come from the tie groups of
+    its sorted keys. Missing scores (NaN) take no part in that method. Borda gives
+    n_m - rank points per method, the weighted mean rank averages the available ranks,
+    and Copeland counts pairwise majority wins minus losses. Copeland comparisons run
+    block by block in numpy (O(p^2 m) work, O(block p m) memory for p players), so they
+    are bounded: with `copeland_candidates=N` only the Borda top-N services play the
+    Copeland tournament (the others get NaN Copeland score and rank); without it, more
+    than `max_copeland_services` services raise ValueError.
+
+    update() changes one method's scores for some services: only that method is re-ranked
+    and only the Copeland outcomes of pairs involving a changed service are recomputed
+    (the tournament is replayed when the update changes the Borda top-N).
+    """
+
+    def __init__(self, scores, directions=None, weights=None, block_size=1024, copeland_candidates=None,
+                 max_copeland_services=MAX_COPELAND_SERVICES):
+        self.methods = list(scores.columns)
+        directions = directions or {}
+        self.directions = {method: directions.get(method, default_direction(method)) for method in self.methods}
+        if any(direction not in ("asc", "desc") for direction in self.directions.values()):
+            raise ValueError("Ranking directions must be 'asc' or 'desc'")
+        weights = weights or {}
+        self.weights = np.array([weights.get(method, 1.0) for method in self.methods], dtype=float)
+        self.index = scores.index
+        self.block_size = block_size
+        if copeland_candidates is None and len(scores) > max_copeland_services:
+            raise ValueError(f"Copeland over {len(scores)} services is O(n^2); pass copeland_candidates "
+                             f"(or raise max_copeland_services above {max_copeland_services})")
+        if copeland_candidates is not None and copeland_candidates < 1:
+            raise ValueError("copeland_candidates must be positive")
+        self.copeland_candidates = copeland_candidates
+        self._signs = np.array([-1.0 if self.directions[method] == "desc" else 1.0 for method in self.methods])
+        self._keys = scores.to_numpy(dtype=float) * self._signs
+        self._ranks = np.empty_like(self._keys)
+        for column in range(len(self.methods)):
+            self._rank_method(column)
+        self._play_copeland()
+
+    def _borda(self):
+        present = ~np.isnan(self._ranks)
+        return np.where(present, present.sum(axis=0) - self._ranks, 0).sum(axis=1)
+
+    def _copeland_players(self):
+        """Positions of the services in the Copeland tournament (all, or the Borda top-N)."""
+        if self.copeland_candidates is None or self.copeland_candidates >= len(self._keys):
+            return np.arange(len(self._keys))
+        return np.sort(np.argsort(-self._borda(), kind="stable")[:self.copeland_candidates])
+
+    def _play_copeland(self):
+        self._players = self._copeland_players()
+        self._copeland = np.full(len(self._keys), np.nan)
+        for start in range(0, len(self._players), self.block_size):
+            rows = self._players[start:start + self.block_size]
+            self._copeland[rows] = self._outcomes(rows).sum(axis=1)
+
+    def _rank_method(self, column):
+        keys = self._keys[:, column]
+        present = np.flatnonzero(~np.isnan(keys))
+        order = present[np.argsort(keys[present])]
+        ordered = keys[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])  # first position of each tie group
+        sizes = np.diff(np.r_[starts, len(ordered)])
+        self._ranks[:, column] = np.nan
+        self._ranks[order, column] = np.repeat(starts + (sizes + 1) / 2, sizes)
+
+    def _outcomes(self, rows):
+        """Pairwise majority outcome (+1 win, -1 loss, 0 tie) of `rows` against every Copeland player."""
+        keys = self._keys[rows]
+        players = self._keys[self._players]
+        outcomes = np.zeros((len(rows), len(players)), dtype=np.int8)
+        with np.errstate(invalid="ignore"):
+            for column in range(len(self.methods)):  # NaN comparisons are False: no vote
+                outcomes += players[np.newaxis, :, column] > keys[:, np.newaxis, column]
+                outcomes -= players[np.newaxis, :, column] < keys[:, np.newaxis, column]
+        return np.sign(outcomes)
+
+    def update(self, method, new_scores):
+        """Replace `method`'s scores for the services in the `new_scores` Series (indexed like the input)."""
+        column = self.methods.index(method)
+        rows = self.index.get_indexer(new_scores.index)
+        if (rows < 0).any():
+            raise KeyError(f"Unknown services: {list(new_scores.index[rows < 0])}")
+        changed = np.isin(self._players, rows)
+        playing = self._players[changed]
+        before = self._outcomes(playing)
+        self._keys[rows, column] = new_scores.to_numpy(dtype=float) * self._signs[column]
+        self._rank_method(column)
+        if not np.array_equal(self._copeland_players(), self._players):
+            self._play_copeland()
+            return
+        delta = self._outcomes(playing).astype(np.int64) - before
+        # pairs between two changed players appear in both rows; unchanged players take the opposite side
+        self._copeland[playing] += delta.sum(axis=1)
+        self._copeland[self._players[~changed]] -= delta[:, ~changed].sum(axis=0)
+
+    def results(self):
+        """Per-method ranks, aggregate scores and their dense consensus ranks (1 = best)."""
+        present = ~np.isnan(self._ranks)
+        borda = self._borda()
+        weights = np.where(present, self.weights, 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_rank = np.where(present, self._ranks, 0) @ self.weights / weights.sum(axis=1)
+        results = pd.DataFrame({f"{method} Rank": self._ranks[:, column]
+                                for column, method in enumerate(self.methods)}, index=self.index)
+        results["Borda Score"] = borda
+        results["Borda Rank"] = rankdata(-borda, method="dense")
+        results["Copeland Score"] = self._copeland
+        if len(self._players) == len(self._keys):
+            results["Copeland Rank"] = rankdata(-self._copeland, method="dense")
+        else:
+            copeland_rank = np.full(len(self._keys), np.nan)
+            copeland_rank[self._players] = rankdata(-self._copeland[self._players], method="dense")
+            results["Copeland Rank"] = copeland_rank
+        results["Weighted Mean Rank"] = mean_rank
+        results["Mean Rank Position"] = rankdata(np.where(np.isnan(mean_rank), np.inf, mean_rank), method="dense")
+        return results
+
+
+def consensus_ranking(scores, directions=None, weights=None, copeland_candidates=None):
+    """One-shot consensus ranking of a (services x methods) score DataFrame."""
+    print(f"Aggregating rankings of {len(scores.columns)} methods...")
+    results = ConsensusRanking(scores, directions, weights, copeland_candidates=copeland_candidates).results()
+    print("Consensus ranking computed successfully.")
+    return results
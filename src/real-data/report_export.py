@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Chunked, compressed and columnar export sinks for evaluation reports"""
+
+import gzip
+import io
+import json
+import os
+import numpy as np
+import pandas as pd
+
+COLUMNAR_SCHEMA = "schema.json"
+
+
+def _open_text(path, compression):
+    if compression is None:
+        return open(path, 'w', newline='', encoding='utf-8')
+    if compression == "gzip":
+        return gzip.open(path, 'wt', newline='', encoding='utf-8', compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError("zstd compression needs the 'zstandard' package") from error
+        return io.TextIOWrapper(zstandard.ZstdCompressor(level=3).stream_writer(open(path, 'wb')),
+                                newline='', encoding='utf-8')
+    raise ValueError(f"Unsupported compression '{compression}', expected None, 'gzip' or 'zstd'")
+
+
+class CsvSink:
+    """Appends DataFrame chunks to one (optionally gzip/zstd compressed) CSV file."""
+
+    def __init__(self, path, compression=None):
+        self.path = path
+        self.rows_written = 0
+        self._file = _open_text(path, compression)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, chunk):
+        chunk.to_csv(self._file, index=False, header=self.rows_written == 0)
+        self.rows_written += len(chunk)
+
+    def close(self):
+        self._file.close()
+
+
+class ColumnarSink:
+    """
+    Typed columnar format: a directory with one raw little-endian file per column and a
+    schema.json. Numeric columns keep their dtype; strings are stored as UTF-8 bytes plus
+    int64 end offsets. Chunks are appended column by column, and read_columnar can load
+    (memory-map) only the columns it needs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows_written = 0
+        self.schema = None
+        self._files = {}
+        self._string_ends = {}
+        os.makedirs(path, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _column_file(self, name):
+        if name not in self._files:
+            self._files[name] = open(os.path.join(self.path, name), 'wb')
+        return self._files[name]
+
+    def _start(self, chunk):
+        self.schema = []
+        for position, (column, dtype) in enumerate(chunk.dtypes.items()):
+            if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+                kind, stored = "numeric", np.dtype(dtype).newbyteorder('<').str
+            else:
+                kind, stored = "string", None
+                self._string_ends[position] = 0
+            self.schema.append({"name": str(column), "kind": kind, "dtype": stored, "file": f"{position}"})
+
+    def write(self, chunk):
+        if self.schema is None:
+            self._start(chunk)
+        elif [str(column) for column in chunk.columns] != [field["name"] for field in self.schema]:
+            raise ValueError("All chunks must have the same columns")
+        for position, field in enumerate(self.schema):
+            values = chunk.iloc[:, position]
+            if field["kind"] == "numeric":
+                self._column_file(field["file"]).write(
+                    np.ascontiguousarray(values.to_numpy(), dtype=field["dtype"]).tobytes())
+                continue
+            missing = values.isna().to_numpy()
+            encoded = [b"" if is_missing else str(value).encode('utf-8')
+                       for value, is_missing in zip(values, missing)]
+            lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+            ends = self._string_ends[position] + np.cumsum(lengths)
+            self._string_ends[position] = int(ends[-1]) if len(ends) else self._string_ends[position]
+            self._column_file(field["file"] + ".data").write(b"".join(encoded))
+            self._column_file(field["file"] + ".offsets").write(np.where(missing, -1, ends).astype('<i8').tobytes())
+        self.rows_written += len(chunk)
+
+    def close(self):
+        for file in self._files.values():
+            file.close()
+        with open(os.path.join(self.path, COLUMNAR_SCHEMA), 'w', encoding='utf-8') as file:
+            json.dump({"rows": self.rows_written, "columns": self.schema or []}, file, indent=2)
+
+
+def read_columnar(path, columns=None, mmap=True):
+    """
+    Load a ColumnarSink export into a DataFrame. Only the requested columns are read;
+    numeric columns are memory-mapped (zero-copy, read-only) unless mmap=False.
+    """
+    with open(os.path.join(path, COLUMNAR_SCHEMA), encoding='utf-8') as file:
+        schema = json.load(file)
+    fields = {field["name"]: field for field in schema["columns"]}
+    missing = [column for column in (columns or []) if column not in fields]
+    if missing:
+        raise KeyError(f"Columns not in export: {missing}")
+    data = {}
+    for name in columns or list(fields):
+        field = fields[name]
+        file = os.path.join(path, field["file"])
+        if field["kind"] == "numeric":
+            if mmap and schema["rows"] > 0:
+                data[name] = np.memmap(file, dtype=field["dtype"], mode='r', shape=(schema["rows"],))
+            else:
+                data[name] = np.fromfile(file, dtype=field["dtype"], count=schema["rows"])
+            continue
+        ends = np.fromfile(file + ".offsets", dtype='<i8', count=schema["rows"])
+        data[name] = _decode_strings(np.fromfile(file + ".data", dtype=np.uint8), ends)
+    return pd.DataFrame(data, copy=False)
+
+
+def _decode_strings(blob, ends):
+    """
+    Values of a string column from its UTF-8 bytes and end offsets (-1: missing) with one
+    decode and one split. A 0xFF byte, which never occurs in UTF-8, is inserted after every
+    value; surrogateescape decodes it to a lone surrogate that no encoded str can contain.
+    """
+    missing = ends < 0
+    ends = np.maximum.accumulate(np.where(missing, 0, ends)) if len(ends) else ends  # missing: empty
+    delimited = np.full(len(blob) + len(ends), 0xFF, dtype=np.uint8)
+    is_data = np.ones(len(delimited), dtype=bool)
+    is_data[ends + np.arange(len(ends))] = False
+    delimited[is_data] = blob
+    values = np.empty(len(ends), dtype=object)
+    values[:] = str(delimited.data, 'utf-8', 'surrogateescape').split('\udcff')[:-1]
+    values[missing] = None
+    return values
+
+
+def open_sink(path, format=None, compression=None):
+    """
+    Sink for a report path. format is 'csv' or 'columnar'; by default it is inferred from
+    the path (a '.cols' suffix means columnar), and '.gz' / '.zst' suffixes imply compression.
+    """
+    if format is None:
+        format = "columnar" if path.endswith(".cols") else "csv"
+    if format == "columnar":
+        return ColumnarSink(path)
+    if format != "csv":
+        raise ValueError(f"Unsupported format '{format}', expected 'csv' or 'columnar'")
+    if compression is None:
+        compression = {".gz": "gzip", ".zst": "zstd"}.get(os.path.splitext(path)[1])
+    return CsvSink(path, compression)
+
+
+def export_frames(frames, path, format=None, compression=None, chunk_size=100_000):
+    """
+    Write the column-wise concatenation of row-aligned frames to `path` chunk by chunk,
+    without materializing the concatenated frame. Returns the number of rows written.
+    """
+    frames = [frame.reset_index(drop=True) for frame in frames]
+    rows = len(frames[0])
+    if any(len(frame) != rows for frame in frames):
+        raise ValueError("Frames to export must have the same number of rows")
+    with open_sink(path, format, compression) as sink:
+        for start in range(0, max(rows, 1), chunk_size):
+            sink.write(pd.concat([frame.iloc[start:start + chunk_size] for frame in frames], axis=1))
+    return sink.rows_written
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Compact typed in-memory representation of the service catalogue"""
+
+import numpy as np
+import pandas as pd
+
+
+class StringColumn:
+    """
+    Arrow-style string column: one UTF-8 byte buffer plus int64 offsets (n + 1 entries),
+    and an optional validity mask for missing values. With a dictionary, `codes` index
+    into a StringColumn of distinct values instead (for repetitive columns).
+    """
+
+    def __init__(self, data, offsets, valid=None, codes=None, dictionary=None):
+        self.data = data
+        self.offsets = offsets
+        self.valid = valid
+        self.codes = codes
+        self.dictionary = dictionary
+
+    @classmethod
+    def from_values(cls, values, dictionary_threshold=0.5):
+        """
+        Encode a sequence of strings (None/NaN are missing). Columns whose distinct values
+        are fewer than `dictionary_threshold` of the rows are dictionary-encoded.
+        """
+        values = pd.Series(values, dtype=object)
+        missing = values.isna().to_numpy()
+        valid = ~missing if missing.any() else None
+        if dictionary_threshold and len(values):
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            if len(uniques) < dictionary_threshold * len(values):
+                dictionary = cls.from_values(uniques, dictionary_threshold=0)
+                codes = codes.astype(np.int32)
+                return cls(None, None, valid, codes, dictionary)
+        encoded = [b"" if is_missing else str(value).encode('utf-8') for value, is_missing in zip(values, missing)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(data, offsets, valid)
+
+    def __len__(self):
+        return len(self.codes) if self.codes is not None else len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        if self.valid is not None and not self.valid[row]:
+            return None
+        if self.codes is not None:
+            return self.dictionary[self.codes[row]]
+        return self.data[self.offsets[row]:self.offsets[row + 1]].tobytes().decode('utf-8')
+
+    def to_list(self):
+        if self.codes is not None:
+            values = np.array(self.dictionary.to_list(), dtype=object)[np.maximum(self.codes, 0)]
+        else:
+            buffer = self.data.tobytes()
+            offsets = self.offsets.tolist()
+            values = np.array([buffer[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])],
+                              dtype=object)
+        if self.valid is not None:
+            values[~self.valid] = None
+        return values.tolist()
+
+    def take(self, rows, block_rows=65536):
+        if self.codes is not None:
+            valid = None if self.valid is None else self.valid[rows]
+            return StringColumn(None, None, valid, self.codes[rows], self.dictionary)
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        data = np.empty(offsets[-1], dtype=np.uint8)
+        for first in range(0, len(rows), block_rows):  # gather by row blocks: the byte index stays small
+            last = min(first + block_rows, len(rows))
+            # source position of every byte in the block: its row's start plus its place within the row
+            shift = np.repeat(starts[first:last] - offsets[first:last], lengths[first:last])
+            data[offsets[first]:offsets[last]] = self.data[np.arange(offsets[first], offsets[last]) + shift]
+        valid = None if self.valid is None else self.valid[rows]
+        return StringColumn(data, offsets, valid)
+
+    @property
+    def nbytes(self):
+        total = 0 if self.valid is None else self.valid.nbytes
+        if self.codes is not None:
+            return total + self.codes.nbytes + self.dictionary.nbytes
+        return total + self.data.nbytes + self.offsets.nbytes
+
+
+class ServiceCatalogue:
+    """
+    Services as one C-contiguous float32 (services x criteria) array, Arrow-style
+    name/address string columns and stable integer service IDs (positions in the
+    catalogue the service was first loaded into, kept by take()).
+
+    decision_matrix() wraps the float32 array in a DataFrame without copying it, so the
+    scoring functions (calculate_weights, fuzzy_waspas, ...) can run on the catalogue.
+    """
+
+    def __init__(self, criteria, criteria_names, names, addresses, ids=None):
+        self.criteria = np.ascontiguousarray(criteria, dtype=np.float32)
+        self.criteria_names = list(criteria_names)
+        self.names = names
+        self.addresses = addresses
+        self.ids = np.arange(len(self.criteria), dtype=np.int32) if ids is None else ids
+        self._address_index = None
+
+    @classmethod
+    def from_frame(cls, df, criteria=None, name_column='Service Name', address_column='WSDL Address'):
+        """Build a catalogue from a QWS-shaped DataFrame (numeric columns are the criteria by default)."""
+        if criteria is None:
+            criteria = [column for column in df.select_dtypes(include=[np.number]).columns
+                        if column not in (name_column, address_column) and not str(column).startswith('Unnamed')]
+        values = np.empty((len(df), len(criteria)), dtype=np.float32)
+        for i, column in enumerate(criteria):  # column by column: no float64 copy of the whole frame
+            values[:, i] = df[column].to_numpy(dtype=np.float32)
+        return cls(values, criteria, StringColumn.from_values(df[name_column]),
+                   StringColumn.from_values(df[address_column]))
+
+    def __len__(self):
+        return len(self.criteria)
+
+    def decision_matrix(self, columns=None):
+        """Zero-copy DataFrame view of the criteria (index = service IDs); columns must be contiguous."""
+        if columns is None:
+            view = self.criteria
+            columns = self.criteria_names
+        else:
+            positions = [self.criteria_names.index(column) for column in columns]
+            if positions != list(range(positions[0], positions[0] + len(positions))):
+                raise ValueError("A zero-copy view needs adjacent criteria; use take_criteria() for others")
+            view = self.criteria[:, positions[0]:positions[-1] + 1]
+        return pd.DataFrame(view, index=pd.RangeIndex(len(view)) if self._ids_are_positions() else self.ids,
+                            columns=columns, copy=False)
+
+    def take_criteria(self, columns):
+        """New catalogue with the criteria reordered/subset to `columns` (one contiguous copy)."""
+        positions = [self.criteria_names.index(column) for column in columns]
+        return ServiceCatalogue(self.criteria[:, positions], columns, self.names, self.addresses, self.ids)
+
+    def _ids_are_positions(self):
+        return np.array_equal(self.ids, np.arange(len(self.ids)))
+
+    def take(self, rows, block_rows=65536):
+        """Catalogue of the given rows (positions); service IDs are kept."""
+        rows = np.asarray(rows)
+        return ServiceCatalogue(self.criteria[rows], self.criteria_names, self.names.take(rows),
+                                self.addresses.take(rows), self.ids[rows])
+
+    def dropna(self):
+        """Catalogue without the services missing a criterion, name or address (like DataFrame.dropna)."""
+        keep = ~np.isnan(self.criteria).any(axis=1)
+        for column in (self.names, self.addresses):
+            if column.valid is not None:
+                keep &= column.valid
+        return self if keep.all() else self.take(np.flatnonzero(keep))
+
+    def id_of(self, address):
+        """Service ID for a WSDL Address (the lookup index is built on first use)."""
+        if self._address_index is None:
+            self._address_index = {value: position for position, value in enumerate(self.addresses.to_list())}
+        return int(self.ids[self._address_index[address]])
+
+    def to_frame(self):
+        """Materialize the catalogue as a QWS-shaped DataFrame (e.g. for reports)."""
+        df = pd.DataFrame(self.criteria, columns=self.criteria_names)
+        df['Service Name'] = self.names.to_list()
+        df['WSDL Address'] = self.addresses.to_list()
+        return df
+
+    @property
+    def nbytes(self):
+        return self.criteria.nbytes + self.names.nbytes + self.addresses.nbytes + self.ids.nbytes
+
+
+def measure_memory_saving(df, criteria=None):
+    """Bytes held by the DataFrame (deep) versus the catalogue built from it."""
+    catalogue = ServiceCatalogue.from_frame(df, criteria)
+    columns = catalogue.criteria_names + ['Service Name', 'WSDL Address']
+    dataframe_bytes = int(df[columns].memory_usage(deep=True, index=True).sum())
+    return {'dataframe_bytes': dataframe_bytes, 'catalogue_bytes': catalogue.nbytes,
+            'saving': 1 - catalogue.nbytes / dataframe_bytes}
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Fuzzy c-means clustering of services into soft quality tiers"""
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from ws_evaluation_tool import normalize_decision_matrix
+
+
+class FuzzyCMeans:
+    """
+    Fuzzy c-means with a vectorized full-batch mode and a mini-batch mode.
+
+    Distances and memberships are only ever materialized for `chunk_size` rows at a
+    time, so memory stays bounded for large catalogues (the returned memberships are
+    float32). With batch_size set, centers are updated from random mini-batches using
+    running membership-weighted means instead of full passes. n_init restarts run in
+    parallel threads (numpy releases the GIL) and the lowest objective wins.
+    """
+
+    def __init__(self, n_clusters=3, m=2.0, max_iter=300, tol=1e-5, batch_size=None,
+                 n_init=1, n_jobs=1, chunk_size=65536, seed=None):
+        if n_clusters < 2:
+            raise ValueError("n_clusters must be at least 2")
+        if m <= 1:
+            raise ValueError("Fuzzifier m must be greater than 1")
+        self.n_clusters = n_clusters
+        self.m = m
+        self.max_iter = max_iter
+        self.tol = tol
+        self.batch_size = batch_size
+        self.n_init = n_init
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.centers_ = None
+        self.objective_ = None
+        self.n_iter_ = None
+
+    def _memberships(self, X, centers):
+        """Returns (memberships, squared distances) for a chunk of rows."""
+        squared = ((X[:, np.newaxis, :] - centers[np.newaxis, :, :]) ** 2).sum(axis=2)
+        inverse = np.maximum(squared, 1e-12) ** (-1.0 / (self.m - 1))
+        return inverse / inverse.sum(axis=1, keepdims=True), squared
+
+    def _full_pass(self, X, centers):
+        """One chunked pass: returns (updated centers, objective of the given centers)."""
+        numerator = np.zeros_like(centers)
+        denominator = np.zeros(len(centers))
+        objective = 0.0
+        for start in range(0, len(X), self.chunk_size):
+            chunk = X[start:start + self.chunk_size]
+            memberships, squared = self._memberships(chunk, centers)
+            weighted = memberships ** self.m
+            numerator += weighted.T @ chunk
+            denominator += weighted.sum(axis=0)
+            objective += (weighted * squared).sum()
+        return numerator / np.maximum(denominator, 1e-12)[:, np.newaxis], objective
+
+    def _fit_once(self, X, seed):
+        rng = np.random.default_rng(seed)
+        centers = X[rng.choice(len(X), size=self.n_clusters, replace=False)].copy()
+        iteration = 0
+        if self.batch_size is None:
+            for iteration in range(1, self.max_iter + 1):
+                new_centers, _ = self._full_pass(X, centers)
+                shift = np.abs(new_centers - centers).max()
+                centers = new_centers
+                if shift < self.tol:
+                    break
+        else:
+            seen = np.zeros(self.n_clusters)
+            for iteration in range(1, self.max_iter + 1):
+                batch = X[rng.integers(0, len(X), size=self.batch_size)]
+                weighted = self._memberships(batch, centers)[0] ** self.m
+                batch_weight = weighted.sum(axis=0)
+                seen += batch_weight
+                # running membership-weighted mean: each batch moves a center by its share of the weight seen so far
+                step = batch_weight / np.maximum(seen, 1e-12)
+                batch_means = (weighted.T @ batch) / np.maximum(batch_weight, 1e-12)[:, np.newaxis]
+                new_centers = centers + step[:, np.newaxis] * (batch_means - centers)
+                shift = np.abs(new_centers - centers).max()
+                centers = new_centers
+                if shift < self.tol:
+                    break
+        return centers, self._full_pass(X, centers)[1], iteration
+
+    def fit(self, X):
+        X = np.ascontiguousarray(X, dtype=float)
+        if len(X) < self.n_clusters:
+            raise ValueError(f"Need at least {self.n_clusters} rows to fit {self.n_clusters} clusters")
+        seeds = np.random.SeedSequence(self.seed).spawn(self.n_init)
+        with ThreadPoolExecutor(max_workers=max(1, self.n_jobs)) as executor:
+            runs = list(executor.map(lambda seed: self._fit_once(X, seed), seeds))
+        self.centers_, self.objective_, self.n_iter_ = min(runs, key=lambda run: run[1])
+        return self
+
+    def predict(self, X):
+        """Membership matrix (rows x clusters, float32) computed chunk by chunk."""
+        if self.centers_ is None:
+            raise ValueError("Model is not fitted yet")
+        X = np.asarray(X, dtype=float)
+        memberships = np.empty((len(X), self.n_clusters), dtype=np.float32)
+        for start in range(0, len(X), self.chunk_size):
+            memberships[start:start + self.chunk_size] = self._memberships(
+                X[start:start + self.chunk_size], self.centers_)[0]
+        return memberships
+
+
+def fuzzy_service_tiers(decision_matrix, criteria_types, n_tiers=3, weights=None, **kwargs):
+    """
+    Group services into soft quality tiers with fuzzy c-means on the normalized criteria.
+
+    Tiers are ordered by the (weighted) mean normalized quality of their centers, so
+    "Tier 1" is the best one. Returns a DataFrame with the crisp tier and one membership
+    column per tier, aligned with decision_matrix so it can be exported next to the
+    WASPAS/VIKOR results (see generate_report).
+    """
+    print(f"Clustering services into {n_tiers} fuzzy tiers...")
+    normalized = normalize_decision_matrix(decision_matrix, criteria_types).to_numpy(dtype=float)
+    model = FuzzyCMeans(n_clusters=n_tiers, **kwargs).fit(normalized)
+    quality = model.centers_ @ (np.ones(normalized.shape[1]) if weights is None else np.asarray(weights, dtype=float))
+    order = np.argsort(-quality)
+    memberships = model.predict(normalized)[:, order]
+    result = pd.DataFrame({"Tier": memberships.argmax(axis=1) + 1}, index=decision_matrix.index)
+    for tier in range(n_tiers):
+        result[f"Tier {tier + 1} Membership"] = memberships[:, tier]
+    print("Fuzzy tiers computed successfully.")
+    return result
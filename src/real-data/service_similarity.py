@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Nearest-neighbour search for replacement services with similar QoS"""
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from ws_evaluation_tool import infer_criteria_types, normalize_decision_matrix
+
+
+class ServiceSimilarityIndex:
+    """
+    KD-tree over the normalized decision matrix of a service catalogue.
+
+    Distances are Euclidean in normalized QoS space, optionally weighted per criterion
+    (e.g. by the entropy weights from calculate_weights). Services are identified by
+    `key_column`; duplicated keys keep their last row. On reload only added and changed
+    services are buffered next to the tree (removed ones are masked out) as long as the
+    normalization references (benefit maxima, cost minima) do not move, and the tree is
+    rebuilt once the buffer grows beyond `rebuild_fraction` of the catalogue.
+    """
+
+    def __init__(self, df, weights=None, trust_column=None, key_column="WSDL Address",
+                 name_column="Service Name", rebuild_fraction=0.1, leafsize=16):
+        self.trust_column = trust_column
+        self.key_column = key_column
+        self.name_column = name_column
+        self.rebuild_fraction = rebuild_fraction
+        self.leafsize = leafsize
+        self.criteria = [col for col in df.select_dtypes(include=[np.number]).columns if col != trust_column]
+        self.criteria_types = infer_criteria_types(df[self.criteria])
+        self.scale = np.ones(len(self.criteria)) if weights is None else np.sqrt(np.asarray(weights, dtype=float))
+        if len(self.scale) != len(self.criteria):
+            raise ValueError(f"Expected {len(self.criteria)} weights, got {len(self.scale)}")
+        self._load(df)
+        self._build()
+
+    def _load(self, df):
+        """Normalize a dataset version into the current catalogue (vectors, names and trust by key)."""
+        missing = [col for col in self.criteria + [self.key_column] if col not in df.columns]
+        if missing:
+            raise ValueError(f"Dataset is missing columns: {missing}")
+        df = df.dropna(subset=self.criteria).drop_duplicates(subset=self.key_column, keep="last")
+        normalized = normalize_decision_matrix(df[self.criteria], self.criteria_types).to_numpy(dtype=float)
+        if not np.isfinite(normalized).all():
+            raise ValueError("Normalized decision matrix is not finite (zero values in a cost criterion?)")
+        self._vectors = pd.DataFrame(normalized * self.scale, index=df[self.key_column].to_numpy(),
+                                     columns=self.criteria)
+        self._values = self._vectors.to_numpy()
+        self._rows = {key: row for row, key in enumerate(self._vectors.index)}
+        self._names = (df[self.name_column].to_numpy() if self.name_column in df.columns
+                       else np.full(len(df), None, dtype=object))
+        self._trust = (df[self.trust_column].to_numpy(dtype=float) if self.trust_column in df.columns
+                       else None)
+        self._references = np.array([
+            df[col].max() if criteria_type == "max" else df[col].min()
+            for col, criteria_type in zip(self.criteria, self.criteria_types)
+        ])
+
+    def _build(self):
+        print(f"Building similarity index over {len(self._vectors)} services...")
+        self._tree = cKDTree(self._values, leafsize=self.leafsize)
+        self._tree_keys = self._vectors.index.to_numpy()
+        self._tree_rows = np.arange(len(self._vectors))  # row in the current catalogue, -1 once stale
+        self._dead_count = 0
+        self._delta_rows = np.empty(0, dtype=int)
+        self._delta_points = np.empty((0, len(self.criteria)))
+        print("Similarity index built.")
+
+    def __len__(self):
+        return len(self._vectors)
+
+    def reload(self, df):
+        """
+        Refresh the index from a new version of the dataset.
+        Returns a summary with the added, removed and changed keys and whether the tree was rebuilt.
+        """
+        old_vectors, old_references, old_delta = self._vectors, self._references, len(self._delta_rows)
+        stale_delta_keys = set(old_vectors.index[self._delta_rows])
+        self._load(df)
+        added = self._vectors.index.difference(old_vectors.index)
+        removed = old_vectors.index.difference(self._vectors.index)
+        common = self._vectors.index.intersection(old_vectors.index)
+        differs = (self._vectors.loc[common].to_numpy() != old_vectors.loc[common].to_numpy()).any(axis=1)
+        changed = common[differs]
+        summary = {"added": list(added), "removed": list(removed), "changed": list(changed), "rebuilt": True}
+
+        buffered = old_delta + len(added) + len(changed)
+        if not np.array_equal(self._references, old_references) or buffered > self.rebuild_fraction * len(self):
+            self._build()
+            return summary
+
+        # tree rows keep pointing at their service unless it was removed or its vector changed
+        stale = set(removed) | set(changed)
+        self._tree_rows = np.array([-1 if row < 0 or key in stale else self._rows[key]
+                                    for key, row in zip(self._tree_keys, self._tree_rows)], dtype=int)
+        self._dead_count = int((self._tree_rows < 0).sum())
+        fresh = [key for key in stale_delta_keys - stale if key in self._rows] + list(added) + list(changed)
+        self._delta_rows = np.array([self._rows[key] for key in fresh], dtype=int)
+        self._delta_points = self._values[self._delta_rows]
+        summary["rebuilt"] = False
+        return summary
+
+    def _accept(self, rows, exclude, min_trust):
+        mask = rows >= 0
+        if exclude is not None:
+            mask &= rows != exclude
+        if min_trust is not None:
+            if self._trust is None:
+                raise ValueError("Index was built without a trust column")
+            mask &= self._trust[np.where(mask, rows, 0)] >= min_trust
+        return mask
+
+    def _nearest(self, vector, k, min_trust, exclude):
+        tree_size = len(self._tree_keys)
+        fetch = min(k + self._dead_count + (exclude is not None), tree_size)
+        while True:
+            distances, positions = self._tree.query(vector, k=max(fetch, 1))
+            distances, positions = np.atleast_1d(distances), np.atleast_1d(positions)
+            found = positions < tree_size
+            rows, distances = self._tree_rows[positions[found]], distances[found]
+            accepted = self._accept(rows, exclude, min_trust)
+            if accepted.sum() >= k or fetch >= tree_size:
+                break
+            fetch = min(fetch * 2, tree_size)  # filters rejected too many, widen the search
+        rows, distances = rows[accepted], distances[accepted]
+
+        if len(self._delta_rows):
+            delta_distances = np.linalg.norm(self._delta_points - vector, axis=1)
+            delta_accepted = self._accept(self._delta_rows, exclude, min_trust)
+            rows = np.concatenate([rows, self._delta_rows[delta_accepted]])
+            distances = np.concatenate([distances, delta_distances[delta_accepted]])
+
+        nearest = np.argsort(distances, kind="stable")[:k]
+        return rows[nearest], distances[nearest]
+
+    def _result(self, rows, distances):
+        result = {self.key_column: self._vectors.index[rows]}
+        if self.name_column:
+            result[self.name_column] = self._names[rows]
+        if self._trust is not None:
+            result[self.trust_column] = self._trust[rows]
+        result["Distance"] = distances
+        return pd.DataFrame(result)
+
+    def query_vector(self, vector, k=10, min_trust=None):
+        """
+        Return the k services closest to an already normalized and weighted QoS vector.
+        """
+        return self._result(*self._nearest(np.asarray(vector, dtype=float), k, min_trust, None))
+
+    def query(self, key, k=10, min_trust=None):
+        """
+        Return the k services most similar to the service identified by `key` (excluding itself).
+        """
+        if key not in self._rows:
+            raise KeyError(f"Unknown service '{key}'")
+        row = self._rows[key]
+        return self._result(*self._nearest(self._values[row], k, min_trust, row))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Ad-hoc weighted top-k queries over pre-sorted normalized criteria (threshold algorithm)"""
+
+import numpy as np
+import pandas as pd
+from ws_evaluation_tool import normalize_decision_matrix
+
+
+class TopKQueryEngine:
+    """
+    Answers "top k services under these criteria weights" for weighted-sum (WSM) scores
+    of the normalized decision matrix, without scoring the whole catalogue.
+
+    Every normalized criterion is sorted once. A query reads the lists of the weighted
+    criteria in order (descending for positive weights, ascending for negative ones) in
+    growing blocks, scores each newly seen service by random access, and stops as soon as
+    the k-th best score reaches the threshold: the best score an unseen service could still
+    get (Fagin's threshold algorithm). When the lists disagree so much that more than
+    `scan_fraction` of the catalogue has been touched, the query falls back to a full scan.
+    Query statistics (rows touched, sorted accesses, depth, fallback) are in result.attrs.
+    """
+
+    def __init__(self, decision_matrix, criteria_types, scan_fraction=0.25, initial_block=32):
+        self.criteria = list(decision_matrix.columns)
+        self.index = decision_matrix.index
+        self.scan_fraction = scan_fraction
+        self.initial_block = initial_block
+        self._normalized = np.ascontiguousarray(
+            normalize_decision_matrix(decision_matrix, criteria_types).to_numpy(dtype=float))
+        # per criterion: row order by descending normalized value, and the values in that order
+        self._order = np.ascontiguousarray(np.argsort(-self._normalized, axis=0, kind="stable").T)
+        self._sorted = np.take_along_axis(self._normalized, self._order.T, axis=0).T.copy()
+
+    def _weight_vector(self, weights):
+        if isinstance(weights, dict):
+            weights = pd.Series(weights)
+        if isinstance(weights, pd.Series):
+            unknown = set(weights.index) - set(self.criteria)
+            if unknown:
+                raise KeyError(f"Unknown criteria: {sorted(unknown)}")
+            return weights.reindex(self.criteria, fill_value=0.0).to_numpy(dtype=float)
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (len(self.criteria),):
+            raise ValueError(f"Expected {len(self.criteria)} weights, got shape {weights.shape}")
+        return weights
+
+    def _rows_at(self, column, start, end, descending):
+        n = len(self._normalized)
+        if descending:
+            return self._order[column, start:end]
+        return self._order[column, n - end:n - start][::-1]
+
+    def _value_at(self, column, position, descending):
+        return self._sorted[column, position if descending else len(self._normalized) - 1 - position]
+
+    def query(self, weights, k=20, full_scan=False):
+        """Top-k services (Score, Rank) by weighted sum of normalized criteria."""
+        w = self._weight_vector(weights)
+        n = len(self._normalized)
+        k = min(k, n)
+        active = np.flatnonzero(w != 0)
+        stats = {"rows_touched": 0, "sorted_accesses": 0, "depth": 0, "full_scan": False}
+        if full_scan or len(active) == 0:
+            rows, scores = self._full_scan(w, k)
+            stats.update(rows_touched=n, full_scan=True)
+            return self._result(rows, scores, stats)
+
+        descending = w > 0
+        seen = np.zeros(n, dtype=bool)
+        top_rows, top_scores = np.empty(0, dtype=np.int64), np.empty(0)
+        depth, block = 0, max(self.initial_block, k)
+        while depth < n:
+            end = min(n, depth + block)
+            candidates = np.unique(np.concatenate([self._rows_at(c, depth, end, descending[c]) for c in active]))
+            candidates = candidates[~seen[candidates]]
+            seen[candidates] = True
+            stats["sorted_accesses"] += (end - depth) * len(active)
+            stats["rows_touched"] += len(candidates)
+            if len(candidates):
+                top_rows = np.concatenate([top_rows, candidates])
+                top_scores = np.concatenate([top_scores, self._normalized[candidates] @ w])
+                if len(top_rows) > k:
+                    keep = np.argpartition(-top_scores, k - 1)[:k]
+                    top_rows, top_scores = top_rows[keep], top_scores[keep]
+            depth = end
+            if depth == n:
+                break
+            # an unseen service sits at position >= depth in every list
+            threshold = sum(w[c] * self._value_at(c, depth, descending[c]) for c in active)
+            if len(top_rows) == k and top_scores.min() >= threshold:
+                break
+            if stats["rows_touched"] > self.scan_fraction * n:
+                top_rows, top_scores = self._full_scan(w, k)
+                stats.update(rows_touched=n, full_scan=True)
+                break
+            block *= 2
+        stats["depth"] = depth
+        return self._result(top_rows, top_scores, stats)
+
+    def _full_scan(self, w, k):
+        scores = self._normalized @ w
+        rows = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        return rows, scores[rows]
+
+    def _result(self, rows, scores, stats):
+        order = np.lexsort((rows, -scores))  # best score first, ties by catalogue order
+        rows, scores = rows[order], scores[order]
+        result = pd.DataFrame({"Score": scores, "Rank": np.arange(1, len(rows) + 1)}, index=self.index[rows])
+        result.attrs.update(stats)
+        return result
@@ -2,20 +2,43 @@ import pandas as pd
 import numpy as np
 from scipy.stats import rankdata
 import csv
+import html
 from operator import itemgetter
 import os
+import sys
 import webbrowser
 
-def load_dataset(dataset_choice, file_path):
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))  # the src package, when run from src/real-data
+
+from src import GlobalVars
+from src.DataReader import DataReader
+from src.Instrumentation import instrumented
+from src.Profiling import profiled, profiler
+from src.StageCache import cached_stage
+
+@instrumented()
+def load_dataset(dataset_choice, file_path, columns=None, dtypes=None, catalogue=False):
     """
     Load dataset based on user choice (QWS or Custom).
+    `columns` limits parsing to the columns a stage needs; QWS columns get the dtypes of
+    GlobalVars.qws_dtypes unless `dtypes` overrides them. Raises ValueError on a schema mismatch.
+    With `catalogue=True` a ServiceCatalogue is returned instead: criteria are parsed
+    straight to float32 (in `columns` order) and names/addresses become string columns.
     """
     if dataset_choice.lower() == "qws":
         print("Loading QWS dataset...")
+        dtypes = {**GlobalVars.qws_dtypes, **(dtypes or {})}
+        if catalogue:
+            dtypes.update({column: 'float32' for column in GlobalVars.qws_criteria})
     else:
         print("Loading custom dataset...")
-    return pd.read_csv(file_path)
+    df = DataReader(file_path).read(columns, dtypes)
+    if catalogue:
+        from service_catalogue import ServiceCatalogue
+        return ServiceCatalogue.from_frame(df)
+    return df
 
+@instrumented()
 def validate_data(df):
     """
     Validate the dataset by removing duplicates and null values.
@@ -26,17 +49,35 @@ def validate_data(df):
     return df
 
 
+def normalize_decision_matrix(decision_matrix, criteria_types):
+    """
+    Linear max/min normalization of the decision matrix (benefit: x / max, cost: min / x).
+    Fills one output array column by column, so a float32 catalogue view stays float32
+    and the input frame is never copied.
+    """
+    values = decision_matrix.to_numpy()
+    dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+    normalized = np.empty(values.shape, dtype=dtype)
+    for i in range(values.shape[1]):
+        column = values[:, i]
+        if criteria_types[i] == "max":
+            normalized[:, i] = column / np.nanmax(column)
+        elif criteria_types[i] == "min":
+            normalized[:, i] = np.nanmin(column) / column
+        else:
+            normalized[:, i] = column
+    return pd.DataFrame(normalized, index=decision_matrix.index, columns=decision_matrix.columns, copy=False)
+
+
+@instrumented()
+@cached_stage(depends_on=(normalize_decision_matrix,))
 def calculate_weights(decision_matrix, criteria_types):
     """
     Calculate weights using the Entropy Weighting Method.
     """
     print("Calculating weights...")
-    normalized_matrix = decision_matrix.copy()
-    for i, col in enumerate(decision_matrix.columns):
-        if criteria_types[i] == "max":
-            normalized_matrix[col] = decision_matrix[col] / decision_matrix[col].max()
-        elif criteria_types[i] == "min":
-            normalized_matrix[col] = decision_matrix[col].min() / decision_matrix[col]
+    # entropy is close to 1, so 1 - entropy needs float64 even for a float32 catalogue
+    normalized_matrix = normalize_decision_matrix(decision_matrix, criteria_types).astype(float)
     epsilon = 1e-10
     p = normalized_matrix / normalized_matrix.sum(axis=0)
     entropy = -np.nansum(p * np.log(p + epsilon), axis=0) / np.log(len(decision_matrix))
@@ -61,54 +102,153 @@ def infer_criteria_types(decision_matrix):
     return criteria_types
 
 
-def fuzzy_waspas(df, weights, criteria_types):
+def pareto_skyline(decision_matrix, criteria_types, k=1, block_size=1024):
+    """
+    Return the rows of the decision matrix dominated by fewer than k others (k=1: the Pareto skyline).
+    WASPAS scores of the kept rows are unchanged; for VIKOR pass the full matrix as fuzzy_vikor's reference.
+    """
+    print("Computing Pareto skyline...")
+    if k < 1 or block_size < 1:
+        raise ValueError("k and block_size must be positive")
+    values = decision_matrix.to_numpy(dtype=float)
+    if np.isnan(values).any():
+        raise ValueError("Decision matrix contains missing values, validate the data first")
+    signs = np.array([-1.0 if criteria_type == "min" else 1.0 for criteria_type in criteria_types])
+    values = values * signs  # every criterion becomes "higher is better"
+    # sort-filter skyline: sorted by a monotone score a dominator always comes first, so rows are
+    # compared block-wise against the skyband found so far. Dominated rows can never top a monotone
+    # weighted ranking, and the per-criterion extrema used for normalization survive.
+    value_range = values.max(axis=0) - values.min(axis=0)
+    value_range[value_range == 0] = 1
+    order = np.argsort(-((values - values.min(axis=0)) / value_range).sum(axis=1), kind="stable")
+
+    def dominance(candidates, others):
+        """(candidates x others) boolean matrix: others[j] is at least as good everywhere and better somewhere."""
+        at_least = np.ones((len(candidates), len(others)), dtype=bool)
+        better = np.zeros((len(candidates), len(others)), dtype=bool)
+        for j in range(values.shape[1]):  # one criterion at a time avoids a 3-D temporary
+            at_least &= others[np.newaxis, :, j] >= candidates[:, j, np.newaxis]
+            better |= others[np.newaxis, :, j] > candidates[:, j, np.newaxis]
+        return at_least & better
+
+    prefilter_size = 64
+    kept = []
+    window = np.empty_like(values)  # skyband rows found so far live in window[:size]
+    size = 0
+    for start in range(0, len(order), block_size):
+        block_rows = order[start:start + block_size]
+        block = values[block_rows]
+        # the earliest window rows are the strongest, so a cheap check against them
+        # discards most dominated rows before the full comparisons
+        survivors = np.arange(len(block))
+        if size:
+            survivors = survivors[dominance(block, window[:min(size, prefilter_size)]).sum(axis=1) < k]
+        # a later row in sort order can never dominate an earlier one, and a discarded
+        # row's dominators also dominate everything it dominates, so counting the
+        # remaining block rows plus the whole window is exact for rows in the skyband
+        candidates = block[survivors]
+        counts = dominance(candidates, candidates).sum(axis=1)
+        if size:
+            counts += dominance(candidates, window[:size]).sum(axis=1)
+        survivors = survivors[counts < k]
+        kept.append(block_rows[survivors])
+        window[size:size + len(survivors)] = block[survivors]
+        size += len(survivors)
+
+    skyline_rows = np.sort(np.concatenate(kept))
+    print(f"Skyline computed: {len(skyline_rows)} of {len(values)} services are non-dominated.")
+    return decision_matrix.iloc[skyline_rows]
+
+
+@instrumented()
+@cached_stage(depends_on=(normalize_decision_matrix,))
+def fuzzy_waspas(df, weights, criteria_types, lambda_param=0.5):
     """
     Compute WASPAS scores and rankings based on the input decision matrix.
     """
     print("Applying Fuzzy WASPAS method...")
-    normalized_df = df.copy()
-    for i, col in enumerate(df.columns):
-        if criteria_types[i] == "max":
-            normalized_df[col] = df[col] / df[col].max()
-        elif criteria_types[i] == "min":
-            normalized_df[col] = df[col].min() / df[col]
-    weighted_df = normalized_df * weights
-    wsm_scores = weighted_df.sum(axis=1)
-    wpm_scores = np.prod(np.power(normalized_df, weights), axis=1)
-    lambda_param = 0.5
+    normalized = normalize_decision_matrix(df, criteria_types).to_numpy()
+    weights = np.asarray(weights, dtype=normalized.dtype)
+    wsm_scores = (normalized * weights).sum(axis=1)
+    wpm_scores = np.prod(np.power(normalized, weights), axis=1)
     waspas_scores = lambda_param * wsm_scores + (1 - lambda_param) * wpm_scores
     rankings = rankdata(-waspas_scores, method="dense")
     print("Fuzzy WASPAS method applied successfully.")
-    return pd.DataFrame({"WASPAS Score": waspas_scores, "WASPAS Rank": rankings})
+    return pd.DataFrame({"WASPAS Score": waspas_scores, "WASPAS Rank": rankings}, index=df.index)
 
 
-def fuzzy_vikor(df, weights, criteria_types):
+def fuzzy_waspas_lambda_sweep(df, weights, criteria_types, lambdas):
+    """
+    Evaluate WASPAS for a whole vector of lambda values in one scoring pass.
+
+    WSM and the log-space WPM are computed once and combined per lambda, which also
+    keeps the WPM product from underflowing on many criteria. Returns two DataFrames
+    (scores, dense ranks) with one column per lambda value.
+    """
+    print(f"Applying Fuzzy WASPAS method for {len(lambdas)} lambda values...")
+    lambdas = np.asarray(lambdas, dtype=float)
+    if lambdas.ndim != 1 or ((lambdas < 0) | (lambdas > 1)).any():
+        raise ValueError("lambdas must be a 1-D sequence of values within [0, 1]")
+    normalized = normalize_decision_matrix(df, criteria_types).to_numpy(dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    wsm_scores = normalized @ weights
+    with np.errstate(divide="ignore"):
+        wpm_scores = np.exp(np.log(normalized) @ weights)
+    scores = np.outer(wsm_scores, lambdas) + np.outer(wpm_scores, 1 - lambdas)
+    rankings = rankdata(-scores, method="dense", axis=0)
+    print("Fuzzy WASPAS lambda sweep applied successfully.")
+    return (pd.DataFrame(scores, index=df.index, columns=lambdas),
+            pd.DataFrame(rankings, index=df.index, columns=lambdas))
+
+
+def vikor_distance_matrix(df, criteria_types):
+    """
+    Normalized distances |x - ideal| / |anti-ideal - ideal| used by VIKOR (0 for constant criteria).
+    """
+    values = df.to_numpy(dtype=float)
+    is_max = np.array([criteria_type == "max" for criteria_type in criteria_types])
+    ideal = np.where(is_max, values.max(axis=0), values.min(axis=0))
+    anti_ideal = np.where(is_max, values.min(axis=0), values.max(axis=0))
+    denominator = np.abs(anti_ideal - ideal)
+    safe_denominator = np.where(denominator == 0, 1, denominator)
+    distances = np.abs(values - ideal) / safe_denominator
+    distances[:, denominator == 0] = 0
+    return distances
+
+
+@instrumented()
+@cached_stage(depends_on=(vikor_distance_matrix,))
+def fuzzy_vikor(df, weights, criteria_types, reference=None):
     """
     Compute VIKOR scores and rankings based on the input decision matrix.
+    The ideal and anti-ideal values and the S/R ranges come from `reference` (default: df);
+    scoring a subset such as the Pareto skyline against the full matrix as reference gives
+    the same scores as a full run.
     """
     print("Applying Fuzzy VIKOR method...")
-    df = df.copy()
+    reference = df if reference is None else reference[df.columns]
     ideal = []
     anti_ideal = []
     for i, col in enumerate(df.columns):
         if criteria_types[i] == "max":
-            ideal.append(df[col].max())
-            anti_ideal.append(df[col].min())
+            ideal.append(reference[col].max())
+            anti_ideal.append(reference[col].min())
         elif criteria_types[i] == "min":
-            ideal.append(df[col].min())
-            anti_ideal.append(df[col].max())
+            ideal.append(reference[col].min())
+            anti_ideal.append(reference[col].max())
 
+    values = df.to_numpy()
     si = []
     ri = []
     for i in range(len(df)):
         s = 0
         r = 0
-        for j, col in enumerate(df.columns):
+        for j in range(len(df.columns)):
             denominator = abs(anti_ideal[j] - ideal[j])
             if denominator == 0:
                 normalized_diff = 0
             else:
-                normalized_diff = abs(df.iloc[i][col] - ideal[j]) / denominator
+                normalized_diff = abs(values[i, j] - ideal[j]) / denominator
             weighted_diff = weights[j] * normalized_diff
             s += weighted_diff
             r = max(r, weighted_diff)
@@ -116,8 +256,14 @@ def fuzzy_vikor(df, weights, criteria_types):
         ri.append(r)
 
     v = 0.5  # Compromise parameter
-    min_s, max_s = min(si), max(si)
-    min_r, max_r = min(ri), max(ri)
+    if reference is df:
+        min_s, max_s = min(si), max(si)
+        min_r, max_r = min(ri), max(ri)
+    else:
+        weighted_distances = vikor_distance_matrix(reference, criteria_types) * np.asarray(weights, dtype=float)
+        reference_s, reference_r = weighted_distances.sum(axis=1), weighted_distances.max(axis=1)
+        min_s, max_s = reference_s.min(), reference_s.max()
+        min_r, max_r = reference_r.min(), reference_r.max()
     q = [
         v * (s - min_s) / (max_s - min_s) + (1 - v) * (r - min_r) / (max_r - min_r)
         if (max_s - min_s) != 0 and (max_r - min_r) != 0 else 0
@@ -128,63 +274,233 @@ def fuzzy_vikor(df, weights, criteria_types):
     return pd.DataFrame({"VIKOR Score": q, "VIKOR Rank": rankings})
 
 
-def generate_report(df, waspas_results, vikor_results):
+def waspas_contributions(df, weights, criteria_types, normalized=None):
+    """
+    Per-criterion terms of the WASPAS score of every service, in one vectorized pass.
+
+    Returns two (services x criteria) DataFrames: the WSM terms w_j * n_ij, which sum to the
+    WSM score, and the log-WPM terms w_j * log(n_ij), which sum to log(WPM). The WASPAS score
+    is lambda * sum(WSM terms) + (1 - lambda) * exp(sum(log-WPM terms)). A cached normalized
+    matrix (normalize_decision_matrix) can be passed to skip the normalization.
+    """
+    if normalized is None:
+        normalized = normalize_decision_matrix(df, criteria_types)
+    normalized = np.asarray(normalized, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    with np.errstate(divide="ignore"):
+        log_terms = np.log(normalized) * weights
+    return (pd.DataFrame(normalized * weights, index=df.index, columns=df.columns),
+            pd.DataFrame(log_terms, index=df.index, columns=df.columns))
+
+
+def vikor_contributions(df, weights, criteria_types, distances=None):
+    """
+    Weighted regret terms w_j * |x_ij - ideal_j| / |anti-ideal_j - ideal_j| of every service.
+    Their row sums are the VIKOR S values and their row maxima the R values; a cached
+    vikor_distance_matrix can be passed to skip recomputing the distances.
+    """
+    if distances is None:
+        distances = vikor_distance_matrix(df, criteria_types)
+    return pd.DataFrame(distances * np.asarray(weights, dtype=float), index=df.index, columns=df.columns)
+
+
+def top_contributors(contributions, n=3, largest=True):
+    """
+    The n criteria with the largest (or, with largest=False, smallest) terms for every service,
+    e.g. the strongest WSM terms, the most negative log-WPM terms (what drags a WASPAS score
+    down) or the largest VIKOR regret terms. Returns "Criterion k" / "Contribution k" columns.
+    """
+    values = contributions.to_numpy(dtype=float)
+    n = min(n, values.shape[1])
+    keys = np.where(np.isnan(values), np.inf, -values if largest else values)
+    selected = np.argpartition(keys, n - 1, axis=1)[:, :n] if n < values.shape[1] else \
+        np.tile(np.arange(n), (len(values), 1))
+    selected = np.take_along_axis(selected, np.argsort(np.take_along_axis(keys, selected, axis=1), axis=1,
+                                                       kind="stable"), axis=1)
+    names = np.asarray(contributions.columns, dtype=object)[selected]
+    terms = np.take_along_axis(values, selected, axis=1)
+    result = pd.DataFrame(index=contributions.index)
+    for k in range(n):
+        result[f"Criterion {k + 1}"] = names[:, k]
+        result[f"Contribution {k + 1}"] = terms[:, k]
+    return result
+
+
+def _batched_waspas_scores(normalized, log_normalized, weight_samples, lambda_param):
+    """Score every sampled weight vector at once: returns a (samples x services) matrix."""
+    wsm_scores = weight_samples @ normalized.T
+    with np.errstate(over="ignore", invalid="ignore"):
+        wpm_scores = np.exp(weight_samples @ log_normalized.T)
+    return lambda_param * wsm_scores + (1 - lambda_param) * np.nan_to_num(wpm_scores)
+
+
+def _batched_vikor_scores(distances, weight_samples, v):
+    """VIKOR Q values for every sampled weight vector: returns a (samples x services) matrix."""
+    si = weight_samples @ distances.T
+    ri = np.zeros_like(si)
+    for j in range(distances.shape[1]):  # one criterion at a time keeps memory at samples x services
+        np.maximum(ri, np.outer(weight_samples[:, j], distances[:, j]), out=ri)
+    s_range = si.max(axis=1, keepdims=True) - si.min(axis=1, keepdims=True)
+    r_range = ri.max(axis=1, keepdims=True) - ri.min(axis=1, keepdims=True)
+    degenerate = (s_range == 0) | (r_range == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = (v * (si - si.min(axis=1, keepdims=True)) / s_range
+             + (1 - v) * (ri - ri.min(axis=1, keepdims=True)) / r_range)
+    return np.where(degenerate, 0, q)
+
+
+def weight_sensitivity_analysis(decision_matrix, weights, criteria_types, method="waspas",
+                                n_samples=1000, concentration=100.0, top_k=10, chunk_size=256,
+                                lambda_param=0.5, v=0.5, seed=None):
+    """
+    Monte Carlo sensitivity of the rankings to perturbations of the entropy weights.
+
+    Weight vectors are drawn from a Dirichlet distribution centred on `weights`
+    (higher `concentration` means smaller perturbations) and scored in chunks of
+    `chunk_size` samples as one matrix product (samples x services), so memory stays
+    bounded by chunk_size x services. Returns one row per service with its rank
+    distribution (mean, std, best, worst, P(rank = r) for r <= top_k) and the
+    probability of being in the top-k.
+    """
+    print(f"Running weight sensitivity analysis ({method.upper()}, {n_samples} samples)...")
+    method = method.lower()
+    if method not in ("waspas", "vikor"):
+        raise ValueError(f"Unsupported method '{method}', expected 'waspas' or 'vikor'")
+    if n_samples < 1 or chunk_size < 1 or top_k < 1:
+        raise ValueError("n_samples, chunk_size and top_k must be positive")
+
+    base_weights = np.asarray(weights, dtype=float)
+    alpha = concentration * np.clip(base_weights, 1e-6, None) / np.clip(base_weights, 1e-6, None).sum()
+    if method == "waspas":
+        normalized = normalize_decision_matrix(decision_matrix, criteria_types).to_numpy(dtype=float)
+        with np.errstate(divide="ignore"):
+            log_normalized = np.log(normalized)
+        score_chunk = lambda samples: _batched_waspas_scores(normalized, log_normalized, samples, lambda_param)
+    else:
+        distances = vikor_distance_matrix(decision_matrix, criteria_types)
+        score_chunk = lambda samples: _batched_vikor_scores(distances, samples, v)
+    sign = -1 if method == "waspas" else 1  # WASPAS ranks descending, VIKOR ascending
+
+    n_services = len(decision_matrix)
+    rank_sum = np.zeros(n_services)
+    rank_sq_sum = np.zeros(n_services)
+    best_rank = np.full(n_services, np.inf)
+    worst_rank = np.zeros(n_services)
+    rank_counts = np.zeros((n_services, top_k), dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_samples, chunk_size):
+        samples = rng.dirichlet(alpha, size=min(chunk_size, n_samples - start))
+        ranks = rankdata(sign * score_chunk(samples), method="dense", axis=1)
+        rank_sum += ranks.sum(axis=0)
+        rank_sq_sum += (ranks ** 2).sum(axis=0)
+        np.minimum(best_rank, ranks.min(axis=0), out=best_rank)
+        np.maximum(worst_rank, ranks.max(axis=0), out=worst_rank)
+        top_rows, top_cols = np.nonzero(ranks <= top_k)
+        np.add.at(rank_counts, (top_cols, ranks[top_rows, top_cols].astype(int) - 1), 1)
+
+    base_scores = score_chunk(base_weights[np.newaxis, :])[0]
+    mean_rank = rank_sum / n_samples
+    result = pd.DataFrame({
+        "Base Rank": rankdata(sign * base_scores, method="dense").astype(int),
+        "Mean Rank": mean_rank,
+        "Rank Std": np.sqrt(np.maximum(rank_sq_sum / n_samples - mean_rank ** 2, 0)),
+        "Best Rank": best_rank.astype(int),
+        "Worst Rank": worst_rank.astype(int),
+        f"Top-{top_k} Probability": rank_counts.sum(axis=1) / n_samples,
+    }, index=decision_matrix.index)
+    for r in range(top_k):
+        result[f"P(Rank={r + 1})"] = rank_counts[:, r] / n_samples
+    print("Weight sensitivity analysis complete.")
+    return result
+
+
+@instrumented(rows=lambda result, *args, **kwargs: len(result))
+def generate_report(df, waspas_results, vikor_results, *extra_results, output_path="evaluation_report.csv",
+                    format=None, compression=None, chunk_size=100_000):
     """
     Generate a report combining WASPAS and VIKOR results with the original dataset.
+    Further per-service results (e.g. fuzzy tier memberships) are appended as extra columns.
+    Returns the combined DataFrame; the output options are those of stream_report.
     """
     print("Generating report...")
-    combined_df = pd.concat([df.reset_index(drop=True), waspas_results, vikor_results], axis=1)
-    combined_df.to_csv("evaluation_report.csv", index=False)
-    print("Report saved as evaluation_report.csv")
+    frames = [frame.reset_index(drop=True) for frame in (df, waspas_results, vikor_results, *extra_results)]
+    combined_df = pd.concat(frames, axis=1)
+    _write_report([combined_df], output_path, format, compression, chunk_size)
     return combined_df
 
 
-def main():
+def stream_report(df, waspas_results, vikor_results, *extra_results, output_path="evaluation_report.csv",
+                  format=None, compression=None, chunk_size=100_000):
+    """
+    Write the same report as generate_report without building the combined DataFrame:
+    rows are written chunk by chunk through a sink from report_export, as CSV (optionally
+    gzip/zstd compressed, inferred from a .gz/.zst suffix) or the typed columnar format (.cols).
+    Returns the number of rows written.
+    """
+    print("Generating report...")
+    return _write_report([df, waspas_results, vikor_results, *extra_results], output_path, format,
+                         compression, chunk_size)
+
+
+def _write_report(frames, output_path, format, compression, chunk_size):
+    from report_export import export_frames
+    rows = export_frames(frames, output_path, format=format, compression=compression, chunk_size=chunk_size)
+    print(f"Report saved as {output_path}")
+    return rows
+
+
+@profiled('ws_evaluation_tool.main')
+def main(skyline=False):
     """
     Main function to run the QoS Evaluation Tool.
+    With skyline=True only the non-dominated services are scored; weights and VIKOR's reference
+    values still come from the full dataset, so their scores match a full run.
     """
     print("Welcome to the QoS Evaluation Tool!")
     dataset_choice = input("Choose dataset type (QWS or Custom): ").strip()
     file_path = input("Enter the path to the dataset file: ").strip()
     df = load_dataset(dataset_choice, file_path)
+    profiler.tag(rows=len(df))
     df = validate_data(df)
     decision_matrix = df.select_dtypes(include=[np.number])
     criteria_types = infer_criteria_types(decision_matrix)
     weights = calculate_weights(decision_matrix, criteria_types)
-    waspas_results = fuzzy_waspas(decision_matrix, weights, criteria_types)
-    vikor_results = fuzzy_vikor(decision_matrix, weights, criteria_types)
+    reference = decision_matrix
+    if skyline:
+        decision_matrix = pareto_skyline(decision_matrix, criteria_types)
+        df = df.loc[decision_matrix.index]
+    waspas_results = fuzzy_waspas(decision_matrix.reset_index(drop=True), weights, criteria_types)
+    vikor_results = fuzzy_vikor(decision_matrix.reset_index(drop=True), weights, criteria_types,
+                                reference=reference if skyline else None)
     generate_report(df, waspas_results, vikor_results)
 
-def improvedExperiment():
-    df = pd.read_csv("datasets/qws.csv")
-
-    columns = [
-        'Response Time', 'Latency', 'Availability', 'Reliability',
-        'Best Practices', 'Successability', 'Service Name', 'WSDL Address'
-    ]
-    df = df[columns].dropna()
-
+@profiled()
+def improvedExperiment(skyline=False):
     # Separate benefit_criteria and cost_criteria
     benefit_criteria = ['Availability', 'Reliability', 'Best Practices', 'Successability']
     cost_criteria = ['Response Time', 'Latency']
+    criteria_types = ["max"] * len(benefit_criteria) + ["min"] * len(cost_criteria)
 
-    normalized_df = pd.DataFrame()
-    for col in benefit_criteria:
-        normalized_df[col] = df[col] / df[col].max()
-    for col in cost_criteria:
-        normalized_df[col] = df[col].min() / df[col]
-
-    P = normalized_df / normalized_df.sum()
-    E = -np.nansum(P * np.log(P + 1e-10), axis=0) / np.log(len(df))
-    d = 1 - E
-    fuzzy_weights = d / d.sum()
+    # float32 criteria in benefit/cost order, so the decision matrix is a zero-copy view
+    columns = benefit_criteria + cost_criteria + ['Service Name', 'WSDL Address']
+    catalogue = load_dataset("QWS", "datasets/qws.csv", columns, catalogue=True).dropna()
+    profiler.tag(rows=len(catalogue))
+    decision_matrix = catalogue.decision_matrix()
 
-    trust_scores = (normalized_df * fuzzy_weights).sum(axis=1)
+    # Same max/min normalization and entropy weights as the evaluation tool (a cached stage)
+    normalized_df = normalize_decision_matrix(decision_matrix, criteria_types)
+    fuzzy_weights = calculate_weights(decision_matrix, criteria_types)
 
-    df['Trust Score'] = trust_scores
-    top_10 = df.sort_values(by=["Trust Score"], ascending=[False])
+    rows = np.arange(len(catalogue))
+    if skyline:
+        # Only non-dominated services can reach the top of the trust ranking
+        rows = decision_matrix.index.get_indexer(pareto_skyline(decision_matrix, criteria_types).index)
 
-    df = df.sort_values(by=["Trust Score"], ascending=[False])
+    trust_scores = normalized_df.to_numpy()[rows] @ np.asarray(fuzzy_weights, dtype=np.float32)
+    order = np.argsort(-trust_scores, kind="stable")
+    top_10 = catalogue.take(rows[order]).to_frame().set_axis(catalogue.ids[rows[order]])
+    top_10['Trust Score'] = trust_scores[order]
 
     print("Trusted Web Services by a trust score:")
     print(top_10[['Service Name', 'WSDL Address', 'Trust Score']])
@@ -192,69 +508,147 @@ def improvedExperiment():
     # Ability to save into CSV (if needed)
     # top_10.to_csv("top10_trusted_services.csv", index=False)
 
-def get_services(filepath):
-    result = []
+def iter_services(filepath):
+    """
+    Stream (name, address, waspas, vikor, topsis) rows from a ranking results CSV.
+    """
     with open(filepath, mode='r', newline='', encoding='utf-8') as csvfile:
         reader = csv.reader(csvfile)
         for row in reader:
             if len(row) != 5: # 5 values
                 continue
-            serviceName, serviceAddress, waspas, vikor, topsis = row
-            result.append((serviceName, serviceAddress, waspas, vikor, topsis));
-    return result
+            if row[0] == 'Service Name': # header
+                continue
+            yield tuple(row)
 
-def generate_html_report(services, output_path, totalRows):
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    html = """
-    <html>
-    <head>
-        <title>Top 10 Most Trusted Services</title>
-        <style>
-            body { font-family: Arial, sans-serif; }
-            table { border-collapse: collapse; width: 60%; margin: 20px auto; }
-            th, td { border: 1px solid #ccc; padding: 8px; text-align: center; }
-            th { background-color: #f2f2f2; }
-        </style>
-    </head>
-    <body>
-        <h2 style="text-align: center;">Top 10 Most Trusted Services</h2>
-        <table>
-            <tr>
-                <th>Service Name</th>
-                <th>Service address</th>
-                <th>Trust Score</th>
-                <th>Waspas score</th>
-                <th>Vikor score</th>
-                <th>Topsis score</th>
-            </tr>
-    """ # Basic document, should become a dynamic one in the future
-    generated = 0
-
-    for serviceName, serviceAddress, waspas, vikor, topsis in services:
-        if serviceName == 'Service Name': continue
-        if generated == totalRows: break
-        generated += 1
-        html += f"""
-            <tr>
-                <td>{serviceName}</td>
-                <td>{serviceAddress}</td>
-                <td>{waspas}</td>
-                <td>{vikor}
-                <td>{topsis}
-            </tr>
-        """
-
-    html += """
-        </table>
-    </body>
-    </html>
-    """
-
-    with open(output_path, 'w', encoding='utf-8') as file:
-        file.write(html)
-    print(f"HTML report saved to {output_path}")
-    print(f'Total number of web services saved: {generated}')
-    webbrowser.open(f'file://{os.path.abspath(output_path)}') # Fun for a quick test but might be annoying in the longterm
+def get_services(filepath):
+    return list(iter_services(filepath))
+
+def select_top_services(results, n, score_column, ascending=False):
+    """
+    Top-n rows of a ranking results frame (or CSV path) by one score column.
+    Uses partial selection (argpartition, O(rows)) and only sorts the n selected rows.
+    """
+    if isinstance(results, str):
+        results = pd.read_csv(results)
+    scores = results[score_column].to_numpy(dtype=float)
+    keys = scores if ascending else -scores
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    n = min(n, len(keys))
+    if n == 0:
+        return results.iloc[[]]
+    selected = np.argpartition(keys, n - 1)[:n] if n < len(keys) else np.arange(len(keys))
+    selected = selected[np.argsort(keys[selected], kind="stable")]
+    return results.iloc[selected]
+
+HTML_REPORT_HEAD = """<html>
+<head>
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; }}
+        table {{ border-collapse: collapse; width: 60%; margin: 20px auto; }}
+        th, td {{ border: 1px solid #ccc; padding: 8px; text-align: center; }}
+        th {{ background-color: #f2f2f2; }}
+        .pages {{ text-align: center; }}
+    </style>
+</head>
+<body>
+    <h2 style="text-align: center;">{title}</h2>
+    <table>
+        <tr>{header}</tr>
+"""
+
+class HtmlReportWriter:
+    """
+    Streams table rows into one or more HTML pages through a buffered file writer.
+    With page_size set, every page_size rows start a new file (report.html, report_2.html, ...)
+    linked with previous/next navigation; a page is only opened once a row needs it.
+    """
+
+    def __init__(self, output_path, columns, title, page_size=None, buffer_size=1 << 20):
+        self.output_path = output_path
+        self.columns = columns
+        self.title = title
+        self.page_size = page_size
+        self.buffer_size = buffer_size
+        self.paths = []
+        self.rows_written = 0
+        self._file = None
+        self._page_rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _page_path(self, page):
+        if page == 1:
+            return self.output_path
+        stem, extension = os.path.splitext(self.output_path)
+        return f"{stem}_{page}{extension}"
+
+    def _open_page(self):
+        page = len(self.paths) + 1
+        if self._file is not None:
+            self._close_page(next_page=page)
+        path = self._page_path(page)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8', buffering=self.buffer_size)
+        self.paths.append(path)
+        self._page_rows = 0
+        title = self.title if page == 1 else f"{self.title} (page {page})"
+        header = "".join(f"<th>{html.escape(str(column))}</th>" for column in self.columns)
+        self._file.write(HTML_REPORT_HEAD.format(title=html.escape(title), header=header))
+
+    def _close_page(self, next_page=None):
+        self._file.write("    </table>\n")
+        page = len(self.paths)
+        links = []
+        if page > 1:
+            links.append(f'<a href="{os.path.basename(self._page_path(page - 1))}">Previous</a>')
+        if next_page is not None:
+            links.append(f'<a href="{os.path.basename(self._page_path(next_page))}">Next</a>')
+        if links:
+            self._file.write(f'    <p class="pages">{" | ".join(links)}</p>\n')
+        self._file.write("</body>\n</html>\n")
+        self._file.close()
+        self._file = None
+
+    def write_row(self, row):
+        if self._file is None or (self.page_size and self._page_rows == self.page_size):
+            self._open_page()
+        cells = "".join(f"<td>{html.escape(str(value))}</td>" for value in row)
+        self._file.write(f"        <tr>{cells}</tr>\n")
+        self._page_rows += 1
+        self.rows_written += 1
+
+    def close(self):
+        if self._file is None and not self.paths:
+            self._open_page()  # an empty report still gets its page
+        if self._file is not None:
+            self._close_page()
+
+def generate_html_report(services, output_path, totalRows, open_browser=False, page_size=None):
+    """
+    Stream up to totalRows (all rows if None) service rows into an HTML report.
+    `services` can be any iterable of rows, e.g. iter_services(...) or
+    select_top_services(...).itertuples(index=False). Runs headless unless open_browser is set.
+    """
+    columns = ['Service Name', 'Service address', 'Waspas score', 'Vikor score', 'Topsis score']
+    title = "All Services" if totalRows is None else f"Top {totalRows} Most Trusted Services"
+    with HtmlReportWriter(output_path, columns, title, page_size=page_size) as writer:
+        for row in services:
+            if totalRows is not None and writer.rows_written == totalRows:
+                break
+            writer.write_row(row)
+    print(f"HTML report saved to {', '.join(writer.paths)}")
+    print(f'Total number of web services saved: {writer.rows_written}')
+    if open_browser:
+        webbrowser.open(f'file://{os.path.abspath(output_path)}') # Fun for a quick test but might be annoying in the longterm
+    return writer.paths
 
 
 if __name__ == "__main__":
@@ -263,6 +657,6 @@ if __name__ == "__main__":
     csv_path = 'datasets/qws_result_trust.csv'
     output_html_path = 'output/trusted_services_report.html'
 
-    services = get_services(csv_path); print(services)
-    generate_html_report(services, output_html_path, 10) # to become in a config
-print('----- Report generation complete! -----')
+    services = select_top_services(csv_path, 10, 'Waspas score')
+    generate_html_report(services.itertuples(index=False), output_html_path, 10, open_browser=True) # to become in a config
+    print('----- Report generation complete! -----')
@@ -3,12 +3,24 @@
 # Initial version 2024-11-16
 # Author: Paulius Leveris <paulius.leveris@gmail.com>
 
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))  # the src package, when run from src/real-data
+
 from src import GlobalVars
+from src.Instrumentation import instrumentation
+from src.Profiling import profiled, profiler
+from src.StageCache import cached_stage
+import csv
+import time
+import requests
 import pandas as pd
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
 import matplotlib.pyplot as plt
+from report_export import export_frames
 
 # Load data
 csv_file = GlobalVars.dataset_path
@@ -17,8 +29,7 @@ columns = [
     'Reliability', 'Compliance', 'Best Practices', 'Latency',
     'Documentation', 'Service Name', 'WSDL Address'
 ]
-qws_data = pd.read_csv(csv_file)
-qws_data = qws_data.loc[:, ~qws_data.columns.str.contains('^Unnamed')]
+qws_data = pd.read_csv(csv_file, usecols=columns, dtype=GlobalVars.qws_dtypes)[columns]
 
 ### for debugging purposes (to be removed later)
 #for index, row in qws_data.head(5).iterrows():
@@ -84,6 +95,14 @@ def evaluate_trustworthiness(row):
         print(f"Error processing row {row['Service Name']}: {e}")
         return 0
 
+@cached_stage(depends_on=(sys.modules[__name__],))
+def trust_scores(df):
+    """
+    Fuzzy trustworthiness of every service. The whole module is part of the stage's code
+    version, so editing the membership functions or rules invalidates cached scores.
+    """
+    return df.apply(evaluate_trustworthiness, axis=1)
+
 # Script for QoS Testing
 def check_qos(services):
     results = []
@@ -125,25 +144,39 @@ def save_results_to_csv(results, filename="qos_results.csv"):
         writer.writeheader()
         writer.writerows(results)
 
-# Apply the evaluation to the dataset
-qws_data['Trustworthiness'] = qws_data.apply(evaluate_trustworthiness, axis=1)
-
-qws_data_sorted = qws_data.sort_values(by='Trustworthiness', ascending=False)
-
-# Display the top 10 most trustworthy services
-print("\nTop 10 Most Trustworthy Web Services:")
-print(qws_data_sorted[['Service Name', 'Trustworthiness']].head(10))
-
-# Save the sorted data to a CSV file
-qws_data_sorted.to_csv('qws_trustworthiness_evaluation.csv', index=False)
-
-# show the visual representation
-plt.figure(figsize=(12, 8))
-plt.barh(qws_data_sorted['Service Name'].head(10), qws_data_sorted['Trustworthiness'].head(10), color='skyblue')
-plt.xlabel('Trustworthiness Score')
-plt.ylabel('Service Name')
-plt.title('Top 10 Most Trustworthy Web Services')
-plt.gca().invert_yaxis()
-plt.tight_layout()
-plt.savefig('trustworthiness_chart.png')
-plt.show()
+def save_results_to_store(results, db_path="qos_history.db"):
+    # Appends to the probe history instead of overwriting a single snapshot
+    from probe_store import ProbeHistoryStore
+    with ProbeHistoryStore(db_path) as store:
+        store.insert_results(results)
+
+@profiled('ws_trust_prediction.main')
+def main():
+    profiler.tag(rows=len(qws_data))
+    # Apply the evaluation to the dataset
+    with instrumentation.stage("trust_inference", rows=len(qws_data)):
+        trust_inputs = qws_data[['Response Time', 'Availability', 'Throughput', 'Reliability', 'Service Name']]
+        qws_data['Trustworthiness'] = trust_scores(trust_inputs)
+
+    qws_data_sorted = qws_data.sort_values(by='Trustworthiness', ascending=False)
+
+    # Display the top 10 most trustworthy services
+    print("\nTop 10 Most Trustworthy Web Services:")
+    print(qws_data_sorted[['Service Name', 'Trustworthiness']].head(10))
+
+    # Save the sorted data (a .gz/.zst suffix compresses it, .cols writes the columnar format)
+    export_frames([qws_data_sorted], 'qws_trustworthiness_evaluation.csv')
+
+    # show the visual representation
+    plt.figure(figsize=(12, 8))
+    plt.barh(qws_data_sorted['Service Name'].head(10), qws_data_sorted['Trustworthiness'].head(10), color='skyblue')
+    plt.xlabel('Trustworthiness Score')
+    plt.ylabel('Service Name')
+    plt.title('Top 10 Most Trustworthy Web Services')
+    plt.gca().invert_yaxis()
+    plt.tight_layout()
+    plt.savefig('trustworthiness_chart.png')
+    plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""Concurrent WSDL fetching with streaming parsing into Documentation, Compliance and Best Practices criteria"""
+
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import time
+import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+WSDL_NAMESPACES = ("http://schemas.xmlsoap.org/wsdl/", "http://www.w3.org/ns/wsdl")
+SOAP_NAMESPACES = ("http://schemas.xmlsoap.org/wsdl/soap/", "http://schemas.xmlsoap.org/wsdl/soap12/")
+XSD_NAMESPACE = "http://www.w3.org/2001/XMLSchema"
+
+# WSDL elements whose <documentation> child counts towards the Documentation criterion
+DOCUMENTABLE = ("service", "port", "endpoint", "portType", "interface", "operation", "message")
+CRITERIA = ("Documentation", "Compliance", "Best Practices")
+
+
+@functools.lru_cache(maxsize=1024)  # WSDLs repeat a few dozen distinct tags
+def _split(tag):
+    if tag.startswith("{"):
+        namespace, local = tag[1:].split("}", 1)
+        return namespace, local
+    return "", tag
+
+
+class WsdlAnalyzer:
+    """
+    Incremental WSDL (1.1 and 2.0) analysis over a pull parser: feed() bytes as they arrive,
+    close() returns the metrics. Every element is dropped from the tree as soon as it ends
+    (markup nested in a <documentation> element only once the documentation ends), so memory
+    does not grow with the document.
+
+    Documentation is the percentage of services, ports/endpoints, port types/interfaces,
+    abstract operations and messages with a non-empty <documentation> child. Compliance and
+    Best Practices are the percentages of WSDL structure checks and WS-I Basic Profile style
+    checks (document/literal, element-typed parts, SOAP addresses, ...) the document passes;
+    they approximate the QWS definitions of those criteria, which came from external tools.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack = []  # (element, namespace, local name, state)
+        self.bytes = 0
+        self.counts = {"elements": 0, "max_depth": 0, "services": 0, "ports": 0, "port_types": 0,
+                       "operations": 0, "messages": 0, "parts": 0, "bindings": 0, "schema_types": 0,
+                       "schema_elements": 0}
+        self._documentable = self._documented = 0
+        self._documentation_depth = 0  # open <documentation> elements, whose subtrees are kept for their text
+        self._root = None
+        self._violations = {"binding_type": 0, "port_binding": 0, "operation_messages": 0, "part_typing": 0,
+                            "rpc_style": 0, "encoded_use": 0, "type_parts": 0, "duplicate_operations": 0,
+                            "missing_address": 0}
+
+    def feed(self, data):
+        self.bytes += len(data)
+        self._parser.feed(data)
+        self._drain()
+
+    def _drain(self):
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._start(element)
+            else:
+                self._end(element)
+
+    def _start(self, element):
+        namespace, local = _split(element.tag)
+        parent = self._stack[-1] if self._stack else None
+        state = {"documented": False, "messages": 0, "operation_names": [], "address": False}
+        self._stack.append((element, namespace, local, state))
+        self.counts["elements"] += 1
+        self.counts["max_depth"] = max(self.counts["max_depth"], len(self._stack))
+        if parent is None:
+            self._root = (namespace, local, element.get("targetNamespace"))
+        parent_local = parent[2] if parent and parent[1] in WSDL_NAMESPACES else None
+
+        if namespace in WSDL_NAMESPACES:
+            if local == "service":
+                self.counts["services"] += 1
+            elif local in ("port", "endpoint"):
+                self.counts["ports"] += 1
+                self._violations["port_binding"] += element.get("binding") is None
+                if local == "endpoint" and element.get("address"):
+                    state["address"] = True
+            elif local in ("portType", "interface"):
+                self.counts["port_types"] += 1
+            elif local == "binding":
+                self.counts["bindings"] += 1
+                self._violations["binding_type"] += element.get("type") is None and element.get("interface") is None
+            elif local == "message":
+                self.counts["messages"] += 1
+            elif local == "part":
+                self.counts["parts"] += 1
+                self._violations["part_typing"] += element.get("element") is None and element.get("type") is None
+                self._violations["type_parts"] += element.get("element") is None
+            elif local == "operation" and parent_local in ("portType", "interface"):
+                self.counts["operations"] += 1
+                parent[3]["operation_names"].append(element.get("name"))
+            elif local in ("input", "output") and parent_local == "operation":
+                parent[3]["messages"] += 1
+            elif local == "documentation":
+                self._documentation_depth += 1
+        elif namespace in SOAP_NAMESPACES:
+            if element.get("style") == "rpc":
+                self._violations["rpc_style"] += 1
+            if element.get("use") == "encoded":
+                self._violations["encoded_use"] += 1
+            if local == "address" and parent is not None:
+                parent[3]["address"] = True
+        elif namespace == XSD_NAMESPACE:
+            if local in ("complexType", "simpleType"):
+                self.counts["schema_types"] += 1
+            elif local == "element":
+                self.counts["schema_elements"] += 1
+
+    def _end(self, element):
+        _, namespace, local, state = self._stack.pop()
+        parent = self._stack[-1] if self._stack else None
+        if namespace in WSDL_NAMESPACES:
+            parent_local = parent[2] if parent else None
+            is_abstract_operation = local == "operation" and parent_local in ("portType", "interface")
+            if local == "documentation":
+                self._documentation_depth -= 1
+                if parent is not None and "".join(element.itertext()).strip():
+                    parent[3]["documented"] = True
+            elif local in DOCUMENTABLE and (local != "operation" or is_abstract_operation):
+                self._documentable += 1
+                self._documented += state["documented"]
+            if is_abstract_operation:
+                self._violations["operation_messages"] += state["messages"] == 0
+            if local in ("portType", "interface"):
+                names = state["operation_names"]
+                self._violations["duplicate_operations"] += len(names) - len(set(names))
+            if local in ("port", "endpoint"):
+                self._violations["missing_address"] += not state["address"]
+        if parent is not None and not self._documentation_depth:
+            # earlier siblings are already gone and the parser may have run ahead into later
+            # ones, so an ending element is always its parent's first remaining child
+            del parent[0][0]
+
+    def close(self):
+        self._parser.close()
+        self._drain()
+        if self._root is None:
+            raise ValueError("Empty WSDL document")
+        root_namespace, root_local, target_namespace = self._root
+        violations = self._violations
+        compliance = [
+            root_namespace in WSDL_NAMESPACES and root_local in ("definitions", "description"),
+            bool(target_namespace),
+            self.counts["services"] > 0,
+            violations["binding_type"] == 0,
+            violations["port_binding"] == 0,
+            violations["operation_messages"] == 0,
+            violations["part_typing"] == 0,
+        ]
+        best_practices = [
+            violations["rpc_style"] == 0,
+            violations["encoded_use"] == 0,
+            violations["type_parts"] == 0,
+            violations["duplicate_operations"] == 0,
+            self.counts["ports"] > 0 and violations["missing_address"] == 0,
+            bool(target_namespace) and ("://" in target_namespace or target_namespace.startswith("urn:")),
+        ]
+        return {
+            "Documentation": 100.0 * self._documented / self._documentable if self._documentable else 0.0,
+            "Compliance": 100.0 * sum(compliance) / len(compliance),
+            "Best Practices": 100.0 * sum(best_practices) / len(best_practices),
+            "WSDL Bytes": self.bytes,
+            **{f"WSDL {name.replace('_', ' ').title()}": count for name, count in self.counts.items()},
+        }
+
+
+def analyze_wsdl(data, chunk_size=64 * 1024):
+    """Metrics of a WSDL document given as bytes or an iterable of byte chunks."""
+    analyzer = WsdlAnalyzer()
+    chunks = [data[start:start + chunk_size] for start in range(0, len(data), chunk_size)] \
+        if isinstance(data, (bytes, bytearray)) else data
+    for chunk in chunks:
+        analyzer.feed(chunk)
+    return analyzer.close()
+
+
+def _fetch(session, address, timeout, chunk_size, max_bytes):
+    started = time.perf_counter()
+    try:
+        with session.get(address, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            analyzer = WsdlAnalyzer()
+            for chunk in response.iter_content(chunk_size):
+                analyzer.feed(chunk)
+                if analyzer.bytes > max_bytes:
+                    raise ValueError(f"WSDL larger than {max_bytes} bytes")
+            metrics = analyzer.close()
+        metrics["Error"] = None
+    except (requests.exceptions.RequestException, ET.ParseError, ValueError) as error:
+        metrics = {"Error": f"{type(error).__name__}: {error}"}
+    metrics["Fetch Time (ms)"] = (time.perf_counter() - started) * 1000
+    return metrics
+
+
+def crawl_wsdl(addresses, max_workers=16, timeout=10, chunk_size=64 * 1024, max_bytes=20 * 1024 * 1024,
+               session=None):
+    """
+    Fetch and analyze WSDL documents concurrently. Each distinct address is fetched once by a
+    pool of `max_workers` threads sharing one requests session, whose connection pool keeps up
+    to `max_workers` connections per host alive; responses are streamed into WsdlAnalyzer in
+    `chunk_size` pieces. Returns one row per address (indexed by WSDL Address) with the
+    metrics, the fetch time and an Error column (None on success, metrics NaN on failure).
+    """
+    addresses = list(dict.fromkeys(addresses))
+    owns_session = session is None
+    if owns_session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+    print(f"Crawling {len(addresses)} WSDL documents with {max_workers} workers...")
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda address: _fetch(session, address, timeout, chunk_size, max_bytes),
+                                        addresses))
+    finally:
+        if owns_session:
+            session.close()
+    metrics = pd.DataFrame(results, index=pd.Index(addresses, name="WSDL Address"))
+    failed = metrics["Error"].notna().sum() if len(metrics) else 0
+    print(f"WSDL crawl complete: {len(metrics) - failed} analyzed, {failed} failed.")
+    return metrics
+
+
+def update_decision_matrix(df, metrics, columns=CRITERIA, overwrite=False, key_column="WSDL Address"):
+    """
+    Copy crawled criteria into a QWS-shaped DataFrame, matched on `key_column`. By default only
+    missing values are filled (e.g. our own services, absent from the static CSV); with
+    overwrite=True every successfully crawled service gets the crawled values.
+    """
+    df = df.copy()
+    crawled = metrics[metrics["Error"].isna()] if "Error" in metrics else metrics
+    for column in columns:
+        values = df[key_column].map(crawled[column]) if column in crawled else pd.Series(np.nan, index=df.index)
+        if column not in df:
+            df[column] = values
+        elif overwrite:
+            df[column] = values.fillna(df[column])
+        else:
+            df[column] = df[column].fillna(values)
+    return df
@@ -1,11 +1,45 @@
 import sys, os
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/real-data')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../benchmarks')))
 
+import gzip
+import json
+import pstats
+import subprocess
+import tempfile
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from unittest.mock import patch
 import requests
+import numpy as np
+import pandas as pd
 from ws_trust_prediction import check_qos, evaluate_trustworthiness
+import ws_evaluation_tool
+from service_similarity import ServiceSimilarityIndex
+from service_clustering import FuzzyCMeans, fuzzy_service_tiers
+from incremental_ranking import IncrementalRankingEngine
+from dataset_reload import DatasetReloader, diff_hashes, row_hashes, service_keys
+from probe_store import ProbeHistoryStore, QWS_COLUMNS
+from qos_stream import StreamingQoSAggregator
+from probe_scheduler import ProbeScheduler, SimulatedClock
+from rank_aggregation import ConsensusRanking, load_method_scores
+from report_export import export_frames, open_sink, read_columnar
+from service_catalogue import ServiceCatalogue, StringColumn, measure_memory_saving
+from topk_query import TopKQueryEngine
+from wsdl_crawler import analyze_wsdl, crawl_wsdl, update_decision_matrix
+from src import GlobalVars
+from src.Classification import Classification
+from src.DataReader import DataReader
+from src.Instrumentation import Instrumentation, instrumentation
+from src.Profiling import Profiler
+from src.StageCache import StageCache, code_version, stage_cache
+from synthetic_qws import NUMERIC_COLUMNS, QWS_PATH, SyntheticQWS
+import regression_gate
+import run_benchmarks
 
 class TestQoSEvaluation(unittest.TestCase):
     def setUp(self):
@@ -55,5 +89,1288 @@ class TestQoSEvaluation(unittest.TestCase):
         throughput = (row["Content Size (bytes)"] / row["Response Time (ms)"]) * 1000  # Convert to KB/s
         self.assertEqual(round(throughput, 2), 5.0)  # Assert correct throughput
 
+# five hand-built services shared by the scoring tests; each test case picks its criteria
+SMALL_MATRIX = pd.DataFrame({
+    "Response Time": [120.0, 300.0, 80.0, 500.0, 250.0],
+    "Availability": [95.0, 80.0, 90.0, 60.0, 85.0],
+    "Reliability": [80.0, 70.0, 75.0, 50.0, 90.0],
+    "Throughput": [7.0, 16.0, 3.5, 12.0, 9.0],
+})
+
+class SmallMatrixTestCase(unittest.TestCase):
+    columns = ["Response Time", "Availability", "Throughput"]
+
+    def setUp(self):
+        self.matrix = SMALL_MATRIX[self.columns].copy()
+        self.criteria_types = ws_evaluation_tool.infer_criteria_types(self.matrix)
+        self.weights = ws_evaluation_tool.calculate_weights(self.matrix, self.criteria_types)
+
+class TestWeightSensitivity(SmallMatrixTestCase):
+    columns = ["Response Time", "Availability", "Reliability"]
+
+    def test_base_ranks_match_scoring_methods(self):
+        waspas = ws_evaluation_tool.fuzzy_waspas(self.matrix, self.weights, self.criteria_types)
+        vikor = ws_evaluation_tool.fuzzy_vikor(self.matrix, self.weights, self.criteria_types)
+        for method, expected in (("waspas", waspas["WASPAS Rank"]), ("vikor", vikor["VIKOR Rank"])):
+            result = ws_evaluation_tool.weight_sensitivity_analysis(
+                self.matrix, self.weights, self.criteria_types, method=method, n_samples=50, seed=0)
+            self.assertListEqual(list(result["Base Rank"]), list(expected))
+
+    def test_rank_distribution_is_consistent_across_chunks(self):
+        one_chunk = ws_evaluation_tool.weight_sensitivity_analysis(
+            self.matrix, self.weights, self.criteria_types, n_samples=300, top_k=5, chunk_size=300, seed=7)
+        many_chunks = ws_evaluation_tool.weight_sensitivity_analysis(
+            self.matrix, self.weights, self.criteria_types, n_samples=300, top_k=5, chunk_size=16, seed=7)
+        pd.testing.assert_frame_equal(one_chunk, many_chunks)
+        # every sample ranks some service first (dense ranks may tie), and all 5 services are in the top 5
+        self.assertGreaterEqual(one_chunk["P(Rank=1)"].sum(), 1.0)
+        self.assertTrue(np.allclose(one_chunk["Top-5 Probability"], 1.0))
+        self.assertTrue((one_chunk["Best Rank"] <= one_chunk["Mean Rank"]).all())
+        self.assertTrue((one_chunk["Mean Rank"] <= one_chunk["Worst Rank"]).all())
+
+    def test_high_concentration_keeps_base_ranking(self):
+        result = ws_evaluation_tool.weight_sensitivity_analysis(
+            self.matrix, self.weights, self.criteria_types, n_samples=100, concentration=1e7, seed=1)
+        self.assertTrue(np.allclose(result["Mean Rank"], result["Base Rank"]))
+
+class TestWaspasLambdaSweep(SmallMatrixTestCase):
+    def test_sweep_matches_single_lambda_runs(self):
+        lambdas = [0.0, 0.3, 0.5, 1.0]
+        scores, ranks = ws_evaluation_tool.fuzzy_waspas_lambda_sweep(
+            self.matrix, self.weights, self.criteria_types, lambdas)
+        self.assertListEqual(list(scores.columns), lambdas)
+        for lambda_param in lambdas:
+            expected = ws_evaluation_tool.fuzzy_waspas(
+                self.matrix, self.weights, self.criteria_types, lambda_param=lambda_param)
+            self.assertTrue(np.allclose(scores[lambda_param], expected["WASPAS Score"]))
+            self.assertListEqual(list(ranks[lambda_param]), list(expected["WASPAS Rank"]))
+
+    def test_rejects_lambda_outside_unit_interval(self):
+        with self.assertRaises(ValueError):
+            ws_evaluation_tool.fuzzy_waspas_lambda_sweep(
+                self.matrix, self.weights, self.criteria_types, [0.5, 1.5])
+
+class TestScoreContributions(SmallMatrixTestCase):
+    def test_waspas_terms_add_up_to_scores(self):
+        wsm_terms, log_wpm_terms = ws_evaluation_tool.waspas_contributions(
+            self.matrix, self.weights, self.criteria_types)
+        expected = ws_evaluation_tool.fuzzy_waspas(self.matrix, self.weights, self.criteria_types, lambda_param=0.3)
+        scores = 0.3 * wsm_terms.sum(axis=1) + 0.7 * np.exp(log_wpm_terms.sum(axis=1))
+        np.testing.assert_allclose(scores, expected["WASPAS Score"])
+
+    def test_vikor_regret_terms_give_s_and_r(self):
+        regret = ws_evaluation_tool.vikor_contributions(self.matrix, self.weights, self.criteria_types)
+        s, r = regret.sum(axis=1), regret.max(axis=1)
+        q = 0.5 * (s - s.min()) / (s.max() - s.min()) + 0.5 * (r - r.min()) / (r.max() - r.min())
+        expected = ws_evaluation_tool.fuzzy_vikor(self.matrix, self.weights, self.criteria_types)
+        np.testing.assert_allclose(q, expected["VIKOR Score"])
+
+    def test_top_contributors(self):
+        regret = ws_evaluation_tool.vikor_contributions(self.matrix, self.weights, self.criteria_types)
+        top = ws_evaluation_tool.top_contributors(regret, n=2)
+        for service, row in regret.iterrows():
+            ordered = row.sort_values(ascending=False, kind="stable")
+            self.assertEqual([top.loc[service, "Criterion 1"], top.loc[service, "Criterion 2"]], list(ordered.index[:2]))
+            self.assertAlmostEqual(top.loc[service, "Contribution 1"], ordered.iloc[0])
+        # the slowest service is held back most by its response time
+        _, log_wpm_terms = ws_evaluation_tool.waspas_contributions(self.matrix, self.weights, self.criteria_types)
+        drags = ws_evaluation_tool.top_contributors(log_wpm_terms, n=1, largest=False)
+        self.assertEqual(drags.loc[3, "Criterion 1"], "Response Time")
+        self.assertEqual(list(ws_evaluation_tool.top_contributors(regret, n=5).columns)[-1], "Contribution 3")
+
+class TestParetoSkyline(unittest.TestCase):
+    def brute_force_skyband(self, matrix, criteria_types, k):
+        values = matrix.to_numpy(dtype=float) * [-1 if t == "min" else 1 for t in criteria_types]
+        dominators = [((values >= row).all(axis=1) & (values > row).any(axis=1)).sum() for row in values]
+        return list(matrix.index[np.array(dominators) < k])
+
+    def test_matches_brute_force_for_every_block_size(self):
+        rng = np.random.default_rng(3)
+        matrix = pd.DataFrame(rng.integers(0, 6, size=(200, 3)).astype(float),
+                              columns=["Response Time", "Availability", "Reliability"])
+        criteria_types = ws_evaluation_tool.infer_criteria_types(matrix)
+        for k in (1, 2, 4):
+            expected = self.brute_force_skyband(matrix, criteria_types, k)
+            for block_size in (1, 16, 1024):
+                result = ws_evaluation_tool.pareto_skyline(matrix, criteria_types, k=k, block_size=block_size)
+                self.assertListEqual(list(result.index), expected)
+
+    def test_skyline_keeps_waspas_scores_and_top_service(self):
+        matrix = pd.DataFrame({
+            "Response Time": [120.0, 300.0, 80.0, 500.0, 250.0, 80.0],
+            "Availability": [95.0, 80.0, 90.0, 60.0, 85.0, 90.0],
+            "Reliability": [80.0, 70.0, 75.0, 50.0, 90.0, 75.0],
+        })
+        criteria_types = ws_evaluation_tool.infer_criteria_types(matrix)
+        weights = ws_evaluation_tool.calculate_weights(matrix, criteria_types)
+        skyline = ws_evaluation_tool.pareto_skyline(matrix, criteria_types)
+        self.assertListEqual(list(skyline.index), [0, 2, 4, 5])  # duplicates do not dominate each other
+        full = ws_evaluation_tool.fuzzy_waspas(matrix, weights, criteria_types)
+        candidates = ws_evaluation_tool.fuzzy_waspas(skyline, weights, criteria_types)
+        self.assertTrue(np.allclose(full.loc[skyline.index, "WASPAS Score"], candidates["WASPAS Score"]))
+        self.assertIn(full["WASPAS Score"].idxmax(), skyline.index)
+
+    def test_skyline_vikor_against_full_reference_matches_full_run(self):
+        rng = np.random.default_rng(5)
+        matrix = pd.DataFrame(rng.uniform(1, 100, size=(300, 3)), columns=["Response Time", "Availability", "Reliability"])
+        criteria_types = ws_evaluation_tool.infer_criteria_types(matrix)
+        weights = ws_evaluation_tool.calculate_weights(matrix, criteria_types)
+        skyline = ws_evaluation_tool.pareto_skyline(matrix, criteria_types)
+        full = ws_evaluation_tool.fuzzy_vikor(matrix, weights, criteria_types)
+        subset = ws_evaluation_tool.fuzzy_vikor(skyline, weights, criteria_types, reference=matrix)
+        self.assertTrue(np.allclose(full.loc[skyline.index, "VIKOR Score"], subset["VIKOR Score"]))
+        unreferenced = ws_evaluation_tool.fuzzy_vikor(skyline, weights, criteria_types)
+        self.assertFalse(np.allclose(subset["VIKOR Score"], unreferenced["VIKOR Score"]))
+
+class TestServiceSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.catalogue = pd.DataFrame({
+            "Response Time": rng.uniform(50, 1000, 300),
+            "Availability": rng.uniform(10, 100, 300),
+            "Reliability": rng.uniform(30, 90, 300),
+            "Service Name": [f"Service {i}" for i in range(300)],
+            "WSDL Address": [f"http://example.com/{i}?wsdl" for i in range(300)],
+            "Trust Score": rng.uniform(0, 100, 300),
+        })
+
+    def brute_force(self, index, key, k, min_trust=None):
+        vectors = index._vectors
+        distances = pd.Series(np.linalg.norm(vectors.to_numpy() - vectors.loc[key].to_numpy(), axis=1),
+                              index=vectors.index).drop(key)
+        if min_trust is not None:
+            trust = self.catalogue.set_index("WSDL Address")["Trust Score"]
+            distances = distances[trust.reindex(distances.index) >= min_trust]
+        return list(distances.sort_values(kind="stable").index[:k])
+
+    def test_query_matches_full_scan_with_trust_filter(self):
+        index = ServiceSimilarityIndex(self.catalogue, weights=[0.5, 0.3, 0.2], trust_column="Trust Score")
+        key = "http://example.com/7?wsdl"
+        for min_trust in (None, 60, 95):
+            result = index.query(key, k=10, min_trust=min_trust)
+            self.assertListEqual(list(result["WSDL Address"]), self.brute_force(index, key, 10, min_trust))
+            if min_trust is not None:
+                self.assertTrue((result["Trust Score"] >= min_trust).all())
+
+    def test_incremental_reload_matches_rebuilt_index(self):
+        index = ServiceSimilarityIndex(self.catalogue, trust_column="Trust Score")
+        updated = self.catalogue.drop(index=[3, 4]).copy()
+        updated.loc[10, "Availability"] = 55.0
+        updated.loc[300] = [400.0, 70.0, 60.0, "Service new", "http://example.com/new?wsdl", 80.0]
+        summary = index.reload(updated)
+        self.assertFalse(summary["rebuilt"])
+        self.assertEqual(len(summary["removed"]), 2)
+        self.assertListEqual(summary["changed"], ["http://example.com/10?wsdl"])
+        self.assertListEqual(summary["added"], ["http://example.com/new?wsdl"])
+        rebuilt = ServiceSimilarityIndex(updated, trust_column="Trust Score")
+        for key in ("http://example.com/new?wsdl", "http://example.com/10?wsdl", "http://example.com/0?wsdl"):
+            pd.testing.assert_frame_equal(index.query(key, k=8, min_trust=20), rebuilt.query(key, k=8, min_trust=20))
+        with self.assertRaises(KeyError):
+            index.query("http://example.com/3?wsdl")
+
+class TestFuzzyServiceTiers(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        tiers = [(100.0, 95.0, 85.0), (600.0, 75.0, 65.0), (2000.0, 40.0, 40.0)]
+        self.matrix = pd.DataFrame(
+            np.vstack([rng.normal(center, (20.0, 3.0, 3.0), size=(100, 3)) for center in tiers]),
+            columns=["Response Time", "Availability", "Reliability"])
+        self.criteria_types = ws_evaluation_tool.infer_criteria_types(self.matrix)
+
+    def test_full_batch_matches_skfuzzy(self):
+        import skfuzzy as fuzz
+        X = ws_evaluation_tool.normalize_decision_matrix(self.matrix, self.criteria_types).to_numpy()
+        model = FuzzyCMeans(n_clusters=3, tol=1e-9, max_iter=1000, chunk_size=64, seed=0).fit(X)
+        centers = fuzz.cmeans(X.T, 3, 2.0, error=1e-12, maxiter=1000, seed=0)[0]
+        order = lambda c: c[np.argsort(c[:, 0])]
+        self.assertTrue(np.allclose(order(model.centers_), order(centers), atol=1e-5))
+        self.assertTrue(np.allclose(model.predict(X).sum(axis=1), 1.0, atol=1e-5))
+
+    def test_mini_batch_restarts_reach_full_batch_objective(self):
+        X = ws_evaluation_tool.normalize_decision_matrix(self.matrix, self.criteria_types).to_numpy()
+        full = FuzzyCMeans(n_clusters=3, seed=0).fit(X)
+        mini = FuzzyCMeans(n_clusters=3, batch_size=32, max_iter=300, n_init=3, n_jobs=3, seed=0).fit(X)
+        self.assertLess(mini.objective_, full.objective_ * 1.05)
+
+    def test_tiers_are_ordered_by_quality(self):
+        tiers = fuzzy_service_tiers(self.matrix, self.criteria_types, n_tiers=3, seed=2, n_init=2)
+        self.assertListEqual(list(tiers.columns),
+                             ["Tier", "Tier 1 Membership", "Tier 2 Membership", "Tier 3 Membership"])
+        self.assertListEqual(list(tiers["Tier"].iloc[[0, 100, 200]]), [1, 2, 3])
+
+class TestIncrementalRanking(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(13)
+        self.matrix = pd.DataFrame({
+            "Response Time": rng.uniform(50, 1000, 200),
+            "Availability": rng.uniform(10, 100, 200),
+            "Reliability": rng.uniform(30, 90, 200),
+        }, index=[f"http://example.com/{i}?wsdl" for i in range(200)])
+        self.criteria_types = ws_evaluation_tool.infer_criteria_types(self.matrix)
+
+    def test_initial_weights_match_entropy_method(self):
+        engine = IncrementalRankingEngine(self.matrix, self.criteria_types)
+        expected = ws_evaluation_tool.calculate_weights(self.matrix, self.criteria_types)
+        self.assertTrue(np.allclose(engine.weights, expected, atol=1e-6))
+
+    def test_updates_match_full_scoring(self):
+        for method, scorer in (("waspas", ws_evaluation_tool.fuzzy_waspas), ("vikor", ws_evaluation_tool.fuzzy_vikor)):
+            engine = IncrementalRankingEngine(self.matrix, self.criteria_types, method=method)
+            current = self.matrix.copy()
+            rng = np.random.default_rng(17)
+            for _ in range(20):
+                changes = current.sample(5, random_state=rng)[["Availability", "Reliability"]].copy()
+                changes["Availability"] = rng.uniform(20, 95, 5)
+                engine.update(changes)
+                current.loc[changes.index, changes.columns] = changes
+            expected = scorer(current, engine.weights, self.criteria_types)
+            result = engine.results()
+            self.assertTrue(np.allclose(result.iloc[:, 0], expected.iloc[:, 0]))
+            self.assertListEqual(list(result.iloc[:, 1]), list(expected.iloc[:, 1]))
+            self.assertEqual(engine.rank(current.index[3]), result.iloc[3, 1])
+
+    def test_only_changed_rows_are_rescored_unless_extremum_moves(self):
+        engine = IncrementalRankingEngine(self.matrix, self.criteria_types, weight_tolerance=1.0)
+        key = self.matrix["Availability"].idxmin()
+        summary = engine.update(pd.DataFrame({"Availability": [50.0]}, index=[key]))
+        self.assertEqual(summary, {"rescored": 1, "full_recompute": False})
+        summary = engine.update(pd.DataFrame({"Availability": [100.5]}, index=[key]))
+        self.assertTrue(summary["full_recompute"])
+        updated = self.matrix.copy()
+        updated.loc[key, "Availability"] = 100.5
+        expected = ws_evaluation_tool.fuzzy_waspas(updated, engine.weights, self.criteria_types)
+        self.assertEqual(engine.rank(key), expected.loc[key, "WASPAS Rank"])
+        with self.assertRaises(KeyError):
+            engine.update(pd.DataFrame({"Availability": [50.0]}, index=["http://unknown"]))
+
+    def test_added_and_removed_services_match_full_scoring(self):
+        rng = np.random.default_rng(19)
+        for method, scorer in (("waspas", ws_evaluation_tool.fuzzy_waspas), ("vikor", ws_evaluation_tool.fuzzy_vikor)):
+            engine = IncrementalRankingEngine(self.matrix, self.criteria_types, method=method, weight_tolerance=1.0)
+            current = self.matrix.copy()
+            for step in range(5):
+                removed = current.sample(3, random_state=rng).index
+                engine.remove(removed)
+                added = pd.DataFrame({"Response Time": rng.uniform(60, 900, 2), "Availability": rng.uniform(15, 95, 2),
+                                      "Reliability": rng.uniform(35, 85, 2)}, index=[f"new-{step}-0", f"new-{step}-1"])
+                engine.add(added)
+                current = pd.concat([current.drop(removed), added])
+            expected = scorer(current.loc[engine.index], engine.weights, self.criteria_types)
+            self.assertTrue(np.allclose(engine.results().iloc[:, 0], expected.iloc[:, 0]))
+            self.assertListEqual(list(engine.results().iloc[:, 1]), list(expected.iloc[:, 1]))
+        interior = self.matrix.loc[["http://example.com/5?wsdl"]].assign(Availability=50.0, Reliability=60.0,
+                                                                           **{"Response Time": 500.0})
+        engine = IncrementalRankingEngine(self.matrix, self.criteria_types, weight_tolerance=1.0)
+        self.assertEqual(engine.add(interior.set_axis(["http://new?wsdl"])), {"rescored": 1, "full_recompute": False})
+        with self.assertRaises(KeyError):
+            engine.add(interior)
+
+class TestProbeHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ProbeHistoryStore(":memory:", retention_seconds=100, rollup_seconds=10)
+        for timestamp in range(0, 200, 10):
+            self.store.insert_results([
+                {"Service Name": "Service A", "URL": "http://example.com/serviceA",
+                 "Response Time (ms)": 100.0 + timestamp, "Availability": 1, "Throughput (KB/s)": 2.0},
+                {"Service Name": "Service B", "URL": "http://example.com/serviceB",
+                 "Response Time (ms)": None, "Availability": 0, "Throughput (KB/s)": None,
+                 "Error": "Service Unreachable"} if timestamp % 20 else
+                {"Service Name": "Service B", "URL": "http://example.com/serviceB",
+                 "Response Time (ms)": 50.0, "Availability": 1, "Throughput (KB/s)": 4.0},
+            ], timestamp=timestamp)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_window_aggregates(self):
+        summary = self.store.service_summary(window_seconds=100, now=200)
+        self.assertEqual(summary.loc["Service A", "Probes"], 10)
+        self.assertEqual(summary.loc["Service A", "Response Time p50"], 245.0)
+        self.assertAlmostEqual(summary.loc["Service A", "Response Time p95"], 285.5)
+        self.assertEqual(summary.loc["Service B", "Availability"], 50.0)
+        self.assertEqual(summary.loc["Service B", "Throughput"], 4.0)
+
+    def test_compaction_keeps_long_term_availability(self):
+        before = self.store.availability_series("Service B", bucket_seconds=50)
+        self.assertEqual(self.store.compact(now=200), 20)
+        self.assertEqual(self.store.compact(now=200), 0)
+        after = self.store.availability_series("Service B", bucket_seconds=50)
+        pd.testing.assert_series_equal(before, after)
+        self.assertEqual(self.store.service_summary().loc["Service A", "Probes"], 10)
+
+    def test_decision_matrix_has_qws_shape(self):
+        matrix = self.store.to_decision_matrix()
+        self.assertListEqual(list(matrix.columns), QWS_COLUMNS)
+        self.assertListEqual(list(matrix["WSDL Address"]),
+                             ["http://example.com/serviceA", "http://example.com/serviceB"])
+        self.assertEqual(matrix.loc[1, "Successability"], 50.0)
+
+class TestStreamingQoSAggregator(unittest.TestCase):
+    def test_window_aggregates_follow_the_last_probes(self):
+        aggregator = StreamingQoSAggregator(window=20, relative_accuracy=0.01, initial_services=1)
+        rng = np.random.default_rng(19)
+        probes = {"Service A": [], "Service B": [], "Service C": []}
+        for _ in range(500):
+            service = rng.choice(list(probes))
+            response_time = float(rng.lognormal(5, 1)) if rng.random() < 0.8 else None
+            available = response_time is not None and rng.random() < 0.9
+            aggregator.add(service, response_time, available, 2.0 if response_time else None, url=f"http://{service}")
+            probes[service].append((response_time, available))
+        snapshot = aggregator.snapshot(percentiles=(50, 95))
+        for service, history in probes.items():
+            window = history[-20:]
+            answered = np.array([np.float32(rt) for rt, _ in window if rt is not None], dtype=float)
+            self.assertEqual(snapshot.loc[service, "Probes"], 20)
+            self.assertAlmostEqual(snapshot.loc[service, "Availability"], np.mean([a for _, a in window]) * 100)
+            self.assertAlmostEqual(snapshot.loc[service, "Successability"], len(answered) / 20 * 100)
+            for percentile in (50, 95):
+                expected = np.percentile(answered, percentile, method="lower")
+                self.assertLessEqual(abs(snapshot.loc[service, f"Response Time p{percentile}"] - expected),
+                                     0.01 * expected)
+
+    def test_decision_matrix_feeds_mcdm(self):
+        aggregator = StreamingQoSAggregator(window=10)
+        aggregator.add_results([
+            {"Service Name": "Service A", "URL": "http://example.com/serviceA",
+             "Response Time (ms)": 120.0, "Availability": 1, "Throughput (KB/s)": 4.0},
+            {"Service Name": "Service B", "URL": "http://example.com/serviceB",
+             "Response Time (ms)": 900.0, "Availability": 1, "Throughput (KB/s)": 1.0},
+            {"Service Name": "Service B", "URL": "http://example.com/serviceB",
+             "Response Time (ms)": None, "Availability": 0, "Throughput (KB/s)": None},
+        ])
+        matrix = aggregator.to_decision_matrix()
+        self.assertListEqual(list(matrix.columns), QWS_COLUMNS)
+        decision_matrix = matrix.select_dtypes(include=[np.number]).dropna(axis=1, how="all")
+        criteria_types = ws_evaluation_tool.infer_criteria_types(decision_matrix)
+        weights = ws_evaluation_tool.calculate_weights(decision_matrix, criteria_types)
+        ranks = ws_evaluation_tool.fuzzy_waspas(decision_matrix, weights, criteria_types)["WASPAS Rank"]
+        self.assertListEqual(list(ranks), [1, 2])
+
+class StubServiceHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == "/ok" else 500)
+        self.end_headers()
+        self.wfile.write(b"<definitions/>")
+
+    def log_message(self, *args):
+        pass
+
+class TestProbeScheduler(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(23)
+        self.services = [{"name": name, "url": f"http://example.com/{name}"}
+                         for name in ("stable", "volatile", "borderline", "down", "top")]
+        self.active, self.peak = 0, 0
+        self.lock = threading.Lock()
+        self.overlapping = threading.Event()
+
+    def prober(self, services):
+        name = services[0]["name"]
+        response_time = float(self.rng.uniform(50, 2000)) if name == "volatile" else 100.0
+        available = int(self.rng.random() < 0.85) if name == "borderline" else int(name != "down")
+        return [{"Service Name": name, "URL": services[0]["url"],
+                 "Response Time (ms)": None if name == "down" else response_time, "Availability": available}]
+
+    def blocking_prober(self, services):
+        # pooled probes wait until three are in flight, so a batch really overlaps
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            if self.active == 3:
+                self.overlapping.set()
+        if threading.current_thread() is not threading.main_thread():  # a single probe runs inline
+            self.overlapping.wait(timeout=1)
+        with self.lock:
+            self.active -= 1
+            if self.active == 0:
+                self.overlapping.clear()
+        return self.prober(services)
+
+    def test_volatile_near_threshold_and_top_k_services_are_probed_more(self):
+        scheduler = ProbeScheduler(self.services, prober=self.prober, clock=SimulatedClock(),
+                                   budget=1000, top_k=["top"])
+        scheduler.run(36000)
+        probes = {name: state.probes for name, state in scheduler.states.items()}
+        for name in ("volatile", "borderline", "top"):
+            self.assertGreater(probes[name], probes["stable"])
+        self.assertLessEqual(probes["down"], probes["stable"])
+
+    def test_budget_and_concurrency_caps(self):
+        clock = SimulatedClock()
+        collected = []
+        services = [{"name": f"{service['name']} {copy}", "url": service["url"]}
+                    for copy in range(5) for service in self.services]
+        scheduler = ProbeScheduler(services, prober=self.blocking_prober, clock=clock, min_interval=1,
+                                   max_interval=1, budget=10, budget_window=60, concurrency=3,
+                                   on_results=collected.extend)
+        scheduler.run(600)
+        self.assertEqual(len(scheduler.states), 25)
+        self.assertLessEqual(scheduler.probes_sent, 10 + 600 / 60 * 10)
+        self.assertEqual(sum(state.probes for state in scheduler.states.values()), scheduler.probes_sent)
+        self.assertEqual(self.peak, 3)
+        self.assertEqual(len(collected), scheduler.probes_sent)
+        # each held-back probe counts once: it has been sent since or is still queued
+        self.assertGreater(scheduler.deferred, 0)
+        self.assertLessEqual(scheduler.deferred, scheduler.probes_sent + len(services))
+
+    def test_deferred_counts_each_held_back_probe_once(self):
+        scheduler = ProbeScheduler(self.services, prober=self.prober, clock=SimulatedClock(), budget=2,
+                                   budget_window=60)
+        self.assertEqual(len(scheduler.run_once()), 2)
+        self.assertEqual(scheduler.deferred, 3)
+        self.assertEqual(scheduler.run_once(), [])
+        self.assertEqual(scheduler.deferred, 3)
+
+    def test_probes_local_stub_server_through_check_qos(self):
+        server = HTTPServer(("127.0.0.1", 0), StubServiceHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            base = f"http://127.0.0.1:{server.server_port}"
+            services = [{"name": "ok", "url": base + "/ok"}, {"name": "bad", "url": base + "/bad"}]
+            scheduler = ProbeScheduler(services, clock=SimulatedClock(), concurrency=2)
+            results = {result["Service Name"]: result for result in scheduler.run_once()}
+            self.assertEqual(results["ok"]["Availability"], 1)
+            self.assertEqual(results["bad"]["Availability"], 0)
+            self.assertEqual(scheduler.states["ok"].probes, 1)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+class TestHtmlReport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.results = pd.DataFrame({
+            'Service Name': [f"service <{i}>" for i in range(25)],
+            'WSDL Address': [f"http://example.com/{i}?wsdl&x=1" for i in range(25)],
+            'Waspas score': np.linspace(0.1, 0.9, 25)[::-1].round(4),
+            'Vikor score': np.linspace(0.0, 1.0, 25).round(4),
+            'Topsis score': np.full(25, 0.5),
+        })
+        self.csv_path = os.path.join(self.tmp.name, "results.csv")
+        self.results.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iter_services_matches_get_services(self):
+        services = ws_evaluation_tool.get_services(self.csv_path)
+        self.assertEqual(len(services), 25)
+        self.assertEqual(services, list(ws_evaluation_tool.iter_services(self.csv_path)))
+
+    def test_select_top_services(self):
+        top = ws_evaluation_tool.select_top_services(self.results, 5, 'Waspas score')
+        self.assertEqual(list(top.index), list(self.results.nlargest(5, 'Waspas score').index))
+        lowest = ws_evaluation_tool.select_top_services(self.csv_path, 3, 'Vikor score', ascending=True)
+        self.assertEqual(list(lowest['Vikor score']), sorted(self.results['Vikor score'])[:3])
+
+    def test_paginated_report_is_escaped_and_linked(self):
+        output = os.path.join(self.tmp.name, "report.html")
+        paths = ws_evaluation_tool.generate_html_report(
+            ws_evaluation_tool.iter_services(self.csv_path), output, None, page_size=10)
+        self.assertEqual([os.path.basename(path) for path in paths], ["report.html", "report_2.html", "report_3.html"])
+        pages = [open(path, encoding="utf-8").read() for path in paths]
+        self.assertEqual([page.count("<tr><td>") for page in pages], [10, 10, 5])
+        self.assertIn("service &lt;0&gt;", pages[0])
+        self.assertIn("?wsdl&amp;x=1", pages[0])
+        self.assertIn('href="report_2.html">Next', pages[0])
+        self.assertIn('href="report.html">Previous', pages[1])
+        self.assertNotIn("Next", pages[2])
+        self.assertEqual(pages[0].count("<th>"), 5)
+
+    def test_row_limit(self):
+        output = os.path.join(self.tmp.name, "top.html")
+        paths = ws_evaluation_tool.generate_html_report(self.results.itertuples(index=False), output, 7)
+        self.assertEqual(paths, [output])
+        self.assertEqual(open(output, encoding="utf-8").read().count("<tr><td>"), 7)
+
+class TestReportExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({
+            'Response Time': [120.5, 98.0, 300.25, 45.0, 210.0],
+            'Availability': [90, 85, 99, 70, 88],
+            'Service Name': ["a", "b, quoted \"c\"", None, "ž", "e"],
+        }, index=[10, 11, 12, 13, 14])
+        self.waspas = pd.DataFrame({'WASPAS Score': [0.5, 0.7, 0.2, 0.9, 0.4], 'WASPAS Rank': [3, 2, 5, 1, 4]})
+        self.vikor = pd.DataFrame({'VIKOR Score': [0.1, 0.3, 0.8, 0.0, 0.6], 'VIKOR Rank': [2, 3, 5, 1, 4]})
+        self.expected = pd.concat([self.df.reset_index(drop=True), self.waspas, self.vikor], axis=1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunked_csv_matches_single_write(self):
+        for name in ("report.csv", "report.csv.gz"):
+            path = os.path.join(self.tmp.name, name)
+            rows = ws_evaluation_tool.stream_report(self.df, self.waspas, self.vikor, output_path=path, chunk_size=2)
+            self.assertEqual(rows, 5)
+            opener = gzip.open if name.endswith(".gz") else open
+            with opener(path, 'rt', encoding='utf-8') as file:
+                self.assertEqual(file.read(), self.expected.to_csv(index=False))
+
+    def test_generate_report_returns_combined_frame(self):
+        path = os.path.join(self.tmp.name, "report.csv")
+        with patch('builtins.print'):
+            report = ws_evaluation_tool.generate_report(self.df, self.waspas, self.vikor, output_path=path)
+        pd.testing.assert_frame_equal(report, self.expected)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), self.expected.to_csv(index=False))
+
+    def test_columnar_round_trip_and_projection(self):
+        path = os.path.join(self.tmp.name, "report.cols")
+        export_frames([self.df, self.waspas, self.vikor], path, chunk_size=3)
+        scores = read_columnar(path, columns=['WASPAS Score', 'VIKOR Rank'])
+        self.assertEqual(list(scores.columns), ['WASPAS Score', 'VIKOR Rank'])
+        self.assertEqual(scores['VIKOR Rank'].dtype, np.int64)
+        np.testing.assert_array_equal(scores['WASPAS Score'], self.waspas['WASPAS Score'])
+        full = read_columnar(path, mmap=False)
+        self.assertEqual(list(full.columns), list(self.expected.columns))
+        self.assertTrue(pd.isna(full.loc[2, 'Service Name']))
+        self.assertEqual(full.loc[1, 'Service Name'], 'b, quoted "c"')
+        self.assertEqual(full.loc[3, 'Service Name'], 'ž')
+        with self.assertRaises(KeyError):
+            read_columnar(path, columns=['Missing'])
+
+    def test_string_columns_decode_edge_cases(self):
+        names = pd.DataFrame({'Name': [None, "", "ž\n,\"x\"", None, "\x00", "last"]})
+        path = os.path.join(self.tmp.name, "names.cols")
+        export_frames([names], path, chunk_size=4)
+        self.assertListEqual(list(read_columnar(path)['Name'].fillna("<missing>")),
+                             ["<missing>", "", "ž\n,\"x\"", "<missing>", "\x00", "last"])
+        empty = os.path.join(self.tmp.name, "empty.cols")
+        export_frames([names.iloc[:0]], empty)
+        self.assertEqual(len(read_columnar(empty)), 0)
+
+    def test_unknown_compression_is_rejected(self):
+        with self.assertRaises(ValueError):
+            export_frames([self.waspas], os.path.join(self.tmp.name, "x.csv"), compression="lz4")
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        recorder = Instrumentation(enabled=False)
+        double = recorder.instrument()(lambda x: 2 * x)
+        self.assertEqual(double(21), 42)
+        with recorder.stage("block"):
+            pass
+        self.assertEqual(recorder.records, [])
+
+    def test_nested_stages_time_memory_and_rows(self):
+        recorder = Instrumentation(enabled=True)
+        try:
+            @recorder.instrument(name="allocate")
+            def allocate(frame):
+                return np.ones(1_000_000)
+
+            with recorder.stage("outer", rows=10, dataset="synthetic"):
+                allocate(pd.DataFrame({"x": range(10)}))
+            inner, outer = recorder.records
+        finally:
+            recorder.configure(enabled=False)
+        self.assertEqual((inner["stage"], inner["parent"], inner["rows"]), ("allocate", "outer", 10))
+        self.assertGreaterEqual(inner["peak_memory_bytes"], 8_000_000)
+        self.assertGreaterEqual(outer["peak_memory_bytes"], inner["peak_memory_bytes"])
+        self.assertEqual(outer["dataset"], "synthetic")
+        self.assertGreaterEqual(outer["wall_seconds"], inner["wall_seconds"])
+        self.assertIn("cpu_seconds", outer)
+
+    def test_pipeline_stages_emit_json(self):
+        matrix = pd.DataFrame({'Response Time': [120.0, 80.0, 300.0], 'Availability': [90.0, 99.0, 70.0]})
+        criteria_types = ["min", "max"]
+        instrumentation.configure(enabled=True)
+        try:
+            weights = ws_evaluation_tool.calculate_weights(matrix, criteria_types)
+            ws_evaluation_tool.fuzzy_waspas(matrix, weights, criteria_types)
+            with tempfile.TemporaryDirectory() as tmp:
+                report = json.load(open(instrumentation.dump(os.path.join(tmp, "stages.json"))))
+        finally:
+            instrumentation.configure(enabled=False)
+            instrumentation.reset()
+        stages = {record["stage"]: record for record in report["stages"]}
+        self.assertEqual(set(stages), {"calculate_weights", "fuzzy_waspas"})
+        self.assertEqual(stages["fuzzy_waspas"]["rows"], 3)
+
+    def test_generate_report_records_rows(self):
+        df = pd.DataFrame({'Service Name': ['a', 'b'], 'Availability': [90.0, 99.0]})
+        waspas = pd.DataFrame({'WASPAS Score': [0.4, 0.9], 'WASPAS Rank': [2, 1]})
+        vikor = pd.DataFrame({'VIKOR Score': [1.0, 0.0], 'VIKOR Rank': [2, 1]})
+        instrumentation.configure(enabled=True)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                report = ws_evaluation_tool.generate_report(df, waspas, vikor,
+                                                            output_path=os.path.join(tmp, "report.csv"))
+            records = list(instrumentation.records)
+        finally:
+            instrumentation.configure(enabled=False)
+            instrumentation.reset()
+        self.assertEqual(len(report), 2)
+        self.assertEqual([(record["stage"], record["rows"]) for record in records], [("generate_report", 2)])
+
+    def test_shared_singletons_are_loaded_once(self):
+        # every module reaches GlobalVars and the recorders through the src package
+        for name in ("GlobalVars", "Instrumentation", "Profiling", "StageCache", "DataReader"):
+            self.assertNotIn(name, sys.modules)
+        self.assertIs(sys.modules["ws_evaluation_tool"].instrumented.__self__, instrumentation)
+        self.assertIs(sys.modules["src.Classification"].instrumented.__self__, instrumentation)
+
+    def test_evaluation_tool_runs_from_its_own_directory(self):
+        env = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+        result = subprocess.run([sys.executable, "-c", "import ws_evaluation_tool; ws_evaluation_tool.improvedExperiment()"],
+                                cwd=os.path.dirname(ws_evaluation_tool.__file__), env=env,
+                                capture_output=True, text=True, timeout=300)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Trusted Web Services by a trust score:", result.stdout)
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_synthetic_data_matches_qws_marginals_and_correlations(self):
+        source = pd.read_csv(QWS_PATH)[NUMERIC_COLUMNS]
+        synthetic = SyntheticQWS(seed=1).generate(20000)
+        self.assertEqual(len(synthetic), 20000)
+        self.assertTrue(synthetic['WSDL Address'].is_unique)
+        values = synthetic[NUMERIC_COLUMNS]
+        self.assertTrue(((values.min() >= source.min()) & (values.max() <= source.max())).all())
+        self.assertTrue((values['Availability'] == values['Availability'].round()).all())
+        np.testing.assert_allclose(values.median(), source.median(), rtol=0.1)
+        self.assertLess((values.corr('spearman') - source.corr('spearman')).abs().max().max(), 0.1)
+
+    def test_chunks_are_reproducible(self):
+        generator = SyntheticQWS(seed=3)
+        chunked = pd.concat(generator.iter_chunks(2500, chunk_size=1000), ignore_index=True)
+        pd.testing.assert_frame_equal(chunked, SyntheticQWS(seed=3).generate(2500, chunk_size=1000))
+
+    def test_run_benchmarks_records_and_skips(self):
+        results = run_benchmarks.run_benchmarks([300], ['waspas', 'vikor'], repeat=2, max_rows={'vikor': 100})
+        waspas, vikor = results
+        self.assertEqual((waspas['benchmark'], waspas['rows'], len(waspas['seconds'])), ('waspas', 300, 2))
+        self.assertGreater(waspas['rows_per_second'], 0)
+        self.assertIn('skipped', vikor)
+
+class TestRegressionGate(unittest.TestCase):
+    def test_slowdown_needs_threshold_and_separated_intervals(self):
+        baseline = {'waspas': {'median_seconds': 1.0, 'ci_low': 0.95, 'ci_high': 1.05}}
+        slower = {'waspas': {'median_seconds': 1.5, 'ci_low': 1.4, 'ci_high': 1.6}}
+        noisy = {'waspas': {'median_seconds': 1.5, 'ci_low': 1.0, 'ci_high': 2.0}}
+        self.assertEqual(len(regression_gate.compare_timings(baseline, slower, threshold=0.25)), 1)
+        self.assertEqual(regression_gate.compare_timings(baseline, slower, threshold=0.6), [])
+        self.assertEqual(regression_gate.compare_timings(baseline, noisy, threshold=0.25), [])
+
+    def test_ranking_drift_is_flagged(self):
+        baseline = {'vikor': {'scores': [0.1, 0.5, 0.9], 'ranks': [1, 2, 3]}}
+        same = {'vikor': {'scores': [0.1, 0.5, 0.9 + 1e-12], 'ranks': [1, 2, 3]}}
+        swapped = {'vikor': {'scores': [0.5, 0.1, 0.9], 'ranks': [2, 1, 3]}}
+        self.assertEqual(regression_gate.compare_rankings(baseline, same), [])
+        self.assertIn("2 services changed rank", regression_gate.compare_rankings(baseline, swapped)[0])
+
+    def test_calibration_rescales_current_timings(self):
+        baseline = {'calibration': {'median_seconds': 0.1}, 'waspas': {'median_seconds': 1.0, 'ci_high': 1.05}}
+        slower_machine = {'calibration': {'median_seconds': 0.2}, 'waspas': {'median_seconds': 1.9, 'ci_low': 1.85}}
+        self.assertEqual(regression_gate.compare_timings(baseline, slower_machine), [])
+        slower_code = {'calibration': {'median_seconds': 0.1}, 'waspas': {'median_seconds': 1.9, 'ci_low': 1.85}}
+        self.assertEqual(len(regression_gate.compare_timings(baseline, slower_code)), 1)
+
+    def test_gate_fails_on_a_measured_regression(self):
+        setup, cap = run_benchmarks.BENCHMARKS['entropy_weights']
+
+        def slowed(df):
+            run = setup(df)
+            return lambda: (time.sleep(0.05), run())[1]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            regression_gate.update_baseline(path, repeat=5, benchmarks={'entropy_weights': 20_000})
+            self.assertEqual(regression_gate.check(path, threshold=1.0, repeat=5, rankings=False), [])
+            with patch.dict(run_benchmarks.BENCHMARKS, {'entropy_weights': (slowed, cap)}):
+                failures = regression_gate.check(path, threshold=1.0, repeat=5, rankings=False)
+        self.assertEqual(len(failures), 1)
+        self.assertIn("entropy_weights", failures[0])
+
+    def test_rankings_match_committed_baseline(self):
+        self.assertEqual(regression_gate.check(timings=False), [])
+
+    @unittest.skipUnless(os.environ.get('QWS_PERF_GATE'), "set QWS_PERF_GATE=1 to run the timing gate")
+    def test_no_performance_regression(self):
+        threshold = float(os.environ.get('QWS_PERF_THRESHOLD', 0.25))
+        self.assertEqual(regression_gate.check(threshold=threshold), [])
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.matrix = pd.DataFrame({'Response Time': np.linspace(50, 900, 300),
+                                    'Availability': np.linspace(99, 60, 300) % 40 + 60})
+        self.criteria_types = ["min", "max"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def profile_pipeline(self, mode, min_intervals=0):
+        profiler = Profiler(mode, self.tmp.name, interval=0.001)
+
+        @profiler.profile('pipeline')
+        def pipeline():
+            profiler.tag(rows=len(self.matrix), dataset='synthetic')
+            weights = ws_evaluation_tool.calculate_weights(self.matrix, self.criteria_types)
+            result = ws_evaluation_tool.fuzzy_vikor(self.matrix, weights, self.criteria_types)
+            # keep the profiled run busy for a fixed number of sampling intervals, however fast the pipeline is
+            deadline = time.perf_counter() + min_intervals * profiler.interval
+            while time.perf_counter() < deadline:
+                sum(range(1000))
+            return result
+
+        self.assertEqual(len(pipeline()), 300)
+        return profiler
+
+    def test_disabled_profiler_writes_nothing(self):
+        profiler = self.profile_pipeline('')
+        self.assertEqual(profiler.runs, [])
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_deterministic_profile_outputs(self):
+        run, = self.profile_pipeline('deterministic').runs
+        self.assertEqual((run['rows'], run['dataset']), (300, 'synthetic'))
+        self.assertIn('-300rows-', os.path.basename(run['files']['pstats']))
+        self.assertEqual(run['hot_functions']['fuzzy_vikor']['calls'], 1)
+        self.assertIn('calculate_weights', run['hot_functions'])
+        stats = pstats.Stats(run['files']['pstats'])
+        self.assertTrue(any(function == 'fuzzy_vikor' for _, _, function in stats.stats))
+        lines = open(run['files']['collapsed']).read().splitlines()
+        self.assertTrue(any('fuzzy_vikor (ws_evaluation_tool.py' in line for line in lines))
+        total = sum(int(line.rsplit(' ', 1)[1]) for line in lines) / 1e6
+        self.assertAlmostEqual(total, stats.total_tt, delta=0.2 * stats.total_tt)
+        metadata = json.load(open(os.path.splitext(run['files']['pstats'])[0] + '.json'))
+        self.assertEqual(metadata['mode'], 'deterministic')
+
+    def test_sampling_profile_outputs(self):
+        run, = self.profile_pipeline('sampling', min_intervals=200).runs
+        self.assertNotIn('pstats', run['files'])
+        self.assertGreater(run['samples'], 0)
+        lines = open(run['files']['collapsed']).read().splitlines()
+        self.assertEqual(sum(int(line.rsplit(' ', 1)[1]) for line in lines), run['samples'])
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Profiler('tracing')
+
+class TestServiceCatalogue(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Response Time': [120.5, 98.0, 300.25, 45.0],
+            'Availability': [90, 85, 99, 70],
+            'Reliability': [73.0, 80.0, 67.0, 89.0],
+            'Service Name': ["Alpha", "Šaltinis", None, "Alpha"],
+            'WSDL Address': [f"http://example.com/{i}?wsdl" for i in range(4)],
+        })
+        self.catalogue = ServiceCatalogue.from_frame(self.df)
+
+    def test_string_columns_round_trip(self):
+        self.assertEqual(self.catalogue.names.to_list(), ["Alpha", "Šaltinis", None, "Alpha"])
+        self.assertEqual(self.catalogue.names[1], "Šaltinis")
+        self.assertIsNone(self.catalogue.names[2])
+        repetitive = StringColumn.from_values(["a", "b"] * 50)
+        self.assertIsNotNone(repetitive.codes)
+        self.assertEqual(repetitive.to_list(), ["a", "b"] * 50)
+        self.assertLess(repetitive.nbytes, StringColumn.from_values(["a", "b"] * 50, dictionary_threshold=0).nbytes)
+
+    def test_zero_copy_decision_matrix_scores_like_dataframe(self):
+        self.assertEqual(self.catalogue.criteria.dtype, np.float32)
+        self.assertTrue(self.catalogue.criteria.flags['C_CONTIGUOUS'])
+        matrix = self.catalogue.decision_matrix()
+        self.assertTrue(np.shares_memory(matrix.to_numpy(), self.catalogue.criteria))
+        criteria_types = ["min", "max", "max"]
+        reference = self.df[['Response Time', 'Availability', 'Reliability']]
+        expected = ws_evaluation_tool.fuzzy_waspas(
+            reference, ws_evaluation_tool.calculate_weights(reference, criteria_types), criteria_types)
+        result = ws_evaluation_tool.fuzzy_waspas(
+            matrix, ws_evaluation_tool.calculate_weights(matrix, criteria_types), criteria_types)
+        np.testing.assert_allclose(result['WASPAS Score'], expected['WASPAS Score'], rtol=1e-5)
+        self.assertTrue((result['WASPAS Rank'] == expected['WASPAS Rank']).all())
+        with self.assertRaises(ValueError):
+            self.catalogue.decision_matrix(['Response Time', 'Reliability'])
+
+    def test_take_keeps_stable_ids(self):
+        subset = self.catalogue.take([3, 1])
+        self.assertEqual(list(subset.ids), [3, 1])
+        self.assertEqual(list(subset.decision_matrix().index), [3, 1])
+        self.assertEqual(subset.addresses.to_list(), ["http://example.com/3?wsdl", "http://example.com/1?wsdl"])
+        self.assertEqual(subset.id_of("http://example.com/1?wsdl"), 1)
+        self.assertIsNone(self.catalogue.names.codes)
+        self.assertEqual(self.catalogue.names.take([2, 1, 3, 1], block_rows=3).to_list(),
+                         [None, "Šaltinis", "Alpha", "Šaltinis"])
+        self.assertEqual(self.catalogue.names.take([]).to_list(), [])
+        pd.testing.assert_frame_equal(self.catalogue.to_frame()[['Service Name', 'WSDL Address']],
+                                      self.df[['Service Name', 'WSDL Address']].astype(object), check_dtype=False)
+
+    def test_load_dataset_as_catalogue(self):
+        columns = ['Availability', 'Reliability', 'Response Time', 'Service Name', 'WSDL Address']
+        df = ws_evaluation_tool.load_dataset("QWS", QWS_PATH, columns).dropna()
+        catalogue = ws_evaluation_tool.load_dataset("QWS", QWS_PATH, columns, catalogue=True).dropna()
+        self.assertEqual(catalogue.criteria_names, columns[:3])
+        self.assertEqual(catalogue.criteria.dtype, np.float32)
+        self.assertEqual(len(catalogue), len(df))
+        self.assertEqual(catalogue.addresses.to_list(), df['WSDL Address'].tolist())
+        criteria_types = ["max", "max", "min"]
+        matrix = catalogue.decision_matrix()
+        normalized = ws_evaluation_tool.normalize_decision_matrix(matrix, criteria_types)
+        self.assertEqual(normalized.to_numpy().dtype, np.float32)
+        self.assertFalse(np.shares_memory(normalized.to_numpy(), catalogue.criteria))
+        np.testing.assert_allclose(ws_evaluation_tool.calculate_weights(matrix, criteria_types),
+                                   ws_evaluation_tool.calculate_weights(df[columns[:3]], criteria_types), rtol=1e-6)
+
+    def test_dropna_and_scorer_index(self):
+        catalogue = self.catalogue.dropna()
+        self.assertEqual(list(catalogue.ids), [0, 1, 3])
+        matrix = catalogue.decision_matrix()
+        criteria_types = ["min", "max", "max"]
+        weights = ws_evaluation_tool.calculate_weights(matrix, criteria_types)
+        self.assertEqual(list(ws_evaluation_tool.fuzzy_waspas(matrix, weights, criteria_types).index), [0, 1, 3])
+        expected = ws_evaluation_tool.fuzzy_vikor(matrix.astype(float), weights, criteria_types)
+        result = ws_evaluation_tool.fuzzy_vikor(matrix, weights, criteria_types)
+        np.testing.assert_allclose(result['VIKOR Score'], expected['VIKOR Score'], atol=1e-6)
+
+    def test_memory_saving_on_qws(self):
+        qws = pd.read_csv(QWS_PATH)
+        saving = measure_memory_saving(qws)
+        self.assertLess(saving['catalogue_bytes'], saving['dataframe_bytes'])
+        self.assertGreater(saving['saving'], 0.3)
+
+class TestColumnProjection(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "custom.csv")
+        with open(self.path, "w") as file:
+            file.write("Response Time,Availability,Notes,Service Name,WSDL Address,\n"
+                       "120.5,90,long text,A,http://a?wsdl\n"
+                       "98,85,more text,B,http://b?wsdl\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_projection_keeps_requested_order_and_dtypes(self):
+        data = DataReader(self.path).read(['Availability', 'Service Name'], {'Availability': 'float32'})
+        self.assertEqual(list(data.columns), ['Availability', 'Service Name'])
+        self.assertEqual(data['Availability'].dtype, np.float32)
+        without_trailing = DataReader(self.path).read(dtypes={})
+        self.assertEqual(list(without_trailing.columns),
+                         ['Response Time', 'Availability', 'Notes', 'Service Name', 'WSDL Address'])
+
+    def test_schema_mismatch_fails_fast(self):
+        with self.assertRaisesRegex(ValueError, "missing columns \\['Latency'\\]"):
+            DataReader(self.path).read(['Response Time', 'Latency'])
+        with self.assertRaisesRegex(ValueError, "expected column types"):
+            DataReader(self.path).read(['Notes'], {'Notes': 'float64'})
+
+    def test_load_dataset_pushes_down_qws_dtypes(self):
+        data = ws_evaluation_tool.load_dataset("QWS", self.path, ['Response Time', 'Availability'])
+        self.assertEqual(list(data.dtypes), [np.float64, np.float64])
+        custom = ws_evaluation_tool.load_dataset("Custom", self.path)
+        self.assertIn('Unnamed: 5', custom.columns)  # no projection requested: read as before
+
+class TestConsensusRanking(unittest.TestCase):
+    def setUp(self):
+        # s1 is best everywhere (lowest VIKOR Q), s3 worst; s2 has no VIKOR score
+        self.scores = pd.DataFrame({
+            'WASPAS Score': [0.9, 0.6, 0.2, 0.6],
+            'VIKOR Score': [0.1, np.nan, 0.9, 0.5],
+            'Topsis score': [0.8, 0.7, 0.1, 0.3],
+        }, index=['s1', 's2', 's3', 's4'])
+
+    def test_directions_and_aggregates(self):
+        results = ConsensusRanking(self.scores).results()
+        self.assertEqual(list(results['VIKOR Score Rank'].fillna(0)), [1, 0, 3, 2])
+        self.assertEqual(list(results['WASPAS Score Rank']), [1, 2.5, 4, 2.5])  # tie -> average rank
+        self.assertEqual(results['Borda Rank']['s1'], 1)
+        self.assertEqual(results['Copeland Score']['s1'], 3)
+        self.assertEqual(results['Copeland Score']['s3'], -3)
+        self.assertEqual(results['Mean Rank Position']['s3'], results['Mean Rank Position'].max())
+        self.assertAlmostEqual(results['Weighted Mean Rank']['s2'], (2.5 + 2) / 2)
+
+    def test_copeland_matches_pairwise_majority(self):
+        rng = np.random.default_rng(0)
+        scores = pd.DataFrame(rng.integers(0, 5, (40, 3)) / 5, columns=['WASPAS Score', 'VIKOR Score', 'Topsis score'])
+        keys = scores.to_numpy() * np.array([-1, 1, -1])
+        expected = [sum(np.sign(np.sign(keys[j] - keys[i]).sum()) for j in range(40)) for i in range(40)]
+        results = ConsensusRanking(scores, block_size=7).results()
+        np.testing.assert_array_equal(results['Copeland Score'], expected)
+
+    def test_incremental_update_matches_rebuild(self):
+        ranking = ConsensusRanking(self.scores)
+        change = pd.Series([0.05, np.nan], index=['s3', 's4'])
+        ranking.update('Topsis score', change)
+        updated = self.scores.copy()
+        updated.loc[['s3', 's4'], 'Topsis score'] = change
+        pd.testing.assert_frame_equal(ranking.results(), ConsensusRanking(updated).results())
+        with self.assertRaises(KeyError):
+            ranking.update('Topsis score', pd.Series([0.5], index=['missing']))
+
+    def test_copeland_is_bounded_to_borda_candidates(self):
+        rng = np.random.default_rng(2)
+        scores = pd.DataFrame(rng.random((60, 3)), columns=['WASPAS Score', 'VIKOR Score', 'Topsis score'])
+        with self.assertRaises(ValueError):
+            ConsensusRanking(scores, max_copeland_services=50)
+        results = ConsensusRanking(scores, copeland_candidates=10, block_size=4).results()
+        candidates = np.argsort(-results['Borda Score'].to_numpy(), kind="stable")[:10]
+        self.assertEqual(results['Copeland Score'].notna().sum(), 10)
+        self.assertTrue(results['Copeland Score'].iloc[candidates].notna().all())
+        tournament = ConsensusRanking(scores.iloc[np.sort(candidates)]).results()
+        pd.testing.assert_series_equal(results['Copeland Score'].dropna(), tournament['Copeland Score'].astype(float))
+        np.testing.assert_array_equal(results['Copeland Rank'].dropna(), tournament['Copeland Rank'])
+
+    def test_bounded_update_matches_rebuild(self):
+        rng = np.random.default_rng(3)
+        scores = pd.DataFrame(rng.random((60, 3)), columns=['WASPAS Score', 'VIKOR Score', 'Topsis score'])
+        ranking = ConsensusRanking(scores, copeland_candidates=10)
+        results = ranking.results()
+        top = results['Borda Score'].idxmax()
+        bottom = results['Borda Score'].idxmin()
+        for change in (pd.Series([0.9], index=[top]),  # stays a candidate
+                       pd.Series([1.0, 0.0], index=[bottom, top])):  # changes the candidate set
+            ranking.update('WASPAS Score', change)
+            scores.loc[change.index, 'WASPAS Score'] = change
+            pd.testing.assert_frame_equal(ranking.results(), ConsensusRanking(scores, copeland_candidates=10).results())
+
+    def test_load_method_scores_treats_minus_one_as_missing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            pd.DataFrame({'Service Name': ['a', 'b'], 'WSDL Address': ['http://a', 'http://b'],
+                          'Waspas score': [0.5, -1.0], 'Vikor score': [0.4, 0.3]}).to_csv(path, index=False)
+            scores = load_method_scores(path)
+        self.assertTrue(np.isnan(scores.loc['http://b', 'Waspas score']))
+        self.assertEqual(list(scores.columns), ['Waspas score', 'Vikor score'])
+
+class TestTopKQuery(unittest.TestCase):
+    def setUp(self):
+        self.df = SyntheticQWS().generate(5_000)
+        self.criteria = ['Response Time', 'Availability', 'Throughput', 'Reliability', 'Documentation']
+        self.engine = TopKQueryEngine(self.df[self.criteria], ['min', 'max', 'max', 'max', 'max'])
+
+    def assertMatchesFullScan(self, weights, k=10):
+        result = self.engine.query(weights, k)
+        expected = self.engine.query(weights, k, full_scan=True)
+        np.testing.assert_allclose(result['Score'], expected['Score'])
+        self.assertEqual(list(result['Rank']), list(range(1, k + 1)))
+        return result
+
+    def test_threshold_algorithm_matches_full_scan(self):
+        rng = np.random.default_rng(1)
+        for _ in range(5):
+            self.assertMatchesFullScan(dict(zip(self.criteria, rng.dirichlet(np.ones(5)))))
+        # negative weights read their criterion in ascending order
+        self.assertMatchesFullScan({'Availability': 1.0, 'Documentation': -0.5})
+
+    def test_early_termination_and_fallback(self):
+        single = self.assertMatchesFullScan({'Availability': 1.0})
+        self.assertFalse(single.attrs['full_scan'])
+        self.assertLess(single.attrs['rows_touched'], len(self.df) / 10)
+        # with no room before the fallback, a multi-criteria query scans everything
+        engine = TopKQueryEngine(self.df[self.criteria], ['min', 'max', 'max', 'max', 'max'], scan_fraction=0)
+        result = engine.query(dict(zip(self.criteria, [0.2] * 5)), 10)
+        self.assertTrue(result.attrs['full_scan'])
+        self.assertEqual(result.attrs['rows_touched'], len(self.df))
+
+    def test_weight_validation(self):
+        with self.assertRaises(KeyError):
+            self.engine.query({'Latency': 1.0})
+        with self.assertRaises(ValueError):
+            self.engine.query([1.0, 0.5])
+
+class TestIncrementalClassification(unittest.TestCase):
+    def setUp(self):
+        self.classifier = Classification()
+        self.classifier.data = SyntheticQWS(seed=3).generate(2_000)
+        with patch('builtins.print'):
+            self.classifier.process()
+            self.classifier.trainModel()
+
+    def test_update_keeps_old_trees_and_frozen_scaler(self):
+        old_trees = list(self.classifier.model.estimators_)
+        thresholds = [tree.tree_.threshold.copy() for tree in old_trees]
+        X_test = self.classifier.X_test.copy()
+        window = SyntheticQWS(seed=4).generate(300)
+        window['Response Time'] *= 2
+        with patch('builtins.print'):
+            update = self.classifier.updateModel(window, trees_per_update=5)
+        self.assertEqual(update['trees'], 105)
+        self.assertEqual(self.classifier.model.estimators_[:100], old_trees)
+        for tree, threshold in zip(old_trees, thresholds):
+            np.testing.assert_array_equal(tree.tree_.threshold, threshold)
+        np.testing.assert_array_equal(self.classifier.X_test[:len(X_test)], X_test)
+        raw = SyntheticQWS(seed=3).generate(2_000)[GlobalVars.qws_criteria]
+        np.testing.assert_allclose(self.classifier.scaler.mean_, raw.mean())
+        self.assertEqual(len(self.classifier.X_train) + len(self.classifier.X_test), 2_300)
+
+    def test_max_trees_and_retrain_comparison(self):
+        with patch('builtins.print'):
+            self.classifier.updateModel(SyntheticQWS(seed=5).generate(200), trees_per_update=10, max_trees=50)
+            drift = self.classifier.compareWithRetrain()
+        self.assertEqual(len(self.classifier.model.estimators_), 50)
+        self.assertAlmostEqual(drift['accuracy_drift'], drift['incremental_accuracy'] - drift['full_retrain_accuracy'])
+        self.assertGreater(drift['incremental_accuracy'], 0.9)
+
+class TestBatchInference(unittest.TestCase):
+    def setUp(self):
+        self.classifier = Classification()
+        self.classifier.data = SyntheticQWS(seed=3).generate(2_000)
+        with patch('builtins.print'):
+            self.classifier.process()
+            self.classifier.trainModel()
+        self.catalogue = SyntheticQWS(seed=6).generate(2_500)
+
+    def test_chunked_predictions_match_model(self):
+        features = self.classifier.scaler.transform(self.catalogue[GlobalVars.qws_criteria])
+        expected = self.classifier.model.predict(features)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "predictions.cols")
+            with open_sink(path) as sink, patch('builtins.print'):
+                report = self.classifier.predictBatch(self.catalogue, sink, chunk_size=1_000, trace_memory=True)
+            predictions = read_columnar(path)
+        self.assertEqual(report['rows'], 2_500)
+        self.assertGreater(report['rows_per_second'], 0)
+        self.assertGreater(report['peak_memory_bytes'], 0)
+        self.assertEqual(list(predictions['WSDL Address']), list(self.catalogue['WSDL Address']))
+        np.testing.assert_array_equal(predictions['Predicted Class'].to_numpy(), expected)
+        np.testing.assert_allclose(predictions['Probability High'] + predictions['Probability Low'], 1)
+
+    def test_csv_source_is_streamed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "catalogue.csv")
+            self.catalogue.iloc[:300].to_csv(source, index=False)
+            target = os.path.join(tmp, "predictions.csv")
+            with open_sink(target) as sink, patch('builtins.print'):
+                report = self.classifier.predictBatch(source, sink, chunk_size=128, n_jobs=1)
+            predictions = pd.read_csv(target)
+        self.assertEqual((report['rows'], len(predictions)), (300, 300))
+        self.assertIsNone(report['peak_memory_bytes'])  # not traced by default
+        expected = self.classifier.model.predict(
+            self.classifier.scaler.transform(self.catalogue.iloc[:300][GlobalVars.qws_criteria]))
+        np.testing.assert_array_equal(predictions['Predicted Class'].to_numpy(), expected)
+        self.assertEqual(self.classifier.model.n_jobs, None)  # restored after the batch
+
+class TestDatasetReload(unittest.TestCase):
+    def setUp(self):
+        self.criteria = ['Response Time', 'Availability', 'Throughput', 'Reliability']
+        self.criteria_types = ['min', 'max', 'max', 'max']
+        self.v1 = SyntheticQWS(seed=8).generate(1_000)
+        v2 = self.v1.drop(index=[3, 4])
+        v2.loc[10, 'Availability'] = v2['Availability'].median()
+        v2.loc[11, 'Service Name'] = 'renamed'
+        self.v2 = pd.concat([v2, SyntheticQWS(seed=9).generate(1).assign(**{'WSDL Address': 'http://new?wsdl'})],
+                            ignore_index=True)
+
+    def test_keys_hashes_and_diff(self):
+        keys = service_keys(pd.DataFrame({'WSDL Address': ['a', 'b', 'a', 'a']}))
+        self.assertEqual(list(keys), ['a', 'b', 'a#2', 'a#3'])
+        old = pd.Series(row_hashes(self.v1), index=service_keys(self.v1))
+        new = pd.Series(row_hashes(self.v2), index=service_keys(self.v2))
+        changes = diff_hashes(old, new)
+        address = self.v1['WSDL Address']
+        self.assertEqual(list(changes['removed']), [address[3], address[4]])
+        self.assertEqual(list(changes['changed']), [address[10], address[11]])
+        self.assertEqual(list(changes['added']), ['http://new?wsdl'])
+
+    def test_reload_rescores_only_changes(self):
+        reloader = DatasetReloader(self.criteria, self.criteria_types, weight_tolerance=1.0)
+        with tempfile.TemporaryDirectory() as tmp, patch('builtins.print'):
+            reloader.reload(self.v1)
+            summary = reloader.reload(self.v2, os.path.join(tmp, "full.csv"), os.path.join(tmp, "delta.csv"))
+            full, delta = pd.read_csv(os.path.join(tmp, "full.csv")), pd.read_csv(os.path.join(tmp, "delta.csv"))
+            reloader.save_snapshot(os.path.join(tmp, "snapshot.cols"))
+            resumed = DatasetReloader.from_snapshot(os.path.join(tmp, "snapshot.cols"), self.criteria_types)
+            self.assertEqual(resumed.reload(self.v2)['rescored'], 0)
+        self.assertEqual(summary, {'added': 1, 'removed': 2, 'changed': 2, 'rescored': 3, 'full_recompute': False})
+        expected = ws_evaluation_tool.fuzzy_waspas(self.v2[self.criteria], reloader.engine.weights, self.criteria_types)
+        np.testing.assert_allclose(full['WASPAS Score'], expected['WASPAS Score'])
+        self.assertEqual(list(full['WASPAS Rank']), list(expected['WASPAS Rank']))
+        self.assertEqual(delta['Change'].value_counts().to_dict(), {'changed': 2, 'removed': 2, 'added': 1})
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = StageCache(enabled=True, directory=self.tmp.name)
+        self.calls = []
+
+        @self.cache.stage(name='weighted_sum')
+        def weighted_sum(df, weights, scale=1.0):
+            self.calls.append(len(df))
+            return (df * weights).sum(axis=1) * scale
+        self.stage = weighted_sum
+        self.df = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [4.0, 5.0, 6.0]})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hits_only_for_identical_data_code_and_parameters(self):
+        with patch('builtins.print'):
+            first = self.stage(self.df, [0.5, 0.5])
+            pd.testing.assert_series_equal(self.stage(self.df.copy(), [0.5, 0.5]), first)
+            self.stage(self.df, [0.5, 0.5], scale=2.0)
+            self.stage(self.df, np.array([0.4, 0.6]))
+            changed = self.df.copy()
+            changed.loc[1, 'b'] = 5.5
+            self.stage(changed, [0.5, 0.5])
+            self.stage(self.df, weights=[0.5, 0.5], scale=1.0)  # same bound arguments as the first call
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 4))
+        self.assertNotEqual(code_version(StageCache.get), code_version(StageCache.put))
+
+    def test_code_version_without_source_is_stable(self):
+        def compile_stage(body):
+            namespace = {}
+            exec(f"def stage(x):\n    return {body}\n", namespace)  # no source file for inspect
+            return namespace["stage"]
+        first, again, changed = compile_stage("x + 1"), compile_stage("x + 1"), compile_stage("x + 2")
+        self.assertEqual(code_version(first), code_version(again))
+        self.assertNotEqual(code_version(first), code_version(changed))
+        self.assertEqual(code_version(len), code_version(len))
+        script = "from src.StageCache import code_version; print(code_version(len, dict))"
+        runs = {subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                               cwd=os.path.join(os.path.dirname(__file__), '..')).stdout for _ in range(2)}
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(len(runs.pop().strip()), 64)
+
+    def test_puts_below_the_limit_do_not_rescan(self):
+        with patch('builtins.print'), patch.object(StageCache, 'entries', wraps=self.cache.entries) as entries:
+            for scale in (1.0, 2.0, 3.0):
+                self.stage(self.df, [0.5, 0.5], scale=scale)
+            self.assertEqual(entries.call_count, 1)  # the initial size scan
+        self.assertEqual(self.cache.size(), sum(size for _, size, _ in self.cache.entries()))
+        self.cache.configure(max_bytes=self.cache.size())
+        with patch('builtins.print'):
+            self.stage(self.df, [0.5, 0.5], scale=4.0)  # crosses the limit
+        self.assertEqual((len(self.cache.entries()), self.cache.evictions), (3, 1))
+        self.assertEqual(self.cache.size(), sum(size for _, size, _ in self.cache.entries()))
+
+    def test_disabled_cache_calls_through(self):
+        self.cache.configure(enabled=False)
+        self.stage(self.df, [0.5, 0.5])
+        self.stage(self.df, [0.5, 0.5])
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_lru_eviction_by_size(self):
+        with patch('builtins.print'):
+            for scale in (1.0, 2.0, 3.0):
+                self.stage(self.df, [0.5, 0.5], scale=scale)
+        entries = sorted(self.cache.entries(), key=lambda entry: entry[2])
+        for age, (_, _, path) in enumerate(entries):  # deterministic use order: the first entry is the oldest
+            os.utime(path, (1_000_000 + age, 1_000_000 + age))
+        self.cache.configure(max_bytes=sum(size for _, size, _ in entries) - 1)
+        self.cache.evict()
+        remaining = {path for _, _, path in self.cache.entries()}
+        self.assertEqual(remaining, {path for _, _, path in entries[1:]})
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_pipeline_stages_are_cached(self):
+        matrix = pd.DataFrame({"Response Time": [120.0, 300.0, 80.0], "Availability": [95.0, 80.0, 90.0]})
+        criteria_types = ["min", "max"]
+        enabled, directory = stage_cache.enabled, stage_cache.directory
+        stage_cache.configure(enabled=True, directory=self.tmp.name)
+        try:
+            with patch('builtins.print') as printed:
+                weights = ws_evaluation_tool.calculate_weights(matrix, criteria_types)
+                expected = ws_evaluation_tool.fuzzy_vikor(matrix, weights, criteria_types)
+                cached = ws_evaluation_tool.fuzzy_vikor(matrix, weights, criteria_types)
+            self.assertIn("fuzzy_vikor: loaded from the stage cache.", [call.args[0] for call in printed.call_args_list])
+            pd.testing.assert_frame_equal(cached, expected)
+        finally:
+            stage_cache.configure(enabled=enabled, directory=directory)
+
+WSDL_DOCUMENTED = b'''<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:tns="http://example.com/quote" targetNamespace="http://example.com/quote">
+  <documentation>Stock quotes</documentation>
+  <types><xsd:schema targetNamespace="http://example.com/quote">
+    <xsd:element name="QuoteRequest"><xsd:complexType><xsd:sequence><xsd:element name="symbol" type="xsd:string"/></xsd:sequence></xsd:complexType></xsd:element>
+    <xsd:element name="QuoteResponse" type="xsd:float"/>
+  </xsd:schema></types>
+  <message name="GetQuoteIn"><documentation>Request</documentation><part name="body" element="tns:QuoteRequest"/></message>
+  <message name="GetQuoteOut"><part name="body" element="tns:QuoteResponse"/></message>
+  <portType name="QuotePort"><documentation>Quote operations</documentation>
+    <operation name="GetQuote"><documentation>Last trade price</documentation><input message="tns:GetQuoteIn"/><output message="tns:GetQuoteOut"/></operation>
+  </portType>
+  <binding name="QuoteBinding" type="tns:QuotePort"><soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="GetQuote"><soap:operation soapAction="urn:GetQuote"/><input><soap:body use="literal"/></input><output><soap:body use="literal"/></output></operation>
+  </binding>
+  <service name="QuoteService"><documentation>The service</documentation>
+    <port name="QuoteSoap" binding="tns:QuoteBinding"><documentation>SOAP endpoint</documentation><soap:address location="http://example.com/quote"/></port>
+  </service>
+</definitions>'''
+
+WSDL_RPC_ENCODED = b'''<definitions xmlns="http://schemas.xmlsoap.org/wsdl/" xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/" xmlns:tns="x">
+  <message name="In"><part name="a" type="xsd:string"/></message>
+  <portType name="P"><operation name="Op"><input message="tns:In"/></operation><operation name="Op"/></portType>
+  <binding name="B"><soap:binding style="rpc" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="Op"><input><soap:body use="encoded"/></input></operation></binding>
+  <service name="S"><port name="P" binding="tns:B"/></service>
+</definitions>'''
+
+# the same services with the documentation text inside nested markup (or only in a child's tail)
+WSDL_NESTED_DOCUMENTATION = WSDL_DOCUMENTED.replace(
+    b'<documentation>Request</documentation>', b'<documentation><p>Re<b>quest</b></p></documentation>').replace(
+    b'<documentation>Last trade price</documentation>', b'<documentation><br/>Last trade price</documentation>')
+
+class WsdlHandler(BaseHTTPRequestHandler):
+    documents = {"/good": WSDL_DOCUMENTED, "/rpc": WSDL_RPC_ENCODED, "/broken": b"<definitions><service>"}
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with WsdlHandler.lock:
+            WsdlHandler.active += 1
+            WsdlHandler.peak = max(WsdlHandler.peak, WsdlHandler.active)
+        time.sleep(0.05)
+        with WsdlHandler.lock:
+            WsdlHandler.active -= 1
+        document = self.documents.get(self.path.split("?")[0])
+        self.send_response(200 if document else 404)
+        self.end_headers()
+        self.wfile.write(document or b"")
+
+    def log_message(self, *args):
+        pass
+
+class TestWsdlCrawler(unittest.TestCase):
+    def test_streamed_metrics_do_not_depend_on_chunking(self):
+        metrics = analyze_wsdl(WSDL_DOCUMENTED)
+        self.assertAlmostEqual(metrics["Documentation"], 100 * 5 / 6)
+        self.assertEqual((metrics["Compliance"], metrics["Best Practices"]), (100.0, 100.0))
+        self.assertEqual((metrics["WSDL Operations"], metrics["WSDL Messages"], metrics["WSDL Parts"]), (1, 2, 2))
+        self.assertEqual(metrics["WSDL Schema Elements"], 3)
+        self.assertEqual(analyze_wsdl(WSDL_DOCUMENTED, chunk_size=7), metrics)
+
+        for chunk_size in (7, 64 * 1024):
+            nested = analyze_wsdl(WSDL_NESTED_DOCUMENTATION, chunk_size=chunk_size)
+            self.assertEqual([nested[name] for name in ("Documentation", "Compliance", "Best Practices")],
+                             [metrics[name] for name in ("Documentation", "Compliance", "Best Practices")])
+
+        rpc = analyze_wsdl(WSDL_RPC_ENCODED, chunk_size=13)
+        self.assertEqual((rpc["Documentation"], rpc["Best Practices"]), (0.0, 0.0))
+        self.assertAlmostEqual(rpc["Compliance"], 100 * 4 / 7)
+
+    def test_concurrent_crawl_and_decision_matrix_update(self):
+        WsdlHandler.peak = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), WsdlHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            base = f"http://127.0.0.1:{server.server_port}"
+            addresses = [base + path for path in ("/good", "/rpc", "/broken", "/missing")]
+            addresses += [f"{base}/good?copy={i}" for i in range(4)]
+            with patch('builtins.print'):
+                metrics = crawl_wsdl(addresses + addresses[:2], max_workers=4)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertListEqual(list(metrics.index), addresses)
+        self.assertTrue(metrics["Error"].iloc[[0, 1] + list(range(4, 8))].isna().all())
+        self.assertIn("ParseError", metrics.loc[base + "/broken", "Error"])
+        self.assertIn("HTTPError", metrics.loc[base + "/missing", "Error"])
+        self.assertAlmostEqual(metrics.loc[base + "/rpc", "Compliance"], 100 * 4 / 7)
+        self.assertGreater(WsdlHandler.peak, 1)
+
+        qws = pd.DataFrame({"WSDL Address": addresses[:4], "Documentation": [np.nan, 50.0, np.nan, 10.0],
+                            "Compliance": [np.nan, np.nan, 89.0, 78.0]})
+        filled = update_decision_matrix(qws, metrics)
+        self.assertListEqual(list(filled["Documentation"].iloc[:2]), [100 * 5 / 6, 50.0])
+        self.assertTrue(np.isnan(filled["Documentation"].iloc[2]))
+        self.assertListEqual(list(filled["Compliance"].iloc[2:]), [89.0, 78.0])
+        self.assertListEqual(list(filled["Best Practices"].iloc[:2]), [100.0, 0.0])
+        overwritten = update_decision_matrix(qws, metrics, overwrite=True)
+        self.assertListEqual(list(overwritten["Documentation"].iloc[[1, 3]]), [0.0, 10.0])
+
 if __name__ == "__main__":
     unittest.main()